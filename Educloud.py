@@ -1,22 +1,54 @@
 import sys
-import openai
 import os
-import json
 import re
 import sqlite3
-from datetime import datetime
-from PyQt6.QtGui import (QFont, QColor, QDesktopServices, QIcon, QPixmap, QCursor, QMovie)
-from PyQt6.QtCore import Qt, QUrl, QPropertyAnimation, QEasingCurve, pyqtSignal, QPoint
+import time
+import hashlib
+import weakref
+import tempfile
+import mmap
+from collections import OrderedDict
+from datetime import datetime, date, timedelta
+from PyQt6.QtGui import (QFont, QColor, QDesktopServices, QIcon, QPixmap, QCursor, QMovie, QImage,
+                         QPainter, QTextCharFormat, QImageReader)
+from PyQt6.QtCore import (Qt, QUrl, QPropertyAnimation, QEasingCurve, pyqtSignal, QPoint,
+                          QObject, QRunnable, QThreadPool, QTimer, QSize, QAbstractListModel,
+                          QModelIndex, QEvent, QCoreApplication, QDate)
 from PyQt6.QtWidgets import (QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout,
                              QLineEdit, QCheckBox, QGraphicsDropShadowEffect, QStackedWidget,
-                             QScrollArea, QFrame, QListWidget, QListWidgetItem, QCalendarWidget,
+                             QScrollArea, QFrame, QListView, QCalendarWidget,
                              QTabWidget, QInputDialog, QComboBox, QSizePolicy, QTextEdit,
-                             QDialog, QFileDialog, QMessageBox)
-
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-openai.api_key = "your_api_key_here"
+                             QDialog, QFileDialog, QMessageBox, QAbstractScrollArea)
+
+from educloud_core import (Storage, BlobStore, DB_FILE, BLOB_DIR, export_submissions, import_submissions,
+                           GradeRepository, DEFAULT_GRADES, load_numpy,
+                           TaskRepository, DEFAULT_TASKS, AIClient, build_ai_prompt, describe_ai_error)
+
+# matplotlib takes most of the import time, and the role picker and login windows
+# don't need it; it is loaded on first use through these helpers (the core loads
+# openai and numpy the same way)
+_plotting = None
+_pdf_document = None
+
+def load_plotting():
+    # Returns (FigureCanvas, Figure); charts render offscreen and are shown as pixmaps
+    global _plotting
+    if _plotting is None:
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        _plotting = (FigureCanvasAgg, Figure)
+    return _plotting
+
+def load_pdf_document():
+    # QPdfDocument, or None where this PyQt6 build was installed without QtPdf
+    global _pdf_document
+    if _pdf_document is None:
+        try:
+            from PyQt6.QtPdf import QPdfDocument
+        except ImportError:
+            QPdfDocument = False
+        _pdf_document = QPdfDocument
+    return _pdf_document or None
 
 
 STYLESHEET = """
@@ -108,55 +140,1202 @@ FLOATING_SUBJECT_STYLE = """
     }
 """
 
-def get_ai_response(prompt):
-    response = openai.ChatCompletion.create(
-        model="gpt-4",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    return response['choices'][0]['message']['content']
+# ===============================
+# Theme - STYLESHEET plus every component's rules, compiled into one application
+# style sheet and applied once. Widgets pick their rules up through objectName or
+# the "kind" dynamic property instead of carrying their own style sheet, which Qt
+# would otherwise parse again for every widget.
+SUBJECTS = [
+    ("Mathematics", "\ud83d\udcd0", "#fce7f3"),
+    ("Science", "\ud83d\udd2c", "#dbeafe"),
+    ("English", "\ud83d\udcda", "#fee2e2"),
+    ("History", "\ud83c\udff0", "#e0f2fe"),
+    ("Geography", "\ud83d\uddfa\ufe0f", "#dcfce7"),
+    ("Computer Science", "\ud83d\udcbb", "#ede9fe"),
+    ("Art", "\ud83c\udfa8", "#fef9c3")
+]
+
+# Subject page sections -> gradient start and end colors
+SECTION_GRADIENTS = {
+    "modules": ("#6366f1", "#38bdf8"),
+    "pointers": ("#f43f5e", "#f87171"),
+    "assignments": ("#22c55e", "#a3e635"),
+}
+
+COMPONENT_STYLESHEET = """
+    QLabel[kind="heading"] {
+        color: #2563eb;
+    }
+    QLabel[kind="heading"][gap="md"] {
+        margin-top: 12px;
+    }
+    QLabel[kind="heading"][gap="lg"] {
+        margin-top: 18px;
+    }
+    QLabel[kind="overview-heading"] {
+        color: #1e40af;
+    }
+    QLabel#chartPlaceholder {
+        color: #9ca3af;
+    }
+    QLabel#aiStatus {
+        color: #6b7280;
+        font-size: 12px;
+    }
+    QLabel#archiveStatus {
+        color: #6b7280;
+        font-size: 13px;
+    }
+    QAbstractScrollArea#previewText {
+        background-color: white;
+        color: #1f2937;
+        border: 1.5px solid #e5e7eb;
+        border-radius: 8px;
+    }
+    QLabel#previewImage {
+        color: #9ca3af;
+    }
+
+    /* Student dashboard sidebar; its colors reach every child, as the logo's border shows */
+    QWidget#sidebar, QWidget#sidebar QWidget {
+        background-color: #f3f4f6;
+        border-right: 1.5px solid #e5e7eb;
+    }
+    QWidget#sidebar QPushButton[kind="nav"] {
+        background-color: transparent;
+        border: none;
+        padding-left: 14px;
+        color: #4b5563;
+        text-align: left;
+        font-weight: 600;
+        border-radius: 12px;
+        transition: background-color 0.3s ease, color 0.3s ease;
+    }
+    QWidget#sidebar QPushButton[kind="nav"]:hover {
+        background-color: #e0e7ff;
+        color: #4338ca;
+    }
+    QWidget#sidebar QPushButton[kind="nav"]:checked {
+        background-color: #4338ca;
+        color: white;
+    }
+    QWidget#sidebar QPushButton#sidebarBack {
+        background-color: #f87171;
+        color: white;
+        padding: 12px;
+        border-radius: 12px;
+        font-weight: 600;
+    }
+    QWidget#sidebar QPushButton#sidebarBack:hover {
+        background-color: #dc2626;
+    }
+
+    QPushButton[kind="danger"] {
+        background-color: #f87171;
+        color: white;
+        border-radius: 12px;
+        padding: 10px 0;
+        font-weight: 700;
+    }
+    QPushButton[kind="danger"]:hover {
+        background-color: #dc2626;
+    }
+    QPushButton[kind="icon"] {
+        font-size: 20px;
+        background-color: transparent;
+        border: none;
+    }
+    QPushButton#loginPasswordToggle {
+        font-size: 18px;
+    }
 
+    QCalendarWidget[kind="preview"] QWidget, QCalendarWidget[kind="planner"] QWidget {
+        font-size: 14px;
+    }
+    QCalendarWidget[kind="preview"] QToolButton {
+        height: 30px;
+        font-weight: 600;
+        color: #2563eb;
+    }
+    QCalendarWidget[kind="preview"] QAbstractItemView:enabled {
+        font-weight: 600;
+    }
+    QCalendarWidget[kind="preview"] QAbstractItemView:enabled:selected {
+        background-color: #3b82f6;
+        color: white;
+        border-radius: 6px;
+    }
+    QCalendarWidget[kind="planner"] QToolButton {
+        height: 34px;
+        font-weight: 600;
+        color: #2563eb;
+    }
+    QCalendarWidget[kind="planner"] QAbstractItemView:enabled:selected {
+        background-color: #3b82f6;
+        color: white;
+        border-radius: 8px;
+    }
+
+    QListView[kind="compact-list"], QListView[kind="todo-list"], QListView[kind="activity-list"] {
+        background-color: white;
+        border: 1.5px solid #d1d5db;
+        font-size: 15px;
+        border-radius: 10px;
+    }
+    QListView[kind="compact-list"] {
+        padding: 8px;
+    }
+    QListView[kind="compact-list"]::item {
+        padding: 8px 12px;
+    }
+    QListView[kind="todo-list"], QListView[kind="activity-list"] {
+        padding: 10px;
+    }
+    QListView[kind="todo-list"]::item, QListView[kind="activity-list"]::item {
+        padding: 10px 14px;
+    }
+    QListView[kind="compact-list"]::item:selected, QListView[kind="todo-list"]::item:selected {
+        background-color: #bfdbfe;
+        color: #1e40af;
+    }
+    QPushButton#addTaskButton {
+        background-color: #4ade80;
+        color: white;
+        padding: 10px;
+        border-radius: 8px;
+        font-weight: 700;
+        max-width: 120px;
+        margin-top: 12px;
+    }
+    QPushButton#addTaskButton:hover {
+        background-color: #22c55e;
+    }
+    QPushButton#addTaskButton:pressed {
+        background-color: #16a34a;
+    }
+
+    QPushButton[kind="subject-card"] {
+        border: 1.3px solid #ccc;
+        border-radius: 16px;
+        padding: 18px;
+        color: #111827;
+        transition: background-color 0.3s ease;
+        font-weight: 700;
+    }
+    QPushButton[kind="subject-card"]:hover {
+        background-color: #e5e7eb;
+    }
+
+    QLabel#subjectTitle {
+        color: #4f46e5;
+    }
+    QTabWidget#subjectTabs::pane {
+        border: none;
+    }
+    QFrame[kind="subject-item"] QLabel {
+        color: white;
+    }
+    QPushButton[kind="ask-ai"] {
+        background-color: #fff59d;
+        font-size: 12px;
+        font-weight: 600;
+        border-radius: 6px;
+        color: #444;
+    }
+    QPushButton[kind="upload"], QPushButton[kind="view-work"] {
+        background-color: white;
+        padding-left: 10px;
+        padding-right: 10px;
+        font-weight: 600;
+        border-radius: 8px;
+    }
+    QPushButton[kind="upload"] {
+        color: #3b82f6;
+        border: 1.5px solid #3b82f6;
+    }
+    QPushButton[kind="upload"]:hover {
+        background-color: #e0e7ff;
+    }
+    QPushButton[kind="upload"]:disabled {
+        color: #a5b4fc;
+        border-color: #a5b4fc;
+    }
+    QPushButton[kind="view-work"] {
+        color: #10b981;
+        border: 1.5px solid #10b981;
+    }
+    QPushButton[kind="view-work"]:hover {
+        background-color: #d1fae5;
+    }
+    QPushButton[kind="view-work"]:disabled {
+        color: #6ee7b7;
+        border-color: #6ee7b7;
+    }
+    QPushButton#backToClass {
+        padding: 8px;
+        margin-top: 24px;
+        font-size: 14px;
+        font-weight: 600;
+        max-width: 140px;
+        color: #374151;
+        background-color: #e0e7ff;
+        border-radius: 10px;
+    }
+
+    QPushButton[kind="settings-action"] {
+        background-color: #60a5fa;
+        color: white;
+        padding: 14px;
+        border-radius: 12px;
+        font-size: 16px;
+        font-weight: 700;
+    }
+    QPushButton#updatePasswordButton {
+        background-color: #4ade80;
+    }
+
+    QLabel#welcomeStudent {
+        color: #555555;
+    }
+    QLabel#welcomeNote {
+        color: #666666;
+    }
+    QPushButton#continueButton {
+        background-color: #3366ff;
+        color: white;
+        border-radius: 10px;
+        padding: 10px 20px;
+        font-weight: 600;
+        transition-duration: 200ms;
+    }
+    QPushButton#continueButton:hover {
+        background-color: #254eda;
+    }
+    QPushButton#continueButton:pressed {
+        background-color: #1a3bb8;
+    }
+    QPushButton#loginButton {
+        background-color: #3b82f6;
+        color: white;
+        border-radius: 12px;
+        font-weight: 700;
+    }
+    QPushButton#loginButton:hover {
+        background-color: #2563eb;
+    }
+    QPushButton#loginButton:pressed {
+        background-color: #1d4ed8;
+    }
+    QPushButton[kind="role-card"] {
+        background-color: rgba(255, 255, 255, 0.85);
+        border-radius: 30px;
+        border: 2px solid transparent;
+        padding: 30px;
+        color: #374151;
+        font-weight: 700;
+        letter-spacing: 0.8px;
+        transition: background-color 0.3s ease, border-color 0.3s ease, color 0.3s ease;
+    }
+    QPushButton[kind="role-card"]:hover {
+        background-color: rgba(240, 240, 240, 0.95);
+        border-color: #3366ff;
+        color: #1e40af;
+    }
+    QPushButton[kind="role-card"]:pressed {
+        background-color: #dbeafe;
+        border-color: #3b82f6;
+    }
+"""
+
+SUBJECT_CARD_RULE = """
+    QPushButton[subject="{subject}"] {{
+        background-color: {color};
+    }}
+"""
+
+# A section's gradient also covers the QFrames inside it (the item label and the notes editor)
+SECTION_RULE = """
+    QFrame[section="{section}"], QFrame[section="{section}"] QFrame {{
+        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {start}, stop:1 {end});
+        border-radius: 18px;
+        padding: 14px 16px;
+        box-shadow: 2px 4px 9px rgba(0,0,0,0.12);
+    }}
+"""
+
+
+def compile_theme():
+    # Component rules come after STYLESHEET: where specificity ties (e.g. QPushButton:hover
+    # against QPushButton[kind="upload"]) the later rule wins, as the inline sheets used to
+    parts = [STYLESHEET, COMPONENT_STYLESHEET]
+    for subject, _, color in SUBJECTS:
+        parts.append(SUBJECT_CARD_RULE.format(subject=subject, color=color))
+    for section, (start, end) in SECTION_GRADIENTS.items():
+        parts.append(SECTION_RULE.format(section=section, start=start, end=end))
+    return "".join(parts)
+
+
+_THEME = None
+
+def get_theme():
+    global _THEME
+    if _THEME is None:
+        _THEME = compile_theme()
+    return _THEME
+
+def apply_theme(app):
+    app.setStyleSheet(get_theme())
+
+# ===============================
+# AI request engine - Qt face of the core AIClient: flights run on a worker pool and
+# their results come back as signals. The client does the caching, coalescing of
+# identical questions, rate limiting and back-off.
+class AIReply(QObject):
+    token = pyqtSignal(str)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, engine, request):
+        super().__init__()
+        self.engine = engine
+        self.request = request
+
+    @property
+    def request_id(self):
+        return self.request.request_id
+
+    @property
+    def from_cache(self):
+        return self.request.from_cache
+
+    @property
+    def coalesced(self):
+        return self.request.coalesced
+
+    @property
+    def done(self):
+        return self.request.done
+
+    @property
+    def submitted_at(self):
+        return self.request.submitted_at
+
+    @property
+    def first_token_at(self):
+        return self.request.first_token_at
+
+    def first_token_latency(self):
+        return self.request.first_token_latency()
+
+    def cancel(self):
+        self.engine.cancel(self.request_id)
+
+
+class _AITaskSignals(QObject):
+    token = pyqtSignal(object)  # flight
+    retrying = pyqtSignal(object, int, float)  # flight, retry, delay
+    finished = pyqtSignal(object, str)  # flight, answer
+    failed = pyqtSignal(object, object)  # flight, exception
+
+
+class _AITask(QRunnable):
+    def __init__(self, client, flight, signals):
+        super().__init__()
+        self.client = client
+        self.flight = flight
+        self.signals = signals
+        # The engine owns the task: it may still tryTake() one whose run() has returned
+        self.setAutoDelete(False)
+        self.exited = False
+
+    def run(self):
+        try:
+            result = self.client.run(self.flight, self.report_token, self.report_retry)
+        except Exception as e:
+            if not self.flight.cancel_event.is_set():
+                self.signals.failed.emit(self.flight, e)
+        else:
+            if not self.flight.cancel_event.is_set():
+                self.signals.finished.emit(self.flight, result)
+        finally:
+            self.exited = True
+
+    def report_token(self, chunk):
+        # The chunk is already in flight.parts; the engine hands out what each reply lacks
+        self.signals.token.emit(self.flight)
+
+    def report_retry(self, retry, delay):
+        self.signals.retrying.emit(self.flight, retry, delay)
+
+
+class AIRequestEngine(QObject):
+    in_flight_changed = pyqtSignal(int)
+
+    def __init__(self, backend=None, max_workers=4, timeout=60.0, cache=None, limiter=None,
+                 max_retries=4, backoff_base=1.0, backoff_cap=30.0, parent=None):
+        super().__init__(parent)
+        self.client = AIClient(backend, cache, limiter, timeout, max_retries, backoff_base, backoff_cap)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self._replies = {}  # request_id -> AIReply, while it waits
+        self._runs = {}  # flight_id -> (task, idle timer or None)
+        self._retired = []  # tasks whose flights ended, kept alive until their run() returns
+        self._signals = _AITaskSignals(self)
+        self._signals.token.connect(self._on_task_token)
+        self._signals.retrying.connect(self._on_task_retrying)
+        self._signals.finished.connect(self._on_task_finished)
+        self._signals.failed.connect(self._on_task_failed)
+
+    def submit(self, prompt, timeout=None, cache_key=None):
+        return self._start(self.client.open(prompt, timeout, cache_key))
+
+    def submit_stream(self, prompt, timeout=None, cache_key=None):
+        # For streams the timeout is an idle timeout: it restarts on every token
+        return self._start(self.client.open(prompt, timeout, cache_key, stream=True))
+
+    def ask(self, choice, text, stream=True, timeout=None):
+        submit = self.submit_stream if stream else self.submit
+        return submit(build_ai_prompt(choice, text), timeout, self.client.cache_key(choice, text))
+
+    def _start(self, request):
+        reply = AIReply(self, request)
+        if request.from_cache:
+            # Delivered on the next event loop turn so the caller can connect first
+            QTimer.singleShot(0, lambda: self._deliver_cached(reply))
+            return reply
+
+        self._replies[request.request_id] = reply
+        flight = request.flight
+        if request.coalesced:
+            # Same question already in flight: it answers this reply too, starting with
+            # whatever it has streamed so far
+            QTimer.singleShot(0, lambda: self._catch_up(reply))
+        else:
+            timer = None
+            if flight.timeout:
+                timer = QTimer(self)
+                timer.setSingleShot(True)
+                timer.timeout.connect(lambda: self._on_timeout(flight))
+                timer.start(int(flight.timeout * 1000))
+            task = _AITask(self.client, flight, self._signals)
+            self._runs[flight.flight_id] = (task, timer)
+            self.pool.start(task)
+        self.in_flight_changed.emit(self.client.in_flight())
+        return reply
+
+    def cancel(self, request_id):
+        request = self.client.cancel(request_id)
+        if request is None:
+            return False
+        reply = self._replies.pop(request_id)
+        if request.flight.ended:
+            # Last waiter gone: the shared backend call was stopped too
+            self._retire(request.flight)
+        self.in_flight_changed.emit(self.client.in_flight())
+        reply.cancelled.emit()
+        return True
+
+    def cancel_all(self):
+        for request_id in list(self._replies):
+            self.cancel(request_id)
+
+    def in_flight(self):
+        return self.client.in_flight()
+
+    def stats(self):
+        return self.client.stats()
+
+    def wait_for_done(self, msecs=-1):
+        return self.pool.waitForDone(msecs)
+
+    def _retire(self, flight):
+        task, timer = self._runs.pop(flight.flight_id)
+        if timer is not None:
+            timer.stop()
+            timer.deleteLater()
+        # A task still waiting in the queue never runs and can be dropped at once. One
+        # that started may still be inside run() (emitting this very result), so it is
+        # kept until run() returns.
+        self._retired = [retired for retired in self._retired if not retired.exited]
+        if not self.pool.tryTake(task):
+            self._retired.append(task)
+
+    def _end(self, flight, requests):
+        # Hands back the replies of a flight that just ended
+        self._retire(flight)
+        replies = [self._replies.pop(request.request_id) for request in requests]
+        self.in_flight_changed.emit(self.client.in_flight())
+        return replies
+
+    def _deliver_cached(self, reply):
+        reply.request.first_token_at = time.perf_counter()
+        reply.token.emit(reply.request.answer)
+        reply.finished.emit(reply.request.answer)
+
+    def _catch_up(self, reply):
+        if not reply.done:
+            self._send_missing(reply)
+
+    def _send_missing(self, reply):
+        text = self.client.missing_text(reply.request)
+        if text:
+            reply.token.emit(text)
+
+    def _on_task_token(self, flight):
+        if flight.ended:
+            return
+        timer = self._runs[flight.flight_id][1]
+        if timer is not None:
+            timer.start(int(flight.timeout * 1000))
+        for request in list(flight.requests):
+            self._send_missing(self._replies[request.request_id])
+
+    def _on_task_retrying(self, flight, retry, delay):
+        run = self._runs.get(flight.flight_id)
+        if run is not None and run[1] is not None:
+            # Backing off is not the AI being unresponsive; give it the extra time
+            run[1].start(run[1].remainingTime() + int(delay * 1000))
+
+    def _on_task_finished(self, flight, text):
+        requests = self.client.finish(flight, text)
+        if requests is None:
+            return
+        for reply in self._end(flight, requests):
+            self._send_missing(reply)
+            reply.finished.emit(text)
+
+    def _on_task_failed(self, flight, error):
+        requests = self.client.fail(flight, error)
+        if requests is None:
+            return
+        for reply in self._end(flight, requests):
+            reply.failed.emit(describe_ai_error(error))
+
+    def _on_timeout(self, flight):
+        requests = self.client.expire(flight)
+        if requests is None:
+            return
+        for reply in self._end(flight, requests):
+            reply.failed.emit(describe_ai_error(flight.error))
+
+
+# ===============================
+# AI Response Panel - non-modal window that renders a streamed answer as it arrives
+class AIResponsePanel(QDialog):
+    def __init__(self, title, reply, parent=None):
+        super().__init__(parent)
+        self.reply = reply
+        self.setWindowTitle(title)
+        self.setModal(False)
+        self.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
+        self.resize(520, 360)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(18, 18, 18, 18)
+        layout.setSpacing(12)
+
+        self.status_label = QLabel("Waiting for AI...")
+        self.status_label.setObjectName("aiStatus")
+        layout.addWidget(self.status_label)
+
+        self.output = QTextEdit()
+        self.output.setReadOnly(True)
+        self.output.setFont(QFont("Segoe UI", 13))
+        layout.addWidget(self.output)
+
+        self.action_btn = QPushButton("Stop")
+        self.action_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.action_btn.clicked.connect(self.stop_or_close)
+        layout.addWidget(self.action_btn, alignment=Qt.AlignmentFlag.AlignRight)
+
+        reply.token.connect(self.append_token)
+        reply.finished.connect(self.on_finished)
+        reply.failed.connect(self.on_failed)
+        reply.cancelled.connect(lambda: self.set_done("Stopped."))
+
+    def append_token(self, chunk):
+        if self.reply.first_token_at is not None and self.output.document().isEmpty():
+            self.status_label.setText(f"Receiving... (first words after {self.reply.first_token_latency():.2f}s)")
+        cursor = self.output.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(chunk)
+
+    def on_finished(self, text):
+        # Non-streaming replies arrive in one piece
+        if self.output.document().isEmpty():
+            self.output.setPlainText(text)
+        self.set_done("Done (from cache)." if self.reply.from_cache else "Done.")
+
+    def on_failed(self, error):
+        self.set_done(f"Something went wrong: {error}")
+
+    def set_done(self, status):
+        self.status_label.setText(status)
+        self.action_btn.setText("Close")
+
+    def stop_or_close(self):
+        if self.reply.done:
+            self.close()
+        else:
+            self.reply.cancel()
+
+    def closeEvent(self, event):
+        if not self.reply.done:
+            self.reply.cancel()
+        super().closeEvent(event)
+
+
+_AI_ENGINE = None
+
+def get_ai_engine():
+    global _AI_ENGINE
+    if _AI_ENGINE is None:
+        _AI_ENGINE = AIRequestEngine()
+    return _AI_ENGINE
+
+# Legacy JSON files, imported into the SQLite database on first run
 NOTES_FILE = "notes.json"
 ASSIGNMENTS_FILE = "assignment_submissions.json"
 
-if os.path.exists(NOTES_FILE):
+# ===============================
+# Storage - notes and submissions live in SQLite (educloud.db); the old JSON files
+# are imported once on first open
+_STORAGE = None
+
+def get_storage():
+    global _STORAGE
+    if _STORAGE is None:
+        _STORAGE = Storage(DB_FILE)
+        _STORAGE.migrate_json(NOTES_FILE, ASSIGNMENTS_FILE)
+    return _STORAGE
+
+
+class _NoteWriteTask(QRunnable):
+    def __init__(self, storage, changes):
+        super().__init__()
+        self.storage = storage
+        self.changes = changes
+
+    def run(self):
+        try:
+            self.storage.save_notes(self.changes)
+        except Exception as e:
+            print(f"Could not save notes: {e}", file=sys.stderr)
+
+
+class DebouncedNoteSaver(QObject):
+    # Collects note edits and writes only the changed notes once typing pauses for `debounce_ms`
+    def __init__(self, storage, debounce_ms=400, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self._dirty = {}  # (subject, section, item) -> text
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._write_pending)
+        # One writer thread keeps saves in order
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    def note_changed(self, key, text):
+        self._dirty[key] = text
+        self._timer.start()
+
+    def pending(self):
+        return len(self._dirty)
+
+    def _write_pending(self):
+        if not self._dirty:
+            return
+        changes, self._dirty = self._dirty, {}
+        self._pool.start(_NoteWriteTask(self.storage, changes))
+
+    def flush(self):
+        self._timer.stop()
+        self._pool.waitForDone()
+        if self._dirty:
+            changes, self._dirty = self._dirty, {}
+            self.storage.save_notes(changes)
+
+
+_NOTE_SAVER = None
+
+def get_note_saver():
+    global _NOTE_SAVER
+    if _NOTE_SAVER is None:
+        _NOTE_SAVER = DebouncedNoteSaver(get_storage())
+    return _NOTE_SAVER
+
+# ===============================
+# Submissions - uploads are streamed into the content-addressed blob store on a
+# worker thread and recorded once the copy is complete; views follow along through
+# upload_progress / submission_changed
+class _UploadTaskSignals(QObject):
+    progress = pyqtSignal(str, str, int)
+    # A C++ int would wrap sizes past 2 GiB; object carries the Python int as is
+    finished = pyqtSignal(str, str, str, str, str, object)
+    failed = pyqtSignal(str, str, str)
+
+
+class _UploadTask(QRunnable):
+    def __init__(self, blobs, subject, item, file_path, student, signals):
+        super().__init__()
+        self.blobs = blobs
+        self.subject = subject
+        self.item = item
+        self.file_path = file_path
+        self.student = student
+        self.signals = signals
+        self._percent = -1
+
+    def run(self):
+        try:
+            digest, size = self.blobs.ingest(self.file_path, self.report)
+        except OSError as e:
+            self.signals.failed.emit(self.subject, self.item, str(e) or e.__class__.__name__)
+            return
+        self.signals.finished.emit(self.subject, self.item, self.student, self.file_path, digest, size)
+
+    def report(self, done, total):
+        # Only whole-percent steps cross to the GUI thread
+        percent = done * 100 // total if total else 100
+        if percent != self._percent:
+            self._percent = percent
+            self.signals.progress.emit(self.subject, self.item, percent)
+
+
+class SubmissionStore(QObject):
+    upload_progress = pyqtSignal(str, str, int)  # subject, item, percent
+    upload_failed = pyqtSignal(str, str, str)  # subject, item, message
+    submission_changed = pyqtSignal(str, str)  # subject, item: submitted or withdrawn
+
+    OPEN_DIR = os.path.join(tempfile.gettempdir(), "educloud-submissions")
+
+    def __init__(self, storage, blobs, parent=None):
+        super().__init__(parent)
+        self.storage = storage
+        self.blobs = blobs
+        self.student = ""  # student number of whoever is signed in
+        self._uploading = {}  # (subject, item) -> percent
+        self._signals = _UploadTaskSignals(self)
+        self._signals.progress.connect(self._on_progress)
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        # One copy at a time keeps large uploads from competing for the disk
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
+    def set_student(self, student):
+        self.student = student
+        self.storage.claim_submissions(student)
+
+    def submissions_for_subject(self, subject):
+        return self.storage.submissions_for_subject(subject, self.student)
+
+    def submitted_path(self, subject, item):
+        return self.storage.get_submission(subject, item, self.student)
+
+    def uploading(self, subject, item):
+        # Percent copied so far, or None when no upload is running
+        return self._uploading.get((subject, item))
+
+    def submit(self, subject, item, file_path):
+        if (subject, item) in self._uploading:
+            return False
+        self._uploading[(subject, item)] = 0
+        # Filed under whoever started the upload, even if they sign out before it ends
+        self._pool.start(_UploadTask(self.blobs, subject, item, file_path, self.student, self._signals))
+        return True
+
+    def unsubmit(self, subject, item):
+        self._release(self.storage.delete_submission(subject, item, self.student))
+        self.submission_changed.emit(subject, item)
+
+    def file_name(self, subject, item):
+        # Name of the submitted file, or None when nothing is submitted
+        row = self.storage.get_submission_blob(subject, item, self.student)
+        if row is None:
+            return None
+        return row[1] or os.path.basename(self.submitted_path(subject, item))
+
+    def open_path(self, subject, item):
+        # A path the desktop can open, or None when nothing is submitted
+        row = self.storage.get_submission_blob(subject, item, self.student)
+        if row is None:
+            return None
+        digest, file_name, _ = row
+        if digest is None:
+            # Recorded before the blob store: all we have is the student's own file
+            return self.submitted_path(subject, item)
+        return self.blobs.export(digest, file_name, self.OPEN_DIR)
+
+    def preview_source(self, subject, item):
+        # (path, digest, file_name) to read the submission in place, or None. The digest
+        # is None for submissions recorded before the blob store.
+        row = self.storage.get_submission_blob(subject, item, self.student)
+        if row is None:
+            return None
+        digest, file_name, _ = row
+        if digest is None:
+            file_path = self.submitted_path(subject, item)
+            return file_path, None, os.path.basename(file_path)
+        return self.blobs.path(digest), digest, file_name
+
+    def wait(self):
+        self._pool.waitForDone()
+
+    def _release(self, digest):
+        # Blobs are shared between identical submissions; drop one when nothing uses it
+        if digest and not self.storage.blob_references(digest):
+            self.blobs.remove(digest)
+
+    def _on_progress(self, subject, item, percent):
+        if (subject, item) in self._uploading:
+            self._uploading[(subject, item)] = percent
+            self.upload_progress.emit(subject, item, percent)
+
+    def _on_finished(self, subject, item, student, file_path, digest, size):
+        self._uploading.pop((subject, item), None)
+        try:
+            replaced = self.storage.set_submission(subject, item, file_path, digest,
+                                                   os.path.basename(file_path), size, student)
+        except Exception as e:
+            self._release(digest)
+            self.upload_failed.emit(subject, item, f"Could not record the submission:\n{e}")
+            return
+        if replaced != digest:
+            self._release(replaced)
+        self.submission_changed.emit(subject, item)
+
+    def _on_failed(self, subject, item, message):
+        self._uploading.pop((subject, item), None)
+        self.upload_failed.emit(subject, item, f"Could not copy the file:\n{message}")
+
+
+_SUBMISSION_STORE = None
+
+def get_submission_store():
+    global _SUBMISSION_STORE
+    if _SUBMISSION_STORE is None:
+        _SUBMISSION_STORE = SubmissionStore(get_storage(), BlobStore(BLOB_DIR))
+    return _SUBMISSION_STORE
+
+# ===============================
+# Submission preview - "View Your Work" can show text, images and the first page of
+# a PDF in-app. Text is read through mmap and only the lines on screen are decoded,
+# so a large file opens at once without being loaded. Images and PDF pages are
+# decoded straight to preview size and kept in a thumbnail cache keyed by the
+# blob's content hash.
+THUMBNAIL_CACHE_DIR = "thumbnail_cache"
+PREVIEW_SIZE = QSize(640, 760)
+SNIFF_BYTES = 8192
+
+def sniff_preview_kind(path):
+    # "pdf", "image", "text" or None, judged by the file's bytes: blobs have no extension
+    with open(path, "rb") as f:
+        head = f.read(SNIFF_BYTES)
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if QImageReader(path).canRead():
+        return "image"
+    if b"\0" not in head:
+        return "text"
+    return None
+
+
+def render_preview_image(path, kind, size):
+    if kind == "pdf":
+        QPdfDocument = load_pdf_document()
+        if QPdfDocument is None:
+            return None
+        document = QPdfDocument(None)
+        if document.load(path) != QPdfDocument.Error.None_ or document.pageCount() == 0:
+            return None
+        page_size = document.pagePointSize(0).toSize().scaled(size, Qt.AspectRatioMode.KeepAspectRatio)
+        page = document.render(0, page_size)
+        document.close()
+        if page.isNull():
+            return None
+        # Pages render onto transparency
+        image = QImage(page.size(), QImage.Format.Format_RGB32)
+        image.fill(QColor("white"))
+        painter = QPainter(image)
+        painter.drawImage(0, 0, page)
+        painter.end()
+        return image
+    # The reader decodes at the scaled size, so a huge photo never exists at full size
+    reader = QImageReader(path)
+    reader.setAutoTransform(True)
+    full_size = reader.size()
+    if full_size.isValid() and (full_size.width() > size.width() or full_size.height() > size.height()):
+        reader.setScaledSize(full_size.scaled(size, Qt.AspectRatioMode.KeepAspectRatio))
+    image = reader.read()
+    return None if image.isNull() else image
+
+
+def preview_pixmap(path, kind, digest, ratio):
+    size = QSize(round(PREVIEW_SIZE.width() * ratio), round(PREVIEW_SIZE.height() * ratio))
+    cache = get_thumbnail_cache()
+    key = cache.make_key("preview", digest, 0, size.width(), size.height(), ratio) if digest else None
+    pixmap = cache.get(key) if key else None
+    if pixmap is None:
+        image = render_preview_image(path, kind, size)
+        if image is None:
+            return None
+        if key:
+            pixmap = cache.put(key, image)
+        else:
+            pixmap = QPixmap.fromImage(image)
+            pixmap.setDevicePixelRatio(ratio)
+    return pixmap
+
+
+_THUMBNAIL_CACHE = None
+
+def get_thumbnail_cache():
+    # Same memory LRU + PNG mirror as the chart cache, keyed by content hash instead
+    global _THUMBNAIL_CACHE
+    if _THUMBNAIL_CACHE is None:
+        _THUMBNAIL_CACHE = ChartImageCache(THUMBNAIL_CACHE_DIR, max_memory_entries=8)
+    return _THUMBNAIL_CACHE
+
+
+class MappedTextView(QAbstractScrollArea):
+    # Read-only view over a memory-mapped text file. The scroll bar runs over byte
+    # offsets; each paint backs up to the start of the line under the offset and
+    # decodes just enough lines to fill the viewport.
+    MAX_LINE_BYTES = 4096  # longer lines are shown in pieces of this size
+    MAX_SCROLL_STEPS = 1 << 30  # scroll bars hold ints; bigger files scroll in coarser steps
+    MARGIN = 10
+
+    def __init__(self, path, parent=None):
+        super().__init__(parent)
+        self.setObjectName("previewText")
+        self.setFont(QFont("Consolas", 11))
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        # mmap refuses empty files
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._size else b""
+        self._unit = self._size // self.MAX_SCROLL_STEPS + 1
+        # Line length from the first few KiB, to turn line and page steps into bytes
+        head = self._map[:SNIFF_BYTES]
+        self._line_bytes = max(1, len(head) // (head.count(b"\n") + 1))
+
+    def close_file(self):
+        if self._size:
+            self._map.close()
+        self._file.close()
+        self._size = 0
+        self._map = b""
+
+    def line_start(self, offset):
+        offset = min(offset, max(0, self._size - 1))
+        floor = max(0, offset - self.MAX_LINE_BYTES)
+        newline = self._map.rfind(b"\n", floor, offset)
+        if newline != -1:
+            return newline + 1
+        return 0 if floor == 0 else offset
+
+    def read_line(self, offset):
+        # (text, offset of the next line)
+        end = self._map.find(b"\n", offset, offset + self.MAX_LINE_BYTES)
+        stop = end if end != -1 else min(offset + self.MAX_LINE_BYTES, self._size)
+        text = self._map[offset:stop].decode("utf-8", "replace").rstrip("\r").expandtabs(4)
+        return text, (end + 1 if end != -1 else stop)
+
+    def visible_rows(self):
+        return max(1, (self.viewport().height() - self.MARGIN) // self.fontMetrics().lineSpacing())
+
+    def update_scroll_range(self):
+        # Stop scrolling once the last page fills the view
+        rows = self.visible_rows()
+        last_page = self._size
+        for _ in range(rows):
+            if last_page == 0:
+                break
+            last_page = self.line_start(last_page - 1)
+        bar = self.verticalScrollBar()
+        bar.setRange(0, last_page // self._unit)
+        bar.setSingleStep(max(1, self._line_bytes // self._unit))
+        bar.setPageStep(max(1, rows * self._line_bytes // self._unit))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_range()
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        metrics = self.fontMetrics()
+        offset = self.line_start(self.verticalScrollBar().value() * self._unit)
+        y = self.MARGIN + metrics.ascent()
+        bottom = self.viewport().height() + metrics.ascent()
+        while offset < self._size and y < bottom:
+            text, offset = self.read_line(offset)
+            painter.drawText(self.MARGIN, y, text)
+            y += metrics.lineSpacing()
+        painter.end()
+
+
+class SubmissionPreview(QDialog):
+    def __init__(self, file_name, path, digest=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(f"Preview - {file_name}")
+        self.resize(PREVIEW_SIZE.width() + 40, PREVIEW_SIZE.height() + 90)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(18, 18, 18, 18)
+        layout.setSpacing(12)
+
+        self.text_view = None
+        kind = sniff_preview_kind(path)
+        if kind == "text":
+            self.text_view = MappedTextView(path)
+            layout.addWidget(self.text_view, 1)
+        else:
+            body = QLabel()
+            body.setObjectName("previewImage")
+            body.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            pixmap = preview_pixmap(path, kind, digest, self.devicePixelRatioF()) if kind else None
+            if pixmap is None:
+                body.setText("There is no preview for this kind of file.\nUse Open File to view it.")
+            else:
+                body.setPixmap(pixmap)
+            layout.addWidget(body, 1)
+
+        close_btn = QPushButton("Close")
+        close_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn, alignment=Qt.AlignmentFlag.AlignRight)
+
+    def done(self, result):
+        # Unmap before the submission can be withdrawn and its blob deleted
+        if self.text_view is not None:
+            self.text_view.close_file()
+        super().done(result)
+
+# ===============================
+# Progress Repository - Qt face of the core GradeRepository, the one grade source
+# every view reads; views subscribe to grade_changed / grade_added and patch only the
+# affected row
+class ProgressRepository(QObject):
+    grade_changed = pyqtSignal(str, int)
+    grade_added = pyqtSignal(str, int)
+
+    def __init__(self, storage=None, seed=DEFAULT_GRADES, parent=None):
+        super().__init__(parent)
+        self.grades = GradeRepository(storage, seed)
+
+    def periods(self):
+        return self.grades.periods()
+
+    def titles(self, period):
+        return self.grades.titles(period)
+
+    def records(self, period, start=0, stop=None):
+        return self.grades.records(period, start, stop)
+
+    def count(self, period):
+        return self.grades.count(period)
+
+    def record(self, period, index):
+        return self.grades.record(period, index)
+
+    def percent_scores(self, period):
+        return self.grades.percent_scores(period)
+
+    def summary(self, period):
+        return self.grades.summary(period)
+
+    def version(self, period):
+        return self.grades.version(period)
+
+    def fingerprint(self, period):
+        return self.grades.fingerprint(period)
+
+    def set_grade(self, period, index, score, status=None):
+        self.grades.set_grade(period, index, score, status)
+        self.grade_changed.emit(period, index)
+
+    def add_grade(self, record):
+        index = self.grades.add_grade(record)
+        self.grade_added.emit(record.period, index)
+        return index
+
+
+_PROGRESS_REPOSITORY = None
+
+def get_progress_repository():
+    global _PROGRESS_REPOSITORY
+    if _PROGRESS_REPOSITORY is None:
+        _PROGRESS_REPOSITORY = ProgressRepository(get_storage())
+    return _PROGRESS_REPOSITORY
+
+def current_rss_bytes():
+    # Resident set size of this process, or None where it can't be read cheaply
     try:
-        with open(NOTES_FILE, "r") as f:
-            SAVED_NOTES = json.load(f)
-    except Exception as e:
-        SAVED_NOTES = {}
-else:
-    SAVED_NOTES = {}
-
-if os.path.exists(ASSIGNMENTS_FILE):
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
     try:
-        with open(ASSIGNMENTS_FILE, "r") as f:
-            SUBMITTED_ASSIGNMENTS = json.load(f)
-    except Exception as e:
-        SUBMITTED_ASSIGNMENTS = {}
-else:
-    SUBMITTED_ASSIGNMENTS = {}
-
-progress_data = {
-    "This Week": [
-        ("Math Homework", "Graded: 90/100", "green"),
-        ("Science Quiz", "Ungraded", "gray"),
-        ("English Essay", "Graded: 88/100", "green"),
-        ("History Quiz", "Graded: 82/100", "green"),
-        ("Biology Lab", "Ungraded", "gray"),
-        ("PE Fitness Test", "Graded: 92/100", "green"),
-        ("Computer Assignment", "Graded: 85/100", "green")
-    ]
-}
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss
+
 
 # ===============================
 # Subject Detail Page - enhanced with improved UI and functionality
+# A tab's items are built the first time the tab is shown, and only the items
+# scrolled into view hold a live notes editor (see NoteSlot)
+SUBJECT_SECTIONS = [
+    ("Modules", "modules", [
+        ("Module 1: Introduction", "Mathematics is the study of numbers, shapes, and patterns."),
+        ("Module 2: Advanced Topics", "Covers calculus and problem-solving techniques."),
+        ("Module 3: Practice", "Hands-on exercises and practice problems.")
+    ]),
+    ("Pointers to Review", "pointers", [
+        ("Key Formula", "List of formulas you should memorize."),
+        ("Important Concepts", "Concepts you must understand."),
+        ("Sample Questions", "Example questions for practice.")
+    ]),
+    ("Assignments", "assignments", [
+        ("Assignment 1", "Solve exercises on page 34-35."),
+        ("Assignment 2", "Group activity about measurements."),
+        ("Assignment 3", "Create a math puzzle.")
+    ])
+]
+
+
+class NoteSlot(QWidget):
+    # Keeps an item's place and note text; a QTextEdit is lent to it while it is on screen.
+    # The editor is sized by hand rather than by a layout, so lending it out does not
+    # send a relayout up through the whole page.
+    HEIGHT = 90
+
+    def __init__(self, note_key, text):
+        super().__init__()
+        self.note_key = note_key
+        self.text = text
+        self.editor = None
+        self.setFixedHeight(self.HEIGHT)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.editor is not None:
+            self.editor.setGeometry(self.rect())
+
+
 class SubjectDetailPage(QWidget):
     def __init__(self, subject_name, back_callback):
         super().__init__()
-        scroll = QScrollArea()
+        self.subject_name = subject_name
+        self.scroll = scroll = QScrollArea()
         scroll.setWidgetResizable(True)
 
-        main_container = QWidget()
+        self.container = main_container = QWidget()
         main_layout = QVBoxLayout(main_container)
         main_layout.setSpacing(24)
         main_layout.setContentsMargins(18, 18, 18, 18)
@@ -164,224 +1343,34 @@ class SubjectDetailPage(QWidget):
         title = QLabel(f"{subject_name} Details")
         title.setFont(QFont("Segoe UI", 24, QFont.Weight.Bold))
         title.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title.setStyleSheet("color: #4f46e5;")
+        title.setObjectName("subjectTitle")
         main_layout.addWidget(title)
 
-        tab_widget = QTabWidget()
-        tab_widget.setStyleSheet("QTabWidget::pane { border: none; }")
-
-        section_data = [
-            ("Modules", "modules", [
-                ("Module 1: Introduction", "Mathematics is the study of numbers, shapes, and patterns."),
-                ("Module 2: Advanced Topics", "Covers calculus and problem-solving techniques."),
-                ("Module 3: Practice", "Hands-on exercises and practice problems.")
-            ], "#6366f1", "#38bdf8"),
-            ("Pointers to Review", "pointers", [
-                ("Key Formula", "List of formulas you should memorize."),
-                ("Important Concepts", "Concepts you must understand."),
-                ("Sample Questions", "Example questions for practice.")
-            ], "#f43f5e", "#f87171"),
-            ("Assignments", "assignments", [
-                ("Assignment 1", "Solve exercises on page 34-35."),
-                ("Assignment 2", "Group activity about measurements."),
-                ("Assignment 3", "Create a math puzzle.")
-            ], "#22c55e", "#a3e635")
-        ]
-
-        for title_text, category, items, color_start, color_end in section_data:
-            section_widget = QWidget()
-            section_layout = QVBoxLayout(section_widget)
-            section_layout.setSpacing(18)
-
-            for item_title, item_content in items:
-                section_frame = QFrame()
-                section_frame.setStyleSheet(f"""
-                    QFrame {{
-                        background-color: qlineargradient(x1:0, y1:0, x2:1, y2:0, stop:0 {color_start}, stop:1 {color_end});
-                        border-radius: 18px;
-                        padding: 14px 16px;
-                        box-shadow: 2px 4px 9px rgba(0,0,0,0.12);
-                    }}
-                """)
-                item_layout = QVBoxLayout(section_frame)
-                item_layout.setSpacing(8)
-
-                item_label = QLabel(f"\u2022 <b>{item_title}:</b> {item_content}")
-                item_label.setFont(QFont("Segoe UI", 14))
-                item_label.setStyleSheet("color: white;")
-                item_label.setWordWrap(True)
-                item_layout.addWidget(item_label)
-
-                if category == "modules":
-                    ask_ai_btn = QPushButton("Ask AI")
-                    ask_ai_btn.setVisible(False)  # Show only when text is selected
-                    ask_ai_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-                    ask_ai_btn.setFixedSize(90, 28)
-                    ask_ai_btn.setStyleSheet("background-color: #fff59d; font-size: 12px; font-weight: 600; border-radius: 6px; color: #444;")
-                    item_layout.addWidget(ask_ai_btn, alignment=Qt.AlignmentFlag.AlignRight)
-
-                    def maybe_show_ai_btn():
-                        if item_label.hasSelectedText():
-                            ask_ai_btn.setVisible(True)
-                        else:
-                            ask_ai_btn.setVisible(False)
-
-                    def ask_ai_action():
-                        selected_text = item_label.selectedText()
-                        if selected_text:
-                            choice, ok = QInputDialog.getItem(
-                                self, "Ask AI", f"What would you like to do with:\n“{selected_text}”",
-                                ["Explain", "Edit"], editable=False
-                            )
-                            if ok:
-                                try:
-                                    prompt = f"{choice} the following text:\n\n{selected_text}"
-                                    # Basic loading while waiting for response
-                                    msg_wait = QMessageBox(self)
-                                    msg_wait.setWindowTitle("AI Response")
-                                    msg_wait.setText("Please wait while AI is processing...")
-                                    msg_wait.setStandardButtons(QMessageBox.StandardButton.NoButton)
-                                    msg_wait.show()
-
-                                    ai_output = get_ai_response(prompt)
-
-                                    msg_wait.close()
-                                    QMessageBox.information(self, f"AI {choice}", ai_output)
-                                except Exception as e:
-                                    QMessageBox.warning(self, "AI Error", f"Something went wrong:\n{e}")
-
-                    item_label.mouseReleaseEvent = lambda event: (maybe_show_ai_btn(), QLabel.mouseReleaseEvent(item_label, event))
-                    ask_ai_btn.clicked.connect(ask_ai_action)
-
-                notes_edit = QTextEdit()
-                notes_edit.setPlaceholderText("Private comment...")
-                notes_edit.setFont(QFont("Segoe UI", 13))
-                notes_edit.setFixedHeight(90)
-                note_key = f"{title_text}::{item_title}"
-                notes_edit.setText(SAVED_NOTES.get(note_key, ""))
-
-                def save_note(note_key=note_key, notes_edit=notes_edit):
-                    SAVED_NOTES[note_key] = notes_edit.toPlainText()
-                    try:
-                        with open(NOTES_FILE, "w") as f:
-                            json.dump(SAVED_NOTES, f, indent=2)
-                    except Exception:
-                        pass
-
-                notes_edit.textChanged.connect(save_note)
-                item_layout.addWidget(notes_edit)
-
-                if category == "assignments":
-                    assign_key = f"{subject_name}::{item_title}"
-
-                    upload_btn = QPushButton("Upload File")
-                    upload_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: white;
-                            color: #3b82f6;
-                            padding-left: 10px;
-                            padding-right: 10px;
-                            font-weight: 600;
-                            border: 1.5px solid #3b82f6;
-                            border-radius: 8px;
-                        }
-                        QPushButton:hover {
-                            background-color: #e0e7ff;
-                        }
-                        QPushButton:disabled {
-                            color: #a5b4fc;
-                            border-color: #a5b4fc;
-                        }
-                    """)
-                    upload_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-
-                    view_btn = QPushButton("View Your Work")
-                    view_btn.setStyleSheet("""
-                        QPushButton {
-                            background-color: white;
-                            color: #10b981;
-                            padding-left: 10px;
-                            padding-right: 10px;
-                            font-weight: 600;
-                            border: 1.5px solid #10b981;
-                            border-radius: 8px;
-                        }
-                        QPushButton:hover {
-                            background-color: #d1fae5;
-                        }
-                        QPushButton:disabled {
-                            color: #6ee7b7;
-                            border-color: #6ee7b7;
-                        }
-                    """)
-                    view_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-
-                    def make_upload_handler(assign_key_local, upload_btn_local, view_btn_local):
-                        def upload_file():
-                            file_path, _ = QFileDialog.getOpenFileName(self, "Upload Assignment", "", "All Files (*)")
-                            if file_path:
-                                SUBMITTED_ASSIGNMENTS[assign_key_local] = file_path
-                                try:
-                                    with open(ASSIGNMENTS_FILE, "w") as f:
-                                        json.dump(SUBMITTED_ASSIGNMENTS, f, indent=2)
-                                except Exception:
-                                    pass
-                                upload_btn_local.setText("Uploaded \u2714")
-                                upload_btn_local.setEnabled(False)
-                                view_btn_local.setEnabled(True)
-                        return upload_file
-
-                    def make_view_handler(assign_key_local, upload_btn_local, view_btn_local):
-                        def view_or_unsubmit():
-                            if assign_key_local in SUBMITTED_ASSIGNMENTS:
-                                file_path = SUBMITTED_ASSIGNMENTS[assign_key_local]
-                                msg_box = QMessageBox()
-                                msg_box.setWindowTitle("Submitted File")
-                                file_name = os.path.basename(file_path)
-                                msg_box.setText(f"Submitted: {file_name}")
-                                msg_box.setInformativeText("What do you want to do?")
-                                open_btn = msg_box.addButton("Open File", QMessageBox.ButtonRole.AcceptRole)
-                                unsubmit_btn = msg_box.addButton("Unsubmit", QMessageBox.ButtonRole.DestructiveRole)
-                                msg_box.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
-                                msg_box.exec()
-
-                                clicked = msg_box.clickedButton()
-                                if clicked == unsubmit_btn:
-                                    del SUBMITTED_ASSIGNMENTS[assign_key_local]
-                                    try:
-                                        with open(ASSIGNMENTS_FILE, "w") as f:
-                                            json.dump(SUBMITTED_ASSIGNMENTS, f, indent=2)
-                                    except Exception:
-                                        pass
-                                    upload_btn_local.setEnabled(True)
-                                    upload_btn_local.setText("Upload File")
-                                    view_btn_local.setEnabled(False)
-                                elif clicked == open_btn:
-                                    QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
-                        return view_or_unsubmit
-
-                    upload_btn.clicked.connect(make_upload_handler(assign_key, upload_btn, view_btn))
-                    view_btn.clicked.connect(make_view_handler(assign_key, upload_btn, view_btn))
-
-                    if assign_key in SUBMITTED_ASSIGNMENTS:
-                        upload_btn.setText("Uploaded \u2714")
-                        upload_btn.setEnabled(False)
-                        view_btn.setEnabled(True)
-                    else:
-                        view_btn.setEnabled(False)
-
-                    item_layout.addWidget(upload_btn)
-                    item_layout.addWidget(view_btn)
-
-                section_layout.addWidget(section_frame)
-
-            tab_widget.addTab(section_widget, title_text)
+        self.tab_widget = tab_widget = QTabWidget()
+        tab_widget.setObjectName("subjectTabs")
+
+        self.saved_notes = get_storage().notes_for_subject(subject_name)
+        submissions = get_submission_store()
+        self.submissions = submissions.submissions_for_subject(subject_name)
+        self._assignment_buttons = {}  # item -> (upload button, view button)
+        submissions.upload_progress.connect(self.on_upload_progress)
+        submissions.upload_failed.connect(self.on_upload_failed)
+        submissions.submission_changed.connect(self.on_submission_changed)
+
+        self._sections = []
+        self._slots = {}  # tab index -> NoteSlots, for the tabs built so far
+        self._spare_editors = []
+        for title_text, category, items in SUBJECT_SECTIONS:
+            tab_page = QWidget()
+            QVBoxLayout(tab_page).setContentsMargins(0, 0, 0, 0)
+            self._sections.append((title_text, category, items))
+            tab_widget.addTab(tab_page, title_text)
 
         main_layout.addWidget(tab_widget)
 
         back_btn = QPushButton("Back to Class")
         back_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        back_btn.setStyleSheet("padding: 8px; margin-top: 24px; font-size: 14px; font-weight: 600; max-width: 140px; color: #374151; background-color: #e0e7ff; border-radius: 10px;")
+        back_btn.setObjectName("backToClass")
         back_btn.clicked.connect(back_callback)
         main_layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignLeft)
 
@@ -391,6 +1380,575 @@ class SubjectDetailPage(QWidget):
         layout.addWidget(scroll)
         self.setLayout(layout)
 
+        # Editors follow the viewport; geometry settles after layout, hence the timer
+        self._window_timer = QTimer(self)
+        self._window_timer.setSingleShot(True)
+        self._window_timer.setInterval(0)
+        self._window_timer.timeout.connect(self._settle_editor_window)
+        scroll.verticalScrollBar().valueChanged.connect(self.update_editor_window)
+        tab_widget.currentChanged.connect(self.show_tab)
+        self.show_tab(tab_widget.currentIndex())
+
+    def show_tab(self, index):
+        if index not in self._slots:
+            # Filled while detached and added in one go, so the items are polished and
+            # laid out together instead of one by one on a visible page
+            title_text, category, items = self._sections[index]
+            section_widget = QWidget()
+            section_layout = QVBoxLayout(section_widget)
+            section_layout.setSpacing(18)
+            self._slots[index] = [self.build_item(section_layout, title_text, category, item_title, item_content)
+                                  for item_title, item_content in items]
+            self.tab_widget.widget(index).layout().addWidget(section_widget)
+        self._window_timer.start()
+
+    def build_item(self, section_layout, title_text, category, item_title, item_content):
+        subject_name = self.subject_name
+        section_frame = QFrame()
+        section_frame.setProperty("kind", "subject-item")
+        section_frame.setProperty("section", category)
+        item_layout = QVBoxLayout(section_frame)
+        item_layout.setSpacing(8)
+
+        item_label = QLabel(f"\u2022 <b>{item_title}:</b> {item_content}")
+        item_label.setFont(QFont("Segoe UI", 14))
+        item_label.setWordWrap(True)
+        item_layout.addWidget(item_label)
+
+        if category == "modules":
+            ask_ai_btn = QPushButton("Ask AI")
+            ask_ai_btn.setVisible(False)  # Show only when text is selected
+            ask_ai_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+            ask_ai_btn.setFixedSize(90, 28)
+            ask_ai_btn.setProperty("kind", "ask-ai")
+            item_layout.addWidget(ask_ai_btn, alignment=Qt.AlignmentFlag.AlignRight)
+
+            def maybe_show_ai_btn():
+                if item_label.hasSelectedText():
+                    ask_ai_btn.setVisible(True)
+                else:
+                    ask_ai_btn.setVisible(False)
+
+            def ask_ai_action():
+                selected_text = item_label.selectedText()
+                if selected_text:
+                    choice, ok = QInputDialog.getItem(
+                        self, "Ask AI", f"What would you like to do with:\n“{selected_text}”",
+                        ["Explain", "Edit"], editable=False
+                    )
+                    if ok:
+                        # Answer streams into a non-modal panel while the worker pool runs the request;
+                        # repeated questions are answered from the response cache
+                        reply = get_ai_engine().ask(choice, selected_text)
+                        panel = AIResponsePanel(f"AI {choice}", reply, self)
+                        panel.show()
+
+            item_label.mouseReleaseEvent = lambda event: (maybe_show_ai_btn(), QLabel.mouseReleaseEvent(item_label, event))
+            ask_ai_btn.clicked.connect(ask_ai_action)
+
+        note_slot = NoteSlot((subject_name, title_text, item_title),
+                             self.saved_notes.get((title_text, item_title), ""))
+        item_layout.addWidget(note_slot)
+
+        if category == "assignments":
+            assign_item = item_title
+
+            upload_btn = QPushButton("Upload File")
+            upload_btn.setProperty("kind", "upload")
+            upload_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+
+            view_btn = QPushButton("View Your Work")
+            view_btn.setProperty("kind", "view-work")
+            view_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+
+            def upload_file():
+                file_path, _ = QFileDialog.getOpenFileName(self, "Upload Assignment", "", "All Files (*)")
+                if file_path:
+                    # The copy runs in the background; the button follows its progress
+                    get_submission_store().submit(subject_name, assign_item, file_path)
+                    self.show_submission_state(assign_item)
+
+            def view_or_unsubmit():
+                submissions = get_submission_store()
+                file_name = submissions.file_name(subject_name, assign_item)
+                if file_name:
+                    msg_box = QMessageBox()
+                    msg_box.setWindowTitle("Submitted File")
+                    msg_box.setText(f"Submitted: {file_name}")
+                    msg_box.setInformativeText("What do you want to do?")
+                    preview_btn = msg_box.addButton("Preview", QMessageBox.ButtonRole.ActionRole)
+                    open_btn = msg_box.addButton("Open File", QMessageBox.ButtonRole.AcceptRole)
+                    unsubmit_btn = msg_box.addButton("Unsubmit", QMessageBox.ButtonRole.DestructiveRole)
+                    msg_box.addButton("Cancel", QMessageBox.ButtonRole.RejectRole)
+                    msg_box.exec()
+
+                    clicked = msg_box.clickedButton()
+                    if clicked == unsubmit_btn:
+                        submissions.unsubmit(subject_name, assign_item)
+                    elif clicked == preview_btn:
+                        source = submissions.preview_source(subject_name, assign_item)
+                        try:
+                            if source is None or not os.path.exists(source[0]):
+                                raise FileNotFoundError("The submitted file is no longer there.")
+                            path, digest, name = source
+                            preview = SubmissionPreview(name, path, digest, self)
+                        except (OSError, ValueError) as e:
+                            QMessageBox.warning(self, "Preview Failed", f"Could not preview the submitted file:\n{e}")
+                            return
+                        preview.exec()
+                    elif clicked == open_btn:
+                        try:
+                            file_path = submissions.open_path(subject_name, assign_item)
+                        except OSError as e:
+                            QMessageBox.warning(self, "Open Failed", f"Could not open the submitted file:\n{e}")
+                            return
+                        QDesktopServices.openUrl(QUrl.fromLocalFile(file_path))
+
+            upload_btn.clicked.connect(upload_file)
+            view_btn.clicked.connect(view_or_unsubmit)
+            self._assignment_buttons[assign_item] = (upload_btn, view_btn)
+            self.show_submission_state(assign_item)
+
+            item_layout.addWidget(upload_btn)
+            item_layout.addWidget(view_btn)
+
+        section_layout.addWidget(section_frame)
+        return note_slot
+
+    # ---- assignment submissions ----
+
+    def show_submission_state(self, item):
+        upload_btn, view_btn = self._assignment_buttons[item]
+        percent = get_submission_store().uploading(self.subject_name, item)
+        if percent is not None:
+            upload_btn.setText(f"Uploading {percent}%")
+            upload_btn.setEnabled(False)
+            view_btn.setEnabled(False)
+        elif item in self.submissions:
+            upload_btn.setText("Uploaded \u2714")
+            upload_btn.setEnabled(False)
+            view_btn.setEnabled(True)
+        else:
+            upload_btn.setText("Upload File")
+            upload_btn.setEnabled(True)
+            view_btn.setEnabled(False)
+
+    def on_upload_progress(self, subject, item, percent):
+        if subject == self.subject_name and item in self._assignment_buttons:
+            self._assignment_buttons[item][0].setText(f"Uploading {percent}%")
+
+    def on_upload_failed(self, subject, item, message):
+        if subject == self.subject_name and item in self._assignment_buttons:
+            self.show_submission_state(item)
+            QMessageBox.warning(self, "Upload Failed", message)
+
+    def on_submission_changed(self, subject, item):
+        if subject != self.subject_name:
+            return
+        file_path = get_submission_store().submitted_path(subject, item)
+        if file_path is None:
+            self.submissions.pop(item, None)
+        else:
+            self.submissions[item] = file_path
+        if item in self._assignment_buttons:
+            self.show_submission_state(item)
+
+    # ---- notes editor window ----
+
+    def update_editor_window(self):
+        # Slots within half a screen of the viewport get an editor; the rest give theirs back.
+        # An editor with keyboard focus stays put so scrolling never interrupts typing.
+        current = self.tab_widget.currentIndex()
+        height = self.scroll.viewport().height()
+        top = self.scroll.verticalScrollBar().value() - height // 2
+        bottom = top + 2 * height
+        wanted = []
+        for index, slots in self._slots.items():
+            for slot in slots:
+                if index == current and self.isVisible():
+                    y = slot.mapTo(self.container, QPoint(0, 0)).y()
+                    if y + slot.height() > top and y < bottom:
+                        wanted.append(slot)
+                        continue
+                if slot.editor is not None and not slot.editor.hasFocus():
+                    self._release_editor(slot)
+        # Attach after releasing so the editors just given back are reused
+        for slot in wanted:
+            if slot.editor is None:
+                self._attach_editor(slot)
+
+    def _settle_editor_window(self):
+        # Items built a moment ago have no geometry until their layouts run
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.LayoutRequest.value)
+        self.update_editor_window()
+
+    def live_editors(self):
+        return sum(slot.editor is not None for slots in self._slots.values() for slot in slots)
+
+    def _attach_editor(self, slot):
+        if self._spare_editors:
+            editor = self._spare_editors.pop()
+        else:
+            editor = QTextEdit()
+            editor.setPlaceholderText("Private comment...")
+            editor.setFont(QFont("Segoe UI", 13))
+            editor.textChanged.connect(lambda editor=editor: self._editor_changed(editor))
+        editor.slot = slot
+        editor.blockSignals(True)  # loading the note is not an edit
+        editor.setText(slot.text)
+        editor.blockSignals(False)
+        slot.editor = editor
+        editor.setParent(slot)
+        editor.setGeometry(slot.rect())
+        editor.show()
+
+    def _release_editor(self, slot):
+        editor, slot.editor = slot.editor, None
+        editor.slot = None
+        editor.hide()
+        # The pool never outgrows the largest window, so spare editors are kept, not deleted
+        self._spare_editors.append(editor)
+
+    def _editor_changed(self, editor):
+        slot = editor.slot
+        if slot is not None:
+            slot.text = editor.toPlainText()
+            get_note_saver().note_changed(slot.note_key, slot.text)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._window_timer.start()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._window_timer.start()
+
+
+# ===============================
+# List models - the dashboard, calendar and progress lists are QListViews over
+# LazyListModel. Rows are pulled from a source in batches as the view scrolls
+# (canFetchMore/fetchMore) and source changes arrive as row inserts, removals or
+# dataChanged instead of rebuilding the whole list.
+class LazyListModel(QAbstractListModel):
+    FETCH_BATCH = 64
+
+    def __init__(self, count=None, fetch=None, parent=None):
+        # count() -> rows in the source; fetch(start, stop) -> rows as text or (text, color)
+        super().__init__(parent)
+        self._rows = []
+        self._items = None
+        if count is None:
+            self._items = []
+            count = lambda: len(self._items)
+            fetch = lambda start, stop: self._items[start:stop]
+        self._count = count
+        self._fetch = fetch
+
+    @classmethod
+    def from_rows(cls, rows, parent=None):
+        model = cls(parent=parent)
+        model._items.extend(rows)
+        return model
+
+    def set_source(self, count, fetch):
+        self.beginResetModel()
+        self._count = count
+        self._fetch = fetch
+        self._rows = []
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        row = self._rows[index.row()]
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.ToolTipRole):
+            # Uniform rows elide long text instead of scrolling sideways; the tooltip has all of it
+            return row[0] if isinstance(row, tuple) else row
+        if role == Qt.ItemDataRole.ForegroundRole and isinstance(row, tuple):
+            return QColor(row[1])
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self._rows) < self._count()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        start = len(self._rows)
+        stop = min(start + self.FETCH_BATCH, self._count())
+        if stop <= start:
+            return
+        self.beginInsertRows(QModelIndex(), start, stop - 1)
+        self._rows.extend(self._fetch(start, stop))
+        self.endInsertRows()
+
+    def loaded(self):
+        return len(self._rows)
+
+    # The source gained, lost or changed rows; only rows already fetched need work,
+    # anything past them is picked up by fetchMore
+
+    def source_rows_inserted(self, start, count):
+        if start > len(self._rows):
+            return
+        self.beginInsertRows(QModelIndex(), start, start + count - 1)
+        self._rows[start:start] = self._fetch(start, start + count)
+        self.endInsertRows()
+
+    def source_rows_removed(self, start, count):
+        stop = min(start + count, len(self._rows))
+        if start >= stop:
+            return
+        self.beginRemoveRows(QModelIndex(), start, stop - 1)
+        del self._rows[start:stop]
+        self.endRemoveRows()
+
+    def source_row_changed(self, row):
+        if row >= len(self._rows):
+            return
+        self._rows[row] = self._fetch(row, row + 1)[0]
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    # Rows owned by the model itself (models built without a source)
+
+    def append_row(self, row):
+        self._items.append(row)
+        self.source_rows_inserted(len(self._items) - 1, 1)
+
+    def remove_row(self, row):
+        del self._items[row]
+        self.source_rows_removed(row, 1)
+
+
+def make_list_view(model, kind):
+    view = QListView()
+    view.setProperty("kind", kind)
+    # Every row is one line of text, so the view can size rows without measuring each one
+    view.setUniformItemSizes(True)
+    view.setModel(model)
+    model.setParent(view)
+    return view
+
+
+# ===============================
+# Tasks - to-dos live in the tasks table and are held in memory sorted by due date,
+# so "what is due on a day" or "in the next N days" is two bisects over the keys
+class TaskStore(QObject):
+    # Qt face of the core TaskRepository; task lists and calendars follow task_added
+    task_added = pyqtSignal(int)  # position in due-date order
+
+    def __init__(self, storage=None, seed=DEFAULT_TASKS, parent=None):
+        super().__init__(parent)
+        self.tasks_by_date = TaskRepository(storage, seed)
+
+    def __len__(self):
+        return len(self.tasks_by_date)
+
+    def span(self, start, stop):
+        return self.tasks_by_date.span(start, stop)
+
+    def count(self, start, stop):
+        return self.tasks_by_date.count(start, stop)
+
+    def tasks(self, start, stop, first=0, last=None):
+        return self.tasks_by_date.tasks(start, stop, first, last)
+
+    def record(self, position):
+        return self.tasks_by_date.record(position)
+
+    def due_dates(self, start, stop):
+        return self.tasks_by_date.due_dates(start, stop)
+
+    def add(self, due, title):
+        position = self.tasks_by_date.add(due, title)
+        self.task_added.emit(position)
+        return position
+
+
+_TASK_STORE = None
+
+def get_task_store():
+    global _TASK_STORE
+    if _TASK_STORE is None:
+        _TASK_STORE = TaskStore(get_storage())
+    return _TASK_STORE
+
+
+class CalendarMarkers(QObject):
+    # Days with tasks, worked out once per month and shared by every calendar. A month's
+    # set covers the weeks of the neighbouring months its page shows too.
+    changed = pyqtSignal()
+
+    def __init__(self, store, max_months=24, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.max_months = max_months
+        self._months = OrderedDict()  # (year, month) -> set of dates, in LRU order
+        self._format = None
+        store.task_added.connect(self._on_task_added)
+
+    @staticmethod
+    def page_span(year, month):
+        # A month page is six weeks long and starts up to a week before the 1st
+        first = date(year, month, 1)
+        return first - timedelta(days=7), first + timedelta(days=45)
+
+    def month(self, year, month):
+        key = (year, month)
+        days = self._months.get(key)
+        if days is None:
+            days = self._months[key] = self.store.due_dates(*self.page_span(year, month))
+            if len(self._months) > self.max_months:
+                self._months.popitem(last=False)
+        else:
+            self._months.move_to_end(key)
+        return days
+
+    def text_format(self):
+        if self._format is None:
+            self._format = QTextCharFormat()
+            self._format.setFontWeight(QFont.Weight.Bold)
+            self._format.setForeground(QColor("#4338ca"))
+            self._format.setBackground(QColor("#e0e7ff"))
+        return self._format
+
+    def _on_task_added(self, position):
+        # Patch the cached months whose page shows the new task's day instead of dropping them
+        day = self.store.record(position).due
+        for (year, month), days in self._months.items():
+            start, stop = self.page_span(year, month)
+            if start <= day < stop:
+                days.add(day)
+        self.changed.emit()
+
+
+_CALENDAR_MARKERS = None
+
+def get_calendar_markers():
+    global _CALENDAR_MARKERS
+    if _CALENDAR_MARKERS is None:
+        _CALENDAR_MARKERS = CalendarMarkers(get_task_store())
+    return _CALENDAR_MARKERS
+
+
+class CalendarMarking(QObject):
+    # Keeps one calendar's date formats in step with the shared markers, touching only
+    # the dates that differ from what the calendar already shows
+    def __init__(self, calendar, markers):
+        super().__init__(calendar)
+        self.calendar = calendar
+        self.markers = markers
+        self._applied = set()
+        calendar.currentPageChanged.connect(lambda year, month: self.refresh())
+        markers.changed.connect(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        calendar = self.calendar
+        marked = self.markers.month(calendar.yearShown(), calendar.monthShown())
+        for day in self._applied - marked:
+            calendar.setDateTextFormat(QDate(day.year, day.month, day.day), QTextCharFormat())
+        for day in marked - self._applied:
+            calendar.setDateTextFormat(QDate(day.year, day.month, day.day), self.markers.text_format())
+        self._applied = set(marked)
+
+
+class TaskListModel(LazyListModel):
+    # Tasks due in [start, start + days); rows come from the store in fetch batches and
+    # tasks added to the range are inserted in place
+    def __init__(self, store, start, days=1, with_dates=False, parent=None):
+        super().__init__(parent=parent)
+        self.store = store
+        self.with_dates = with_dates
+        self.set_range(start, days)
+        store.task_added.connect(self._on_task_added)
+
+    def set_range(self, start, days=1):
+        self.start = start
+        self.stop = start + timedelta(days=days)
+        self.set_source(self._count_tasks, self._fetch_tasks)
+
+    def _count_tasks(self):
+        return self.store.count(self.start, self.stop)
+
+    def _fetch_tasks(self, first, last):
+        tasks = self.store.tasks(self.start, self.stop, first, last)
+        if self.with_dates:
+            return [f"{task.title} - {task.due_text()}" for task in tasks]
+        return [task.title for task in tasks]
+
+    def _on_task_added(self, position):
+        lo, hi = self.store.span(self.start, self.stop)
+        if lo <= position < hi:
+            self.source_rows_inserted(position - lo, 1)
+
+
+# ===============================
+# Page Registry - names mapped straight to page widgets in a QStackedWidget.
+# Pages can be registered as a ready widget or as a factory that runs on first use.
+class PageRegistry:
+    def __init__(self, stack, on_build=None):
+        self.stack = stack
+        self.on_build = on_build
+        self._widgets = {}
+        self._factories = {}
+
+    def register(self, name, widget=None, factory=None):
+        if widget is None and factory is None:
+            raise ValueError(f"Page {name!r} needs a widget or a factory")
+        self.unregister(name)
+        if widget is not None:
+            self._add(name, widget)
+        else:
+            self._factories[name] = factory
+
+    def unregister(self, name, delete=True):
+        self._factories.pop(name, None)
+        widget = self._widgets.pop(name, None)
+        if widget is not None:
+            self.stack.removeWidget(widget)
+            if delete:
+                widget.deleteLater()
+        return widget
+
+    def get(self, name):
+        widget = self._widgets.get(name)
+        if widget is None:
+            factory = self._factories.pop(name, None)
+            if factory is None:
+                return None
+            widget = factory()
+            if self.on_build is not None:
+                self.on_build(name, widget)
+            self._add(name, widget)
+        return widget
+
+    def show(self, name):
+        widget = self.get(name)
+        if widget is not None:
+            self.stack.setCurrentWidget(widget)
+        return widget
+
+    def is_built(self, name):
+        return name in self._widgets
+
+    def names(self):
+        return list(self._widgets) + list(self._factories)
+
+    def __contains__(self, name):
+        return name in self._widgets or name in self._factories
+
+    def __len__(self):
+        return len(self._widgets) + len(self._factories)
+
+    def _add(self, name, widget):
+        self._widgets[name] = widget
+        self.stack.addWidget(widget)
+
 
 # ===============================
 # Settings Page - Improved visuals, spacing, and UX details
@@ -403,7 +1961,7 @@ class SettingsPage(QWidget):
 
         title = QLabel("\u2699\ufe0f Settings")
         title.setFont(QFont("Segoe UI Semibold", 20))
-        title.setStyleSheet("color: #2563eb;")
+        title.setProperty("kind", "heading")
         layout.addWidget(title)
 
         # Change password section
@@ -422,7 +1980,7 @@ class SettingsPage(QWidget):
         self.toggle_old_btn = QPushButton("\ud83d\udc41")
         self.toggle_old_btn.setCheckable(True)
         self.toggle_old_btn.setFixedSize(36,36)
-        self.toggle_old_btn.setStyleSheet("font-size: 20px; background-color: transparent; border: none;")
+        self.toggle_old_btn.setProperty("kind", "icon")
         self.toggle_old_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.toggle_old_btn.clicked.connect(lambda: self.toggle_password_visibility(self.old_pw, self.toggle_old_btn))
 
@@ -440,7 +1998,7 @@ class SettingsPage(QWidget):
         self.toggle_new_btn = QPushButton("\ud83d\udc41")
         self.toggle_new_btn.setCheckable(True)
         self.toggle_new_btn.setFixedSize(36,36)
-        self.toggle_new_btn.setStyleSheet("font-size: 20px; background-color: transparent; border: none;")
+        self.toggle_new_btn.setProperty("kind", "icon")
         self.toggle_new_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.toggle_new_btn.clicked.connect(lambda: self.toggle_password_visibility(self.new_pw, self.toggle_new_btn))
 
@@ -449,7 +2007,8 @@ class SettingsPage(QWidget):
 
         change_pw_btn = QPushButton("Update Password")
         change_pw_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        change_pw_btn.setStyleSheet("background-color: #4ade80; color: white; padding: 14px; border-radius: 12px; font-size: 16px; font-weight: 700;")
+        change_pw_btn.setProperty("kind", "settings-action")
+        change_pw_btn.setObjectName("updatePasswordButton")
         change_pw_btn.clicked.connect(self.update_password)
         layout.addWidget(change_pw_btn)
 
@@ -465,7 +2024,7 @@ class SettingsPage(QWidget):
 
         save_btn = QPushButton("Save Settings")
         save_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        save_btn.setStyleSheet("background-color: #60a5fa; color: white; padding: 14px; border-radius: 12px; font-size: 16px; font-weight: 700;")
+        save_btn.setProperty("kind", "settings-action")
         save_btn.clicked.connect(self.save_settings)
         layout.addWidget(save_btn)
 
@@ -495,6 +2054,374 @@ class SettingsPage(QWidget):
         QMessageBox.information(self, "Settings", f"Settings saved.\nEmail Notifications: {'Enabled' if status else 'Disabled'}")
 
 
+# ===============================
+# Score Trend Chart - styled once with persistent artists. Data changes re-draw only
+# the line, fill, title and subject labels over a cached background (blitting); a
+# full figure draw happens only on first use, resize or a change in item count.
+class ScoreTrendChart:
+    # Past this many items only every n-th one gets a tick and a name, or a term's
+    # worth of activities spends seconds drawing overlapping text
+    MAX_LABELS = 12
+
+    def __init__(self, canvas, title_size=14, ylabel_size=11):
+        from matplotlib.transforms import blended_transform_factory, ScaledTranslation
+        self.canvas = canvas
+        fig = canvas.figure
+        self.ax = ax = fig.add_subplot(111)
+
+        ax.tick_params(axis='x', labelsize=8, rotation=15, colors='#4b5563', labelbottom=False)
+        ax.tick_params(axis='y', labelsize=9, colors='#4b5563')
+        ax.set_ylim(0, 100)
+        ax.set_ylabel("Score", fontsize=ylabel_size, color="#1e40af")
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.spines['left'].set_color('#60a5fa')
+        ax.spines['bottom'].set_color('#60a5fa')
+        ax.grid(True, linestyle='--', alpha=0.25)
+
+        self.title = ax.set_title("", fontsize=title_size, color="#1e40af", weight='bold', animated=True)
+        self.line, = ax.plot([], [], marker='o', linestyle='-', color="#2563eb", linewidth=2, animated=True)
+        # Ungraded items (NaN scores) get a hollow marker on the axis; the line joins the graded ones
+        self.ungraded, = ax.plot([], [], linestyle='none', marker='o', markerfacecolor='white',
+                                 markeredgecolor='#9ca3af', clip_on=False, animated=True)
+        self.fill = None
+        # Subject names sit where the x tick labels would (tick length + pad = 7pt below the axis)
+        self._label_transform = blended_transform_factory(ax.transData, ax.transAxes) + \
+            ScaledTranslation(0, -7 / 72, fig.dpi_scale_trans)
+        self.labels = []
+        self.item_count = None
+        self.background = None
+        canvas.mpl_connect("draw_event", self._on_draw)
+
+    def set_scores(self, titles, scores, heading):
+        np = load_numpy()
+        x = np.arange(len(scores))
+        graded = ~np.isnan(scores)
+        self.line.set_data(x[graded], scores[graded])
+        self.ungraded.set_data(x[~graded], np.zeros(np.count_nonzero(~graded)))
+        if self.fill is not None:
+            self.fill.remove()
+        self.fill = self.ax.fill_between(x[graded], scores[graded], color="#93c5fd", alpha=0.3, animated=True)
+        self.title.set_text(heading)
+        step = -(-len(x) // self.MAX_LABELS) or 1
+        self._set_labels(x[::step], titles[::step])
+
+        if len(x) != self.item_count:
+            # Tick positions and grid belong to the background, so it must be redrawn
+            self.item_count = len(x)
+            self.ax.set_xticks(x[::step])
+            # Same 5% side margins the categorical axis used to get from autoscaling
+            margin = max(len(x) - 1, 1) * 0.05
+            self.ax.set_xlim(-margin, max(len(x) - 1, 0) + margin)
+            self.background = None
+        if self.background is None:
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.background)
+            self._draw_animated()
+            self.canvas.blit(self.canvas.figure.bbox)
+
+    def invalidate(self):
+        # The figure size or DPI changed, so the next update needs a full draw
+        self.background = None
+
+    def _set_labels(self, x, titles):
+        while len(self.labels) < len(titles):
+            self.labels.append(self.ax.text(
+                0, 0, "", transform=self._label_transform, ha='center', va='top',
+                rotation=15, fontsize=8, color='#4b5563', animated=True, clip_on=False
+            ))
+        for i, label in enumerate(self.labels):
+            if i < len(titles):
+                label.set_text(titles[i])
+                label.set_x(x[i])
+                label.set_visible(True)
+            else:
+                label.set_visible(False)
+
+    def _draw_animated(self):
+        fig = self.canvas.figure
+        for artist in [self.fill, self.line, self.ungraded, self.title] + self.labels:
+            if artist is not None and artist.get_visible():
+                fig.draw_artist(artist)
+
+    def _on_draw(self, event):
+        # A full draw skips animated artists: keep that as the background, then add them
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+
+# ===============================
+# Chart pool - building a figure, canvas and styled axes costs more than drawing
+# them, so views borrow finished ScoreTrendCharts and a closing dashboard hands them
+# back for the next one
+class ChartPool:
+    def __init__(self, max_idle_per_style=2):
+        self.max_idle_per_style = max_idle_per_style
+        self.created = 0
+        self.reused = 0
+        self.in_use = 0
+        self._idle = {}  # (title_size, ylabel_size) -> [ScoreTrendChart]
+        self._figures = weakref.WeakSet()  # every figure made here that is still alive
+
+    def acquire(self, title_size=14, ylabel_size=11, figsize=(6, 2.5), dpi=120):
+        idle = self._idle.get((title_size, ylabel_size))
+        if idle:
+            chart = idle.pop()
+            self.reused += 1
+        else:
+            FigureCanvas, Figure = load_plotting()
+            canvas = FigureCanvas(Figure(figsize=figsize, dpi=dpi))
+            chart = ScoreTrendChart(canvas, title_size, ylabel_size)
+            chart.style = (title_size, ylabel_size)
+            self._figures.add(canvas.figure)
+            self.created += 1
+        self.in_use += 1
+        return chart
+
+    def release(self, chart):
+        self.in_use -= 1
+        chart.invalidate()
+        idle = self._idle.setdefault(chart.style, [])
+        if len(idle) < self.max_idle_per_style:
+            idle.append(chart)
+
+    def stats(self):
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "in_use": self.in_use,
+            "idle": sum(len(idle) for idle in self._idle.values()),
+            "live_figures": len(self._figures),
+            "rss_bytes": current_rss_bytes(),
+        }
+
+
+_CHART_POOL = None
+
+def get_chart_pool():
+    global _CHART_POOL
+    if _CHART_POOL is None:
+        _CHART_POOL = ChartPool()
+    return _CHART_POOL
+
+
+# ===============================
+# Rendered chart cache - finished chart images keyed by (chart, period, data version,
+# size, pixel ratio). Pixmaps stay in an in-memory LRU and are mirrored to PNG files,
+# so an unchanged chart is shown without importing or running matplotlib.
+CHART_CACHE_DIR = "chart_cache"
+
+class _ChartSaveTask(QRunnable):
+    def __init__(self, image, path, directory, max_files):
+        super().__init__()
+        self.image = image
+        self.path = path
+        self.directory = directory
+        self.max_files = max_files
+
+    def run(self):
+        try:
+            temp_path = self.path + ".tmp"
+            if self.image.save(temp_path, "PNG"):
+                os.replace(temp_path, self.path)
+            files = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".png")]
+            if len(files) > self.max_files:
+                files.sort(key=lambda entry: entry.stat().st_mtime)
+                for entry in files[:len(files) - self.max_files]:
+                    os.remove(entry.path)
+        except OSError as e:
+            print(f"Could not save chart image: {e}", file=sys.stderr)
+
+
+class ChartImageCache:
+    def __init__(self, directory=CHART_CACHE_DIR, max_memory_entries=24, max_disk_entries=200):
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()  # key -> QPixmap
+        self._slots = {}  # key without its data version -> newest key, so stale images are dropped
+        self._pool = None
+        if directory:
+            try:
+                os.makedirs(directory, exist_ok=True)
+                # One writer thread keeps PNG encoding off the GUI thread and in order
+                self._pool = QThreadPool()
+                self._pool.setMaxThreadCount(1)
+            except OSError:
+                self.directory = None
+
+    @staticmethod
+    def make_key(chart, period, version, width, height, ratio):
+        return (chart, period, version, width, height, round(ratio, 2))
+
+    def get(self, key):
+        pixmap = self._memory.get(key)
+        if pixmap is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return pixmap
+        if self.directory:
+            path = self._path(key)
+            if os.path.exists(path):
+                image = QImage(path)
+                if not image.isNull():
+                    pixmap = self._remember(key, image)
+                    self.disk_hits += 1
+                    return pixmap
+        self.misses += 1
+        return None
+
+    def put(self, key, image):
+        pixmap = self._remember(key, image)
+        if self._pool is not None:
+            self._pool.start(_ChartSaveTask(image, self._path(key), self.directory, self.max_disk_entries))
+        return pixmap
+
+    def flush(self):
+        if self._pool is not None:
+            self._pool.waitForDone()
+
+    def clear(self):
+        self.flush()
+        self._memory.clear()
+        self._slots.clear()
+        if self.directory:
+            for entry in os.scandir(self.directory):
+                if entry.name.endswith(".png"):
+                    os.remove(entry.path)
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
+
+    def _path(self, key):
+        digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.directory, digest + ".png")
+
+    def _remember(self, key, image):
+        pixmap = QPixmap.fromImage(image)
+        pixmap.setDevicePixelRatio(key[-1])
+        slot = key[:2] + key[3:]
+        previous = self._slots.get(slot)
+        if previous is not None and previous != key:
+            self._memory.pop(previous, None)
+        self._slots[slot] = key
+        self._memory[key] = pixmap
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            evicted, _ = self._memory.popitem(last=False)
+            self._slots.pop(evicted[:2] + evicted[3:], None)
+        return pixmap
+
+
+_CHART_CACHE = None
+
+def get_chart_cache():
+    global _CHART_CACHE
+    if _CHART_CACHE is None:
+        _CHART_CACHE = ChartImageCache()
+    return _CHART_CACHE
+
+
+class ScoreChartView(QWidget):
+    # Shows one period's score chart as a cached image. matplotlib renders (offscreen,
+    # through ScoreTrendChart) only when the cache has no image for the current
+    # data and size.
+    RESIZE_RENDER_DELAY_MS = 60
+
+    def __init__(self, repository, chart_name, figsize=(6, 2.5), dpi=120, title_size=14,
+                 ylabel_size=11, cache=None, parent=None):
+        super().__init__(parent)
+        self.repository = repository
+        self.chart_name = chart_name
+        self.figsize = figsize
+        self.dpi = dpi
+        self.title_size = title_size
+        self.ylabel_size = ylabel_size
+        self.cache = cache if cache is not None else get_chart_cache()
+        self.period = None
+        self.pixmap = None
+        self.chart = None  # borrowed from the chart pool on the first cache miss
+        self.renders = 0
+        self._render_size = None
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.timeout.connect(self.refresh)
+
+    def sizeHint(self):
+        return QSize(int(self.figsize[0] * self.dpi), int(self.figsize[1] * self.dpi))
+
+    def show_period(self, period):
+        self.period = period
+        self.refresh()
+
+    def refresh(self):
+        # Hidden views are refreshed by showEvent, at their real size
+        if self.period is None or not self.isVisible() or self.width() < 2 or self.height() < 2:
+            return
+        self._render_timer.stop()
+        ratio = self.devicePixelRatioF()
+        key = ChartImageCache.make_key(self.chart_name, self.period, self.repository.fingerprint(self.period),
+                                       self.width(), self.height(), ratio)
+        pixmap = self.cache.get(key)
+        if pixmap is None:
+            pixmap = self.cache.put(key, self.render_image(ratio))
+        self.pixmap = pixmap
+        self.update()
+
+    def render_image(self, ratio):
+        if self.chart is None:
+            self.chart = get_chart_pool().acquire(self.title_size, self.ylabel_size, self.figsize, self.dpi)
+            self._render_size = None
+        size = (self.width(), self.height(), ratio)
+        if size != self._render_size:
+            fig = self.chart.canvas.figure
+            fig.set_dpi(self.dpi * ratio)
+            fig.set_size_inches(self.width() / self.dpi, self.height() / self.dpi)
+            self.chart.invalidate()
+            self._render_size = size
+        period = self.period
+        self.chart.set_scores(self.repository.titles(period), self.repository.percent_scores(period),
+                              f"{period} Scores")
+        self.renders += 1
+        buffer = self.chart.canvas.buffer_rgba()
+        height, width = buffer.shape[:2]
+        return QImage(buffer.tobytes(), width, height, width * 4, QImage.Format.Format_RGBA8888).copy()
+
+    def release_chart(self):
+        # Cached images keep being shown; only the matplotlib side goes back to the pool
+        self._render_timer.stop()
+        if self.chart is not None:
+            get_chart_pool().release(self.chart)
+            self.chart = None
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._render_timer.start(0)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        # The old image is stretched until resizing pauses
+        self._render_timer.start(self.RESIZE_RENDER_DELAY_MS if self.pixmap is not None else 0)
+
+    def paintEvent(self, event):
+        if self.pixmap is None:
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(self.rect(), self.pixmap)
+        painter.end()
+
+
 # ===============================
 # Student Dashboard - Enhanced UI, consistency, and interaction improvements
 class StudentDashboard(QWidget):
@@ -509,7 +2436,7 @@ class StudentDashboard(QWidget):
 
         # Sidebar
         sidebar_widget = QWidget()
-        sidebar_widget.setStyleSheet("background-color: #f3f4f6; border-right: 1.5px solid #e5e7eb;")
+        sidebar_widget.setObjectName("sidebar")
         self.sidebar = QVBoxLayout(sidebar_widget)
         self.sidebar.setContentsMargins(25, 25, 25, 25)
         self.sidebar.setSpacing(24)
@@ -530,26 +2457,7 @@ class StudentDashboard(QWidget):
             btn.setFixedHeight(52)
             btn.setCheckable(True)
             btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-            btn.setStyleSheet("""
-                QPushButton {
-                    background-color: transparent;
-                    border: none;
-                    padding-left: 14px;
-                    color: #4b5563;
-                    text-align: left;
-                    font-weight: 600;
-                    border-radius: 12px;
-                    transition: background-color 0.3s ease, color 0.3s ease;
-                }
-                QPushButton:hover {
-                    background-color: #e0e7ff;
-                    color: #4338ca;
-                }
-                QPushButton:checked {
-                    background-color: #4338ca;
-                    color: white;
-                }
-            """)
+            btn.setProperty("kind", "nav")
             btn.clicked.connect(lambda checked, n=name: self.display_page(n))
             self.sidebar.addWidget(btn)
             self.buttons[name] = btn
@@ -558,35 +2466,25 @@ class StudentDashboard(QWidget):
         back_btn = QPushButton("Back")
         back_btn.setFont(QFont("Segoe UI", 14))
         back_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f87171;
-                color: white;
-                padding: 12px;
-                border-radius: 12px;
-                font-weight: 600;
-            }
-            QPushButton:hover {
-                background-color: #dc2626;
-            }
-        """)
+        back_btn.setObjectName("sidebarBack")
         back_btn.clicked.connect(go_back_callback)
         self.sidebar.addWidget(back_btn)
 
-        # Content Area
+        # Content Area - pages are built on first visit and then kept by the registry
         self.content_area = QStackedWidget()
-        self.pages = {
-            "Dashboard": self.create_dashboard_overview(),
-            "Class": self.create_class_page(),
-            "Calendar": self.create_calendar_page(),
-            "Progress": self.create_progress_page(),
-            "Setting": SettingsPage()
-        }
-        for name, widget in self.pages.items():
-            if isinstance(widget, QLabel):
-                widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                widget.setFont(QFont("Segoe UI", 16))
-            self.content_area.addWidget(widget)
+        self.pages = PageRegistry(self.content_area, on_build=self.prepare_page)
+        self.pages.register("Dashboard", factory=self.create_dashboard_overview)
+        self.pages.register("Class", factory=self.create_class_page)
+        self.pages.register("Calendar", factory=self.create_calendar_page)
+        self.pages.register("Progress", factory=self.create_progress_page)
+        self.pages.register("Setting", factory=SettingsPage)
+        self.subject_pages = OrderedDict()  # subject -> registered page name, in LRU order
+
+        self.progress = get_progress_repository()
+        self.progress.grade_changed.connect(self.on_grade_changed)
+        self.progress.grade_added.connect(self.on_grade_added)
+        self.tasks = get_task_store()
+        self.planner = None
 
         sidebar_widget.setFixedWidth(220)
         main_layout.addWidget(sidebar_widget)
@@ -595,6 +2493,37 @@ class StudentDashboard(QWidget):
         self.setLayout(main_layout)
         self.display_page("Dashboard")
 
+        # After the first paint, build the chart and the remaining pages one per
+        # event loop turn so the window stays responsive while they warm up
+        self._warm_queue = [self.load_score_snapshot, "Progress", "Calendar", "Class", "Setting"]
+        self._warm_timer = QTimer(self)
+        self._warm_timer.setSingleShot(True)
+        self._warm_timer.timeout.connect(self.warm_next_page)
+        self._warm_timer.start(self.WARM_UP_DELAY_MS)
+
+    WARM_UP_DELAY_MS = 150
+    SUBJECT_PAGE_CACHE_SIZE = 3
+    UPCOMING_DAYS = 14
+
+    def warm_next_page(self):
+        if not self._warm_queue:
+            return
+        step = self._warm_queue.pop(0)
+        if callable(step):
+            step()
+        else:
+            self.pages.get(step)
+        if self._warm_queue:
+            self._warm_timer.start(0)
+
+    def is_warm(self):
+        return not self._warm_queue
+
+    def prepare_page(self, name, widget):
+        if isinstance(widget, QLabel):
+            widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            widget.setFont(QFont("Segoe UI", 16))
+
     def create_dashboard_overview(self):
         widget = QWidget()
         main_layout = QHBoxLayout(widget)
@@ -607,54 +2536,33 @@ class StudentDashboard(QWidget):
 
         calendar_label = QLabel("\U0001F4C5 Calendar Preview")
         calendar_label.setFont(QFont("Segoe UI Semibold", 16))
-        calendar_label.setStyleSheet("color: #1e40af;")
+        calendar_label.setProperty("kind", "overview-heading")
         left_layout.addWidget(calendar_label)
 
         calendar = QCalendarWidget()
         calendar.setGridVisible(True)
         calendar.setFixedHeight(240)
         calendar.setFont(QFont("Segoe UI", 13))
-        calendar.setStyleSheet("""
-            QCalendarWidget QWidget { font-size: 14px; }
-            QCalendarWidget QToolButton { height:30px; font-weight: 600; color: #2563eb; }
-            QCalendarWidget QAbstractItemView:enabled { font-weight: 600; }
-            QCalendarWidget QAbstractItemView:enabled:selected { background-color: #3b82f6; color: white; border-radius: 6px; }
-        """)
+        calendar.setProperty("kind", "preview")
+        CalendarMarking(calendar, get_calendar_markers())
         left_layout.addWidget(calendar)
 
         graph_label = QLabel("\n\U0001F4C8 Weekly Score Snapshot")
         graph_label.setFont(QFont("Segoe UI Semibold", 16))
-        graph_label.setStyleSheet("color: #1e40af;")
+        graph_label.setProperty("kind", "overview-heading")
         left_layout.addWidget(graph_label)
 
-        fig = Figure(figsize=(6, 3), dpi=120)
-        graph_canvas = FigureCanvas(fig)
-        graph_canvas.setSizePolicy(
+        # The chart itself is drawn by load_score_snapshot once the window is up
+        self.snapshot_placeholder = QLabel("Loading chart...")
+        self.snapshot_placeholder.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.snapshot_placeholder.setObjectName("chartPlaceholder")
+        self.snapshot_placeholder.setMinimumHeight(220)
+        self.snapshot_placeholder.setSizePolicy(
             QSizePolicy.Policy.Expanding,
             QSizePolicy.Policy.Expanding
         )
-        graph_canvas.setMinimumHeight(220)
-        left_layout.addWidget(graph_canvas)
-
-        ax = fig.add_subplot(111)
-
-        key = "This Week"
-        subjects = [item[0] for item in progress_data[key]]
-        scores = [int(item[1].split(": ")[1].split("/")[0]) if "Graded" in item[1] else 0 for item in progress_data[key]]
-
-        ax.plot(subjects, scores, marker='o', color="#2563eb", linewidth=2)
-        ax.fill_between(subjects, scores, color="#93c5fd", alpha=0.3)
-        ax.set_ylim(0, 100)
-        ax.set_ylabel("Score", fontsize=10, color="#1e40af")
-        ax.set_title(f"{key} Scores", fontsize=12, color="#1e40af", weight='bold')
-        ax.tick_params(axis='x', labelsize=8, rotation=15, colors="#4b5563")
-        ax.tick_params(axis='y', labelsize=9, colors="#4b5563")
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color('#60a5fa')
-        ax.spines['bottom'].set_color('#60a5fa')
-
-        ax.grid(True, linestyle='--', alpha=0.25)
+        left_layout.addWidget(self.snapshot_placeholder)
+        self.snapshot_layout = left_layout
 
         # Right side: Tasklists and Notifications
         right_layout = QVBoxLayout()
@@ -662,36 +2570,32 @@ class StudentDashboard(QWidget):
 
         task_label = QLabel("\ud83d\udccc Today's Tasks")
         task_label.setFont(QFont("Segoe UI Semibold", 16))
-        task_label.setStyleSheet("color: #2563eb;")
+        task_label.setProperty("kind", "heading")
         right_layout.addWidget(task_label)
 
-        task_list = QListWidget()
-        task_list.setStyleSheet("""
-            QListWidget { font-size: 15px; border-radius: 10px; padding: 8px; }
-            QListWidget::item { padding: 8px 12px; }
-            QListWidget::item:selected { background-color: #bfdbfe; color: #1e40af; }
-        """)
-        task_list.addItems(["Math Quiz - 10:00 AM", "Science Lab - 2:00 PM"])
+        today = date.today()
+        task_list = make_list_view(TaskListModel(self.tasks, today), "compact-list")
         right_layout.addWidget(task_list)
 
         upcoming_label = QLabel("\u23f3 Upcoming Activities")
         upcoming_label.setFont(QFont("Segoe UI Semibold", 16))
-        upcoming_label.setStyleSheet("color: #2563eb; margin-top: 12px;")
+        upcoming_label.setProperty("kind", "heading")
+        upcoming_label.setProperty("gap", "md")
         right_layout.addWidget(upcoming_label)
 
-        upcoming_list = QListWidget()
-        upcoming_list.setStyleSheet(task_list.styleSheet())
-        upcoming_list.addItems(["Essay Due - June 20", "History Exam - June 22"])
+        upcoming_list = make_list_view(TaskListModel(self.tasks, today + timedelta(days=1), self.UPCOMING_DAYS,
+                                                     with_dates=True), "compact-list")
         right_layout.addWidget(upcoming_list)
 
         notif_label = QLabel("\ud83d\udce2 Teacher Posts & Announcements")
         notif_label.setFont(QFont("Segoe UI Semibold", 16))
-        notif_label.setStyleSheet("color: #2563eb; margin-top: 12px;")
+        notif_label.setProperty("kind", "heading")
+        notif_label.setProperty("gap", "md")
         right_layout.addWidget(notif_label)
 
-        notif_list = QListWidget()
-        notif_list.setStyleSheet(task_list.styleSheet())
-        notif_list.addItems(["New Announcement: Review for Final Exam", "Reminder: Submit Science Project"])
+        notif_list = make_list_view(LazyListModel.from_rows([
+            "New Announcement: Review for Final Exam", "Reminder: Submit Science Project"
+        ]), "compact-list")
         right_layout.addWidget(notif_list)
 
         main_layout.addLayout(left_layout, 3)
@@ -699,6 +2603,44 @@ class StudentDashboard(QWidget):
 
         return widget
 
+    SNAPSHOT_PERIOD = "This Week"
+
+    def load_score_snapshot(self):
+        if self.snapshot_placeholder is None:
+            return
+        view = ScoreChartView(self.progress, "snapshot", figsize=(6, 3), title_size=12, ylabel_size=10)
+        view.setSizePolicy(
+            QSizePolicy.Policy.Expanding,
+            QSizePolicy.Policy.Expanding
+        )
+        view.setMinimumHeight(220)
+        view.period = self.SNAPSHOT_PERIOD
+
+        self.snapshot_view = view
+        self.snapshot_layout.replaceWidget(self.snapshot_placeholder, view)
+        self.snapshot_placeholder.deleteLater()
+        self.snapshot_placeholder = None
+
+    def update_score_snapshot(self):
+        self.snapshot_view.refresh()
+
+    def on_grade_changed(self, period, index):
+        if period == self.SNAPSHOT_PERIOD and getattr(self, "snapshot_view", None) is not None:
+            self.update_score_snapshot()
+        if self.pages.is_built("Progress") and period == self.dropdown.currentText():
+            self.activity_model.source_row_changed(index)
+            self.update_graph(period)
+
+    def on_grade_added(self, period, index):
+        if period == self.SNAPSHOT_PERIOD and getattr(self, "snapshot_view", None) is not None:
+            self.update_score_snapshot()
+        if self.pages.is_built("Progress"):
+            if self.dropdown.findText(period) < 0:
+                self.dropdown.addItem(period)
+            if period == self.dropdown.currentText():
+                self.activity_model.source_rows_inserted(index, 1)
+                self.update_graph(period)
+
     def create_class_page(self):
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
@@ -708,34 +2650,12 @@ class StudentDashboard(QWidget):
         layout.setSpacing(24)
         layout.setContentsMargins(28, 28, 28, 28)
 
-        subjects = [
-            ("Mathematics", "\ud83d\udcd0", "#fce7f3"),
-            ("Science", "\ud83d\udd2c", "#dbeafe"),
-            ("English", "\ud83d\udcda", "#fee2e2"),
-            ("History", "\ud83c\udff0", "#e0f2fe"),
-            ("Geography", "\ud83d\uddfa\ufe0f", "#dcfce7"),
-            ("Computer Science", "\ud83d\udcbb", "#ede9fe"),
-            ("Art", "\ud83c\udfa8", "#fef9c3")
-        ]
-
-        for subject, icon, color in subjects:
+        for subject, icon, _ in SUBJECTS:
             box = QPushButton(f"{icon}  {subject}")
             box.setFixedHeight(90)
             box.setFont(QFont("Segoe UI Semibold", 17))
-            box.setStyleSheet(f"""
-                QPushButton {{
-                    background-color: {color};
-                    border: 1.3px solid #ccc;
-                    border-radius: 16px;
-                    padding: 18px;
-                    color: #111827;
-                    transition: background-color 0.3s ease;
-                    font-weight: 700;
-                }}
-                QPushButton:hover {{
-                    background-color: #e5e7eb;
-                }}
-            """)
+            box.setProperty("kind", "subject-card")
+            box.setProperty("subject", subject)
             box.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
             box.clicked.connect(lambda _, s=subject: self.show_subject_detail(s))
             layout.addWidget(box)
@@ -745,16 +2665,37 @@ class StudentDashboard(QWidget):
         return scroll_area
 
     def show_subject_detail(self, subject_name):
-        detail_page = self.create_subject_detail_page(subject_name)
-        self.pages["SubjectDetail"] = detail_page
-        self.content_area.addWidget(detail_page)
-        self.content_area.setCurrentWidget(detail_page)
-        for btn in self.buttons.values():
-            btn.setChecked(False)
+        # Recently visited subjects keep their page; the least recently used one is
+        # dropped once more than SUBJECT_PAGE_CACHE_SIZE are open
+        page_name = f"SubjectDetail:{subject_name}"
+        if subject_name in self.subject_pages:
+            self.subject_pages.move_to_end(subject_name)
+        else:
+            self.pages.register(page_name, widget=self.create_subject_detail_page(subject_name))
+            self.subject_pages[subject_name] = page_name
+            while len(self.subject_pages) > self.SUBJECT_PAGE_CACHE_SIZE:
+                _, evicted_name = self.subject_pages.popitem(last=False)
+                self.pages.unregister(evicted_name)
+        self.display_page(page_name)
 
     def create_subject_detail_page(self, subject_name):
         return SubjectDetailPage(subject_name, self.back_to_class)
 
+    def closeEvent(self, event):
+        self._warm_timer.stop()
+        self._warm_queue = []
+        for view in (getattr(self, "snapshot_view", None), getattr(self, "trend_view", None)):
+            if view is not None:
+                view.release_chart()
+        super().closeEvent(event)
+
+    def subject_page_stats(self):
+        return {
+            "cached_subject_pages": list(self.subject_pages),
+            "widget_count": len(QApplication.allWidgets()),
+            "rss_bytes": current_rss_bytes(),
+        }
+
     def back_to_class(self):
         self.display_page("Class")
 
@@ -765,7 +2706,7 @@ class StudentDashboard(QWidget):
 
         title = QLabel("\U0001F4C5 Calendar & Task Schedule")
         title.setFont(QFont("Segoe UI Semibold", 20))
-        title.setStyleSheet("color: #2563eb;")
+        title.setProperty("kind", "heading")
         main_layout.addWidget(title)
 
         split_layout = QHBoxLayout()
@@ -775,52 +2716,33 @@ class StudentDashboard(QWidget):
         calendar.setGridVisible(True)
         calendar.setFont(QFont("Segoe UI", 14))
         calendar.setFixedWidth(370)
-        calendar.setStyleSheet("""
-            QCalendarWidget QWidget { font-size: 14px; }
-            QCalendarWidget QToolButton { height:34px; font-weight: 600; color: #2563eb; }
-            QCalendarWidget QAbstractItemView:enabled:selected { background-color: #3b82f6; color: white; border-radius: 8px; }
-        """)
+        calendar.setProperty("kind", "planner")
         split_layout.addWidget(calendar)
+        self.planner = calendar
 
         today_box = QVBoxLayout()
         today_label = QLabel("To-do")
         today_label.setFont(QFont("Segoe UI Semibold", 18))
-        today_label.setStyleSheet("color: #2563eb;")
+        today_label.setProperty("kind", "heading")
         today_box.addWidget(today_label)
 
-        self.today_list = QListWidget()
-        self.today_list.setStyleSheet("""
-            QListWidget { font-size: 15px; border-radius: 10px; padding: 10px; }
-            QListWidget::item { padding: 10px 14px; }
-            QListWidget::item:selected { background-color: #bfdbfe; color: #1e40af; }
-        """)
+        # To-dos for the selected day; dates with tasks are marked on the calendar
+        self.today_model = TaskListModel(self.tasks, calendar.selectedDate().toPyDate())
+        self.today_list = make_list_view(self.today_model, "todo-list")
+        calendar.selectionChanged.connect(lambda: self.today_model.set_range(calendar.selectedDate().toPyDate()))
+        CalendarMarking(calendar, get_calendar_markers())
         today_box.addWidget(self.today_list)
 
         add_task_btn = QPushButton("\u2795 New To-do")
         add_task_btn.setFont(QFont("Segoe UI Semibold", 13))
         add_task_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        add_task_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #4ade80;
-                color: white;
-                padding: 10px;
-                border-radius: 8px;
-                font-weight: 700;
-                max-width: 120px;
-                margin-top: 12px;
-            }
-            QPushButton:hover {
-                background-color: #22c55e;
-            }
-            QPushButton:pressed {
-                background-color: #16a34a;
-            }
-        """)
+        add_task_btn.setObjectName("addTaskButton")
 
         def add_task():
-            text, ok = QInputDialog.getText(widget, "Add Task", "Enter task for today:")
+            day = calendar.selectedDate().toPyDate()
+            text, ok = QInputDialog.getText(widget, "Add Task", f"Enter task for {day:%B} {day.day}:")
             if ok and text.strip():
-                self.today_list.addItem(text.strip())
+                self.tasks.add(day, text.strip())
 
         add_task_btn.clicked.connect(add_task)
         today_box.addWidget(add_task_btn)
@@ -831,17 +2753,15 @@ class StudentDashboard(QWidget):
 
         upcoming_label = QLabel("Incoming Activities")
         upcoming_label.setFont(QFont("Segoe UI Semibold", 18))
-        upcoming_label.setStyleSheet("color: #2563eb; margin-top: 18px;")
+        upcoming_label.setProperty("kind", "heading")
+        upcoming_label.setProperty("gap", "lg")
         main_layout.addWidget(upcoming_label)
 
-        self.upcoming_list = QListWidget()
-        self.upcoming_list.setStyleSheet(self.today_list.styleSheet())
+        self.upcoming_model = TaskListModel(self.tasks, date.today() + timedelta(days=1), self.UPCOMING_DAYS,
+                                            with_dates=True)
+        self.upcoming_list = make_list_view(self.upcoming_model, "todo-list")
         main_layout.addWidget(self.upcoming_list)
 
-        # Mock data for calendar page task lists
-        self.today_list.addItems(["Math Quiz - 10:00 AM", "Science Lab - 2:00 PM"])
-        self.upcoming_list.addItems(["Essay Due - June 20", "History Exam - June 22"])
-
         return widget
 
     def create_progress_page(self):
@@ -852,96 +2772,44 @@ class StudentDashboard(QWidget):
 
         title = QLabel("\U0001F4CA Progress Tracker")
         title.setFont(QFont("Segoe UI Semibold", 20))
-        title.setStyleSheet("color: #2563eb;")
+        title.setProperty("kind", "heading")
         layout.addWidget(title)
 
-        # Progress data extended here for reference
-        progress = {
-            "This Week": [
-                ("Math Homework", "Graded: 90/100", "green"),
-                ("Science Quiz", "Ungraded", "gray"),
-                ("English Essay", "Graded: 88/100", "green"),
-                ("History Quiz", "Graded: 82/100", "green"),
-                ("Biology Lab", "Ungraded", "gray"),
-                ("PE Fitness Test", "Graded: 92/100", "green"),
-                ("Computer Assignment", "Graded: 85/100", "green")
-            ],
-            "Last Week": [
-                ("Math Project", "Graded: 87/100", "green"),
-                ("Science Lab", "Ungraded", "gray"),
-                ("English Reading", "Graded: 80/100", "green"),
-                ("History Report", "Graded: 78/100", "green"),
-                ("Art Sketch", "Ungraded", "gray"),
-                ("Geography Quiz", "Graded: 84/100", "green"),
-                ("Music Composition", "Graded: 90/100", "green")
-            ],
-            "Last Month": [
-                ("Math Exam", "Graded: 75/100", "green"),
-                ("Science Fair", "Graded: 93/100", "green"),
-                ("English Portfolio", "Ungraded", "gray"),
-                ("History Debate", "Graded: 85/100", "green"),
-                ("Computer Lab", "Graded: 80/100", "green"),
-                ("Art Exhibit", "Ungraded", "gray"),
-                ("Geography Map", "Graded: 86/100", "green")
-            ]
-        }
-
-        FigureCanvas(Figure()).figure.subplots().tick_params(axis='x', labelsize=5)
+        progress = self.progress
 
         self.dropdown = QComboBox()
         self.dropdown.setFont(QFont("Segoe UI", 14))
-        self.dropdown.addItems(progress.keys())
+        self.dropdown.addItems(progress.periods())
         self.dropdown.setCurrentText("This Week")
         layout.addWidget(self.dropdown)
 
-        self.activity_list = QListWidget()
-        self.activity_list.setStyleSheet("""
-            QListWidget { font-size: 15px; border-radius: 10px; padding: 10px; }
-            QListWidget::item { padding: 10px 14px; }
-        """)
+        self.activity_model = LazyListModel()
+        self.activity_list = make_list_view(self.activity_model, "activity-list")
         layout.addWidget(self.activity_list)
 
         graph_title = QLabel("\n\ud83d\udcc8 Performance Trend")
         graph_title.setFont(QFont("Segoe UI Semibold", 18))
-        graph_title.setStyleSheet("color: #2563eb;")
+        graph_title.setProperty("kind", "heading")
         layout.addWidget(graph_title)
 
-        self.canvas = FigureCanvas(Figure(figsize=(6, 2.5), dpi=120))
-        layout.addWidget(self.canvas)
-        self.ax = self.canvas.figure.add_subplot(111)
+        # Periods already seen at this size come straight from the chart cache
+        self.trend_view = ScoreChartView(progress, "trend")
+        layout.addWidget(self.trend_view)
 
         def update_graph(filter_key):
-            self.ax.clear()
-            subjects = [s[0] for s in progress[filter_key]]
-            scores = []
-            for item in progress[filter_key]:
-                if "Graded" in item[1]:
-                    score = int(item[1].split(": ")[1].split("/")[0])
-                else:
-                    score = 0
-                scores.append(score)
-            self.ax.plot(subjects, scores, marker='o', linestyle='-', color="#2563eb", linewidth=2)
-            self.ax.fill_between(subjects, scores, color="#93c5fd", alpha=0.3)
-            self.ax.tick_params(axis='x', labelsize=8, rotation=15, colors='#4b5563')
-            self.ax.tick_params(axis='y', labelsize=9, colors='#4b5563')
-            self.ax.set_ylim(0, 100)
-            self.ax.set_ylabel("Score", fontsize=11, color="#1e40af")
-            self.ax.set_title(f"{filter_key} Scores", fontsize=14, color="#1e40af", weight='bold')
-            self.ax.spines['top'].set_visible(False)
-            self.ax.spines['right'].set_visible(False)
-            self.ax.spines['left'].set_color('#60a5fa')
-            self.ax.spines['bottom'].set_color('#60a5fa')
-
-            self.ax.grid(True, linestyle='--', alpha=0.25)
-            self.canvas.draw()
+            self.trend_view.show_period(filter_key)
+
+        self.update_graph = update_graph
 
         def update_activity_list():
-            self.activity_list.clear()
+            # Only the rows the view shows are formatted; the rest load as it scrolls
             selected = self.dropdown.currentText()
-            for subject, status, color in progress[selected]:
-                item = QListWidgetItem(f"{subject} - {status}")
-                item.setForeground(QColor(color))
-                self.activity_list.addItem(item)
+
+            def fetch(start, stop):
+                return [(f"{record.title} - {record.status_text()}", record.color())
+                        for record in progress.records(selected, start, stop)]
+
+            self.activity_model.set_source(lambda: progress.count(selected), fetch)
             update_graph(selected)
 
         self.dropdown.currentTextChanged.connect(update_activity_list)
@@ -951,10 +2819,8 @@ class StudentDashboard(QWidget):
         return widget
 
     def display_page(self, page_name):
-        if page_name not in self.pages:
+        if self.pages.show(page_name) is None:
             return
-        index = list(self.pages.keys()).index(page_name)
-        self.content_area.setCurrentIndex(index)
         for name, btn in self.buttons.items():
             btn.setChecked(name == page_name)
 
@@ -994,35 +2860,20 @@ class WelcomeWindow(QWidget):
         student_label = QLabel(f"Student Number: <b>{self.student_no}</b>")
         student_label.setFont(QFont("Segoe UI", 16))
         student_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        student_label.setStyleSheet("color: #555555;")
+        student_label.setObjectName("welcomeStudent")
         layout.addWidget(student_label)
 
         note_label = QLabel("You have successfully logged in.\nEnjoy your session!")
         note_label.setFont(QFont("Segoe UI", 13))
         note_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        note_label.setStyleSheet("color: #666666;")
+        note_label.setObjectName("welcomeNote")
         layout.addWidget(note_label)
 
         self.continue_btn = QPushButton("Continue")
         self.continue_btn.setFont(QFont("Segoe UI", 14))
         self.continue_btn.setFixedHeight(45)
         self.continue_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        self.continue_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3366ff;
-                color: white;
-                border-radius: 10px;
-                padding: 10px 20px;
-                font-weight: 600;
-                transition-duration: 200ms;
-            }
-            QPushButton:hover {
-                background-color: #254eda;
-            }
-            QPushButton:pressed {
-                background-color: #1a3bb8;
-            }
-        """)
+        self.continue_btn.setObjectName("continueButton")
         self.continue_btn.clicked.connect(self.continue_callback)
         layout.addWidget(self.continue_btn)
 
@@ -1082,7 +2933,8 @@ class LoginWindow(QWidget):
         self.toggle_pw_btn = QPushButton("\ud83d\udc41")
         self.toggle_pw_btn.setCheckable(True)
         self.toggle_pw_btn.setFixedSize(40, 40)
-        self.toggle_pw_btn.setStyleSheet("font-size: 18px; background-color: transparent; border: none;")
+        self.toggle_pw_btn.setProperty("kind", "icon")
+        self.toggle_pw_btn.setObjectName("loginPasswordToggle")
         self.toggle_pw_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         self.toggle_pw_btn.clicked.connect(self.toggle_password_visibility)
 
@@ -1110,38 +2962,14 @@ class LoginWindow(QWidget):
         login_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         login_btn.setFont(QFont("Segoe UI Semibold", 16))
         login_btn.setFixedHeight(48)
-        login_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #3b82f6;
-                color: white;
-                border-radius: 12px;
-                font-weight: 700;
-            }
-            QPushButton:hover {
-                background-color: #2563eb;
-            }
-            QPushButton:pressed {
-                background-color: #1d4ed8;
-            }
-        """)
+        login_btn.setObjectName("loginButton")
         login_btn.clicked.connect(self.handle_login)
         layout.addWidget(login_btn)
 
         back_btn = QPushButton("Back")
         back_btn.setFont(QFont("Segoe UI", 14))
         back_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f87171;
-                color: white;
-                border-radius: 12px;
-                padding: 10px 0;
-                font-weight: 700;
-            }
-            QPushButton:hover {
-                background-color: #dc2626;
-            }
-        """)
+        back_btn.setProperty("kind", "danger")
         back_btn.setFixedHeight(40)
         back_btn.clicked.connect(self.go_back_callback)
         layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
@@ -1175,41 +3003,162 @@ class LoginWindow(QWidget):
 
     def proceed_to_dashboard(self):
         self.welcome_window.close()
-        self.on_login_callback(self.role)
+        self.on_login_callback(self.role, self.id_input.text().strip())
         self.close()
 
 
 # ===============================
-# ProfessorWindow placeholder (as referenced)
+# Professor window - collects submitted work in bulk. Exports and imports stream a
+# tar archive (manifest first, then each file once) on a worker thread, so thousands
+# of submissions never have to fit in memory.
+class _ArchiveTaskSignals(QObject):
+    progress = pyqtSignal(int)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+
+class _ArchiveTask(QRunnable):
+    def __init__(self, work, signals):
+        super().__init__()
+        self.work = work  # work(progress) -> summary shown when done
+        self.signals = signals
+        self._percent = -1
+
+    def run(self):
+        try:
+            summary = self.work(self.report)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.signals.failed.emit(str(e) or e.__class__.__name__)
+            return
+        self.signals.finished.emit(summary)
+
+    def report(self, done, total):
+        percent = done * 100 // total if total else 100
+        if percent != self._percent:
+            self._percent = percent
+            self.signals.progress.emit(percent)
+
+
 class ProfessorWindow(QWidget):
     def __init__(self, go_back_callback):
         super().__init__()
         self.setWindowTitle("Professor Panel")
         self.setMinimumSize(800, 500)
+        self._action = ""
+        self._signals = _ArchiveTaskSignals(self)
+        self._signals.progress.connect(self.on_progress)
+        self._signals.finished.connect(self.on_finished)
+        self._signals.failed.connect(self.on_failed)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+
         layout = QVBoxLayout()
-        label = QLabel("Professor Dashboard coming soon...")
+        layout.setContentsMargins(40, 30, 40, 30)
+        layout.setSpacing(14)
+        label = QLabel("Professor Dashboard")
         label.setFont(QFont("Segoe UI Semibold", 20))
         label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         layout.addWidget(label)
+
+        heading = QLabel("Collect Submissions")
+        heading.setFont(QFont("Segoe UI", 16, QFont.Weight.Bold))
+        heading.setProperty("kind", "heading")
+        heading.setProperty("gap", "md")
+        layout.addWidget(heading)
+
+        self.subject_box = QComboBox()
+        self.subject_box.addItems(["All subjects"] + [name for name, _, _ in SUBJECTS])
+        self.item_box = QComboBox()
+        assignments = next(items for _, category, items in SUBJECT_SECTIONS if category == "assignments")
+        self.item_box.addItems(["All assignments"] + [title for title, _ in assignments])
+        filter_row = QHBoxLayout()
+        filter_row.addWidget(self.subject_box, 1)
+        filter_row.addWidget(self.item_box, 1)
+        layout.addLayout(filter_row)
+
+        self.export_btn = QPushButton("Export Submissions")
+        self.export_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.export_btn.clicked.connect(self.export_archive)
+        self.import_btn = QPushButton("Import Submissions")
+        self.import_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
+        self.import_btn.clicked.connect(self.import_archive)
+        button_row = QHBoxLayout()
+        button_row.addWidget(self.export_btn)
+        button_row.addWidget(self.import_btn)
+        button_row.addStretch()
+        layout.addLayout(button_row)
+
+        self.status_label = QLabel("Export writes one archive for the chosen subject and assignment; "
+                                   "import adds the work from an archive.")
+        self.status_label.setObjectName("archiveStatus")
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+        layout.addStretch()
+
         back_btn = QPushButton("Back")
         back_btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
         back_btn.setFixedWidth(120)
-        back_btn.setStyleSheet("""
-            QPushButton {
-                background-color: #f87171;
-                color: white;
-                border-radius: 12px;
-                padding: 10px 0;
-                font-weight: 700;
-            }
-            QPushButton:hover {
-                background-color: #dc2626;
-            }
-        """)
+        back_btn.setProperty("kind", "danger")
         back_btn.clicked.connect(go_back_callback)
         layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         self.setLayout(layout)
 
+    def export_archive(self):
+        subject = self.subject_box.currentText() if self.subject_box.currentIndex() else None
+        item = self.item_box.currentText() if self.item_box.currentIndex() else None
+        suggested = "-".join((subject or "all-subjects", item or "all-assignments")).replace(" ", "_")
+        path, _ = QFileDialog.getSaveFileName(self, "Export Submissions", f"submissions-{suggested}.tar",
+                                              "Tar archives (*.tar)")
+        if not path:
+            return
+        storage, blobs = get_storage(), get_submission_store().blobs
+
+        def work(progress):
+            exported, skipped = export_submissions(storage, blobs, path, subject, item, progress)
+            summary = f"Exported {exported} submissions to {os.path.basename(path)}."
+            if skipped:
+                summary += f" {skipped} were left out because their files are missing."
+            return summary
+        self.start("Exporting", work)
+
+    def import_archive(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Submissions", "", "Tar archives (*.tar)")
+        if not path:
+            return
+        storage, blobs = get_storage(), get_submission_store().blobs
+
+        def work(progress):
+            imported, skipped = import_submissions(storage, blobs, path, progress)
+            summary = f"Imported {imported} submissions from {os.path.basename(path)}."
+            if skipped:
+                summary += f" {skipped} were left out because the archive lacks their files."
+            return summary
+        self.start("Importing", work)
+
+    def start(self, action, work):
+        self._action = action
+        self.export_btn.setEnabled(False)
+        self.import_btn.setEnabled(False)
+        self.status_label.setText(f"{action}...")
+        self._pool.start(_ArchiveTask(work, self._signals))
+
+    def on_progress(self, percent):
+        self.status_label.setText(f"{self._action}... {percent}%")
+
+    def on_finished(self, summary):
+        self.status_label.setText(summary)
+        self.export_btn.setEnabled(True)
+        self.import_btn.setEnabled(True)
+
+    def on_failed(self, message):
+        self.on_finished(f"{self._action} failed.")
+        QMessageBox.warning(self, f"{self._action} Failed", message)
+
+    def closeEvent(self, event):
+        # A running export finishes its archive before the window goes away
+        self._pool.waitForDone()
+        super().closeEvent(event)
+
 
 # ===============================
 # Main Window with refined UI and buttons
@@ -1251,27 +3200,7 @@ class MainWindow(QWidget):
         btn.setFont(QFont("Segoe UI Semibold", 20))
         btn.setFixedSize(230, 230)
         btn.setCursor(QCursor(Qt.CursorShape.PointingHandCursor))
-        btn.setStyleSheet("""
-            QPushButton {
-                background-color: rgba(255, 255, 255, 0.85);
-                border-radius: 30px;
-                border: 2px solid transparent;
-                padding: 30px;
-                color: #374151;
-                font-weight: 700;
-                letter-spacing: 0.8px;
-                transition: background-color 0.3s ease, border-color 0.3s ease, color 0.3s ease;
-            }
-            QPushButton:hover {
-                background-color: rgba(240, 240, 240, 0.95);
-                border-color: #3366ff;
-                color: #1e40af;
-            }
-            QPushButton:pressed {
-                background-color: #dbeafe;
-                border-color: #3b82f6;
-            }
-        """)
+        btn.setProperty("kind", "role-card")
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(20)
         shadow.setColor(QColor(0, 0, 0, 70))
@@ -1290,11 +3219,14 @@ class MainWindow(QWidget):
         self.login_window.show()
         self.hide()
 
-    def show_dashboard(self, role):
+    def show_dashboard(self, role, user_id):
         if role == "Professor":
             self.dashboard = ProfessorWindow(self.show_main)
         else:
+            get_submission_store().set_student(user_id)
             self.dashboard = StudentDashboard(self.show_main)
+        # Without this a closed dashboard was only hidden, keeping its pages and charts alive
+        self.dashboard.setAttribute(Qt.WidgetAttribute.WA_DeleteOnClose)
         self.dashboard.show()
         self.login_window.close()
 
@@ -1302,8 +3234,9 @@ class MainWindow(QWidget):
         self.show()
         if hasattr(self, 'login_window'):
             self.login_window.close()
-        if hasattr(self, 'dashboard'):
+        if getattr(self, 'dashboard', None) is not None:
             self.dashboard.close()
+            self.dashboard = None
 
 
 # ===============================
@@ -1312,7 +3245,10 @@ class MainWindow(QWidget):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # Fusion style for consistency across platforms
-    app.setStyleSheet(STYLESHEET)
+    apply_theme(app)
+    app.aboutToQuit.connect(lambda: get_note_saver().flush())
+    app.aboutToQuit.connect(lambda: get_submission_store().wait())
+    app.aboutToQuit.connect(lambda: get_chart_cache().flush())
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,55 @@
+"""Progress page activity list with a term's worth of graded activities.
+
+Loads two periods of synthetic grades straight into the database, then
+times building the Progress page, switching periods, adding a grade and
+regrading one. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_activity_list.py [rows per period]
+"""
+import sys
+
+from common import start_app, timed, report
+
+import Educloud
+from educloud_core import GradeRecord
+
+PERIODS = ["Term 1", "Term 2"]
+
+
+def seed_grades(rows_per_period):
+    rows = []
+    for period in PERIODS:
+        for position in range(rows_per_period):
+            graded = position % 7 != 3
+            rows.append((period, position, f"Activity {position + 1}",
+                         float(50 + position % 50) if graded else None, 100.0,
+                         "graded" if graded else "ungraded"))
+    Educloud.get_storage().insert_grades(rows)
+
+
+def main(rows_per_period=2000, runs=20):
+    app = start_app()
+    seed_grades(rows_per_period)
+    progress = Educloud.get_progress_repository()
+
+    dashboard = Educloud.StudentDashboard(lambda: None)
+    dashboard.resize(1100, 800)
+    dashboard.show()
+    app.processEvents()
+    print(f"{rows_per_period} activities per period")
+    report("build Progress page", [timed(app, lambda: dashboard.display_page("Progress"))])
+
+    switches = [timed(app, lambda n=n: dashboard.dropdown.setCurrentText(PERIODS[n % 2]))
+                for n in range(1, runs + 1)]
+    report("period switch", switches)
+
+    period = dashboard.dropdown.currentText()
+    adds = [timed(app, lambda n=n: progress.add_grade(GradeRecord(f"Quiz {n}", 80, period=period)))
+            for n in range(runs)]
+    report("add grade", adds)
+    regrades = [timed(app, lambda n=n: progress.set_grade(period, n, 90)) for n in range(runs)]
+    report("regrade", regrades)
+    dashboard.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
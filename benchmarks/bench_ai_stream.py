@@ -0,0 +1,58 @@
+"""Time to first word versus time to the whole answer for streamed AI replies.
+
+A local fake model (StubAIBackend driven by a generator through stream_source)
+thinks for a moment and then produces one word at a time. Each question is
+asked through AIRequestEngine twice: streamed, and as a single blocking answer.
+The script prints how long the first word and the whole answer take in each
+case. Nothing goes over the network. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_ai_stream.py [runs]
+"""
+import sys
+import time
+
+from common import start_app, report
+
+from educloud_core import StubAIBackend, AIResponseCache, TokenBucket
+
+import Educloud
+
+THINK = 0.3  # seconds before the first word
+WORDS = 120
+WORD_INTERVAL = 0.01
+
+
+def fake_model(prompt):
+    time.sleep(THINK)
+    for n in range(WORDS):
+        if n:
+            time.sleep(WORD_INTERVAL)
+        yield f"word{n} "
+
+
+def ask(app, submit, prompt):
+    # (first word, whole answer) in seconds
+    reply = submit(prompt)
+    done = []
+    reply.finished.connect(done.append)
+    reply.failed.connect(done.append)
+    while not done:
+        app.processEvents()
+        time.sleep(0.0005)
+    return reply.first_token_latency(), time.perf_counter() - reply.submitted_at
+
+
+def main(runs=5):
+    app = start_app()
+    # The blocking answer takes as long as the whole stream
+    backend = StubAIBackend(delay=THINK + WORD_INTERVAL * (WORDS - 1), token_delay=0, stream_source=fake_model)
+    engine = Educloud.AIRequestEngine(backend, cache=AIResponseCache(path=None),
+                                      limiter=TokenBucket(rate=1000.0, capacity=runs * 2))
+    for label, submit in (("streamed", engine.submit_stream), ("blocking", engine.submit)):
+        samples = [ask(app, submit, f"question {n}") for n in range(runs)]
+        # A blocking answer shows nothing until all of it is there
+        report(f"{label} first word", [first or whole for first, whole in samples])
+        report(f"{label} whole answer", [whole for _, whole in samples])
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
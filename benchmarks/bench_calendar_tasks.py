@@ -0,0 +1,67 @@
+"""Calendar page over a large task store.
+
+Seeds the tasks table with synthetic to-dos spread over several years, then
+times loading the store, the date range queries behind the task lists, building
+the Calendar page, paging through months (first visits build the month's
+markers, return visits reuse them), changing the selected day and adding a
+task. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_calendar_tasks.py [tasks]
+"""
+import sys
+import random
+from datetime import date, timedelta
+
+from common import start_app, timed, report
+
+from PyQt6.QtCore import QDate
+
+import Educloud
+
+SPREAD_DAYS = 5 * 365
+
+
+def seed_tasks(count):
+    rng = random.Random(7)
+    start = date.today() - timedelta(days=SPREAD_DAYS // 2)
+    rows = [((start + timedelta(days=rng.randrange(SPREAD_DAYS))).isoformat(), f"Task {n + 1}", False)
+            for n in range(count)]
+    Educloud.get_storage().insert_tasks(rows)
+
+
+def main(count=50000, runs=24):
+    app = start_app()
+    seed_tasks(count)
+    print(f"{count} tasks over {SPREAD_DAYS} days")
+
+    report("load task store", [timed(None, lambda: Educloud.TaskStore(Educloud.get_storage()))])
+    store = Educloud.get_task_store()
+    today = date.today()
+    report("tasks due today", [timed(None, lambda: store.tasks(today, today + timedelta(days=1)))
+                               for _ in range(runs)])
+    report("count due in 14 days", [timed(None, lambda: store.count(today, today + timedelta(days=14)))
+                                    for _ in range(runs)])
+
+    markers = Educloud.CalendarMarkers(store, max_months=runs)
+    months = [(today.year + (today.month - 1 + n) // 12, (today.month - 1 + n) % 12 + 1) for n in range(runs)]
+    report("month markers, built", [timed(None, lambda m=m: markers.month(*m)) for m in months])
+    report("month markers, cached", [timed(None, lambda m=m: markers.month(*m)) for m in months])
+
+    dashboard = Educloud.StudentDashboard(lambda: None)
+    dashboard.resize(1100, 800)
+    dashboard.show()
+    app.processEvents()
+    report("build Calendar page", [timed(app, lambda: dashboard.display_page("Calendar"))])
+
+    calendar = dashboard.planner
+    report("next month, first visit", [timed(app, calendar.showNextMonth) for _ in range(runs)])
+    report("previous month, cached", [timed(app, calendar.showPreviousMonth) for _ in range(runs)])
+    first = QDate(calendar.yearShown(), calendar.monthShown(), 1)
+    report("select day", [timed(app, lambda n=n: calendar.setSelectedDate(first.addDays(n)))
+                          for n in range(runs)])
+    selected = calendar.selectedDate().toPyDate()
+    report("add task", [timed(app, lambda n=n: store.add(selected, f"Added {n}")) for n in range(runs)])
+    dashboard.close()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
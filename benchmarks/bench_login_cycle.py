@@ -0,0 +1,56 @@
+"""Repeated student login and logout through MainWindow.
+
+Each cycle changes one grade (so the charts cannot come from the image
+cache), opens the student dashboard via MainWindow.show_dashboard, waits
+for the warm-up to finish, visits the Progress page and goes back to the
+role picker. Live matplotlib figures, widget count and resident memory are
+printed per cycle; they should level off instead of growing. Run from the
+repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_login_cycle.py
+"""
+import time
+
+from common import start_app
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QApplication
+
+import Educloud
+
+
+def login_cycle(app, window):
+    started = time.perf_counter()
+    window.open_student_login()
+    window.show_dashboard("Student", "22-00001")
+    dashboard = window.dashboard
+    while not dashboard.is_warm():
+        app.processEvents()
+    dashboard.display_page("Progress")
+    app.processEvents()
+    window.show_main()
+    # Run the deleteLater queued by WA_DeleteOnClose
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    app.processEvents()
+    return time.perf_counter() - started
+
+
+def main(cycles=15):
+    app = start_app()
+    window = Educloud.MainWindow()
+    window.show()
+    app.processEvents()
+
+    progress = Educloud.get_progress_repository()
+    for n in range(1, cycles + 1):
+        progress.set_grade("This Week", 0, 60 + n % 40)
+        progress.set_grade("Last Week", 0, 60 + n % 40)
+        elapsed = login_cycle(app, window)
+        stats = Educloud.get_chart_pool().stats()
+        rss = f"{stats['rss_bytes'] / 2**20:.1f} MiB" if stats["rss_bytes"] else "n/a"
+        print(f"cycle {n:2d}: {elapsed * 1000:6.1f} ms, live figures {stats['live_figures']}, "
+              f"charts created {stats['created']} reused {stats['reused']}, "
+              f"widgets {len(QApplication.allWidgets())}, rss {rss}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""In-app preview of submitted work.
+
+Submits one large synthetic text file, a large photo and a PDF, then times
+opening each preview and prints how much memory the process gains while the
+text preview is scrolled from top to bottom. Pages of the mapped file count as
+resident too, but they are page cache the kernel can drop, not heap; on Linux
+the two are reported apart. Image and PDF previews are
+opened again to compare rendering with thumbnail cache hits from memory and
+from disk. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_preview.py [text MiB]
+"""
+import os
+import sys
+import time
+import statistics
+
+from common import start_app
+
+from PyQt6.QtGui import QColor, QImage, QPageSize, QPainter, QPdfWriter
+
+import Educloud
+
+
+def make_text(path, mib):
+    block = b"".join(b"%08d Lorem ipsum dolor sit amet, consectetur adipiscing elit.\n" % n
+                     for n in range(16384))
+    with open(path, "wb") as f:
+        for _ in range(mib):
+            f.write(block[:1 << 20])
+
+
+def make_photo(path):
+    image = QImage(6000, 4000, QImage.Format.Format_RGB32)
+    image.fill(QColor("#38bdf8"))
+    image.save(path, "JPG")
+
+
+def make_pdf(path):
+    writer = QPdfWriter(path)
+    writer.setPageSize(QPageSize(QPageSize.PageSizeId.A4))
+    painter = QPainter(writer)
+    for page in range(20):
+        if page:
+            writer.newPage()
+        painter.drawText(400, 400, f"Page {page + 1}")
+    painter.end()
+
+
+def submit(app, store, files):
+    for item, path in files.items():
+        store.submit("Mathematics", item, path)
+    store.wait()
+    app.processEvents()
+
+
+def memory_mib():
+    # (heap, mapped file pages) in MiB where /proc says, else (rss, None)
+    try:
+        with open("/proc/self/status") as f:
+            fields = dict(line.split(":", 1) for line in f)
+        return int(fields["RssAnon"].split()[0]) / 1024, int(fields["RssFile"].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        rss = Educloud.current_rss_bytes()
+        return (rss / 2**20 if rss else 0.0), None
+
+
+def open_preview(app, store, item):
+    path, digest, name = store.preview_source("Mathematics", item)
+    started = time.perf_counter()
+    dialog = Educloud.SubmissionPreview(name, path, digest)
+    dialog.show()
+    app.processEvents()
+    return time.perf_counter() - started, dialog
+
+
+def main(mib=512, runs=5):
+    app = start_app()
+    files = {"Essay": os.path.abspath("essay.txt"), "Photo": os.path.abspath("photo.jpg"),
+             "Report": os.path.abspath("report.pdf")}
+    make_text(files["Essay"], mib)
+    make_photo(files["Photo"])
+    make_pdf(files["Report"])
+    store = Educloud.get_submission_store()
+    submit(app, store, files)
+    open_preview(app, store, "Essay")[1].accept()  # first dialog pays font and style setup
+
+    samples = []
+    before = memory_mib()
+    for _ in range(runs):
+        elapsed, dialog = open_preview(app, store, "Essay")
+        samples.append(elapsed)
+        bar = dialog.text_view.verticalScrollBar()
+        for value in range(0, bar.maximum() + 1, max(1, bar.maximum() // 200)):
+            bar.setValue(value)
+            app.processEvents()
+        scrolled = memory_mib()
+        dialog.accept()
+    print(f"open {mib} MiB text: median {statistics.median(samples) * 1000:.1f} ms over {runs} runs")
+    print(f"after scrolling it end to end: heap +{scrolled[0] - before[0]:.1f} MiB", end="")
+    if scrolled[1] is not None:
+        print(f", mapped file pages +{scrolled[1] - before[1]:.1f} MiB (released on close: "
+              f"{memory_mib()[1] - before[1]:+.1f} MiB)", end="")
+    print()
+
+    cache = Educloud.get_thumbnail_cache()
+    for item in ("Photo", "Report"):
+        rendered, dialog = open_preview(app, store, item)
+        dialog.accept()
+        memory_hit, dialog = open_preview(app, store, item)
+        dialog.accept()
+        cache.flush()
+        cache._memory.clear()
+        disk_hit, dialog = open_preview(app, store, item)
+        dialog.accept()
+        print(f"{item.lower()} preview: rendered {rendered * 1000:.1f} ms, "
+              f"memory hit {memory_hit * 1000:.1f} ms, disk hit {disk_hit * 1000:.1f} ms")
+    print(f"thumbnail cache: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 512)
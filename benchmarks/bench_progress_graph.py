@@ -0,0 +1,48 @@
+"""Per-switch redraw time of the Progress page "Performance Trend" chart.
+
+Each sample changes the period dropdown and processes events until the
+chart has been redrawn. The first visit to each period renders with
+matplotlib; later visits are served from the rendered-chart cache, so the
+two are reported separately. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_progress_graph.py
+"""
+import time
+
+from common import start_app, report
+
+import Educloud
+
+
+def switch_periods(app, dashboard, switches):
+    # (rendered, cached) switch times in seconds
+    periods = [dashboard.dropdown.itemText(i) for i in range(dashboard.dropdown.count())]
+    view = dashboard.trend_view
+    rendered, cached = [], []
+    for n in range(switches):
+        period = periods[(n + 1) % len(periods)]
+        renders = view.renders
+        started = time.perf_counter()
+        dashboard.dropdown.setCurrentText(period)
+        app.processEvents()
+        elapsed = time.perf_counter() - started
+        (rendered if view.renders > renders else cached).append(elapsed)
+    return rendered, cached
+
+
+def main(switches=60):
+    app = start_app()
+    dashboard = Educloud.StudentDashboard(lambda: None)
+    dashboard.show()
+    dashboard.display_page("Progress")
+    app.processEvents()
+
+    rendered, cached = switch_periods(app, dashboard, switches)
+    for label, samples in (("rendered", rendered), ("cached", cached)):
+        if samples:
+            report(f"period switch, {label}", samples)
+    print("chart cache:", dashboard.trend_view.cache.stats())
+    dashboard.close()
+
+
+if __name__ == "__main__":
+    main()
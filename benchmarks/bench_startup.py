@@ -0,0 +1,54 @@
+"""Cold start: import time of Educloud and time until MainWindow is first painted.
+
+Every sample runs in a fresh interpreter so module caches don't hide import cost.
+Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py
+"""
+import os
+import sys
+import json
+import subprocess
+
+from common import ROOT, report
+
+PROBE = r"""
+import sys, time, json
+started = time.perf_counter()
+sys.path.insert(0, ROOT)
+import Educloud
+imported = time.perf_counter()
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+Educloud.apply_theme(app)
+window = Educloud.MainWindow()
+window.show()
+app.processEvents()
+shown = time.perf_counter()
+heavy = [name for name in ("openai", "matplotlib", "numpy") if name in sys.modules]
+print(json.dumps({"import": imported - started, "first_window": shown - started, "heavy_modules": heavy}))
+"""
+
+
+def run_probe():
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    out = subprocess.run(
+        [sys.executable, "-c", f"ROOT = {ROOT!r}\n" + PROBE],
+        capture_output=True, text=True, env=env, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main(runs=7):
+    run_probe()  # warm the OS file cache
+    samples = [run_probe() for _ in range(runs)]
+    for key, label in (("import", "import Educloud"), ("first_window", "time to first window")):
+        report(label, [s[key] for s in samples])
+    heavy = samples[-1]["heavy_modules"]
+    print(f"heavy modules loaded at first window: {', '.join(heavy) or 'none'}")
+    # Loading AI or plotting before the first window is a regression
+    return 1 if heavy else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""SubjectDetailPage with a course's worth of content.
+
+Fills every tab with synthetic items, then times opening the page, switching
+to each tab and scrolling the notes to the bottom, and counts the QTextEdits
+alive afterwards. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_subject_page.py [items per tab]
+"""
+import sys
+
+from common import start_app, timed, report
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+from PyQt6.QtWidgets import QScrollArea, QTabWidget, QTextEdit
+
+import Educloud
+
+
+def synthetic_sections(items_per_tab):
+    return [
+        (title, category, [(f"{title} {n + 1}", f"Reading and exercises for part {n + 1}.")
+                           for n in range(items_per_tab)])
+        for title, category in (("Modules", "modules"), ("Pointers to Review", "pointers"),
+                                ("Assignments", "assignments"))
+    ]
+
+
+def run(app):
+    pages = []
+
+    def open_page():
+        pages.append(Educloud.SubjectDetailPage("Mathematics", lambda: None))
+        pages[0].resize(1100, 800)
+        pages[0].show()
+
+    samples = {"open page": timed(app, open_page)}
+    page = pages[0]
+    tabs = page.findChild(QTabWidget)
+    bar = page.findChild(QScrollArea).verticalScrollBar()
+    for index in range(1, tabs.count()):
+        samples[f"open tab {index}"] = timed(app, lambda: tabs.setCurrentIndex(index))
+    samples["scroll to bottom"] = timed(app, lambda: [bar.setValue(value) for value in range(0, bar.maximum() + 1, 120)])
+    editors = len(page.findChildren(QTextEdit))
+    page.close()
+    page.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    return samples, editors
+
+
+def main(items_per_tab=60, runs=5):
+    app = start_app()
+    Educloud.SUBJECT_SECTIONS = synthetic_sections(items_per_tab)
+    run(app)  # first build pays font and style setup
+    results = [run(app) for _ in range(runs)]
+    print(f"{items_per_tab} items per tab")
+    for label in results[0][0]:
+        report(label, [samples[label] for samples, _ in results])
+    print(f"QTextEdits alive: {results[-1][1]}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
@@ -0,0 +1,91 @@
+"""Bulk submission export and import.
+
+Stores thousands of synthetic submissions (students x assignments, a few KiB to
+a few hundred KiB each, some students handing in identical files), then times
+exporting everything, exporting one assignment, importing the archive into an
+empty installation and importing it again on top. Prints throughput, archive
+size and the peak memory of the process, which should stay far below the
+size of the archive. Needs no display. Run from the repository root:
+    python benchmarks/bench_submission_archive.py [submissions]
+"""
+import io
+import os
+import sys
+import time
+import random
+
+from common import scratch_dir
+
+from educloud_core import Storage, BlobStore, export_submissions, import_submissions
+
+SUBJECTS = ["Mathematics", "Science", "English", "History"]
+ASSIGNMENTS = ["Assignment 1", "Assignment 2", "Assignment 3"]
+
+
+def peak_rss_mib():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def seed(storage, blobs, count):
+    rng = random.Random(11)
+    noise = os.urandom(1 << 20)
+    per_assignment = len(SUBJECTS) * len(ASSIGNMENTS)
+    total = 0
+    for n in range(count):
+        subject, item = SUBJECTS[n % len(SUBJECTS)], ASSIGNMENTS[n // len(SUBJECTS) % len(ASSIGNMENTS)]
+        student = f"22-{n // per_assignment:05d}"
+        # One in ten hands in a file somebody else already did
+        seed_no = rng.randrange(n // 10 + 1) if n and rng.random() < 0.1 else n
+        size = random.Random(seed_no).randrange(4 << 10, 256 << 10)
+        start = seed_no * 7919 % ((1 << 20) - size)
+        data = b"%d\n" % seed_no + noise[start:start + size]
+        digest, size = blobs.ingest_stream(io.BytesIO(data), len(data))
+        storage.set_submission(subject, item, f"/home/{student}/{item}.pdf", digest, f"{item}.pdf", size, student)
+        total += size
+    return total
+
+
+def timed(action):
+    started = time.perf_counter()
+    result = action()
+    return time.perf_counter() - started, result
+
+
+def main(count=5000):
+    root = scratch_dir()
+    source = Storage(os.path.join(root, "source.db"))
+    source_blobs = BlobStore(os.path.join(root, "source_blobs"))
+    payload = seed(source, source_blobs, count)
+    stored = sum(len(files) for _, _, files in os.walk(source_blobs.root))
+    print(f"{count} submissions, {payload / 2**20:.0f} MiB submitted, {stored} distinct files")
+    rss_start = peak_rss_mib()
+
+    archive = os.path.join(root, "all.tar")
+    elapsed, (exported, _) = timed(lambda: export_submissions(source, source_blobs, archive))
+    size = os.path.getsize(archive) / 2**20
+    print(f"export all: {exported} submissions in {elapsed * 1000:.0f} ms "
+          f"({size / elapsed:.0f} MiB/s), archive {size:.0f} MiB")
+    one = os.path.join(root, "one.tar")
+    elapsed, (exported, _) = timed(lambda: export_submissions(source, source_blobs, one, "Mathematics",
+                                                              "Assignment 1"))
+    print(f"export one assignment: {exported} submissions in {elapsed * 1000:.0f} ms")
+
+    target = Storage(os.path.join(root, "target.db"))
+    target_blobs = BlobStore(os.path.join(root, "target_blobs"))
+    elapsed, (imported, skipped) = timed(lambda: import_submissions(target, target_blobs, archive))
+    print(f"import into empty: {imported} submissions ({skipped} skipped) in {elapsed * 1000:.0f} ms "
+          f"({size / elapsed:.0f} MiB/s)")
+    elapsed, (imported, _) = timed(lambda: import_submissions(target, target_blobs, archive))
+    print(f"import again (files already stored): {imported} submissions in {elapsed * 1000:.0f} ms")
+    rss_end = peak_rss_mib()
+    if rss_start is not None:
+        print(f"peak memory: {rss_end:.0f} MiB ({rss_end - rss_start:+.0f} MiB while archiving)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,64 @@
+"""Submission uploads into the content-addressed blob store.
+
+Uploads one large synthetic file through SubmissionStore while a 10 ms timer
+ticks on the GUI thread, then uploads the same file for a second assignment.
+Prints copy throughput, the longest gap between timer ticks (how long the GUI
+stalled), the resident memory growth and the number of stored blobs. Run from
+the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_submissions.py [MiB]
+"""
+import os
+import sys
+import time
+
+from common import start_app
+
+from PyQt6.QtCore import QTimer
+
+import Educloud
+
+
+def make_file(path, mib):
+    block = os.urandom(1 << 20)
+    with open(path, "wb") as f:
+        for n in range(mib):
+            f.write(block[n % 256:] + block[:n % 256])
+
+
+def upload(app, store, item, path):
+    ticks = []
+    timer = QTimer()
+    timer.timeout.connect(lambda: ticks.append(time.perf_counter()))
+    timer.start(10)
+    done = []
+    store.submission_changed.connect(lambda subject, changed: done.append(changed))
+    started = time.perf_counter()
+    store.submit("Mathematics", item, path)
+    while item not in done:
+        app.processEvents()
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - started
+    timer.stop()
+    gaps = [b - a for a, b in zip(ticks, ticks[1:])] or [elapsed]
+    return elapsed, max(gaps)
+
+
+def main(mib=256):
+    app = start_app()
+    path = os.path.abspath("upload.bin")
+    make_file(path, mib)
+    store = Educloud.get_submission_store()
+    rss_before = Educloud.current_rss_bytes()
+    for label, item in (("first upload", "Assignment 1"), ("same file again", "Assignment 2")):
+        elapsed, stall = upload(app, store, item, path)
+        print(f"{label}: {elapsed * 1000:.0f} ms ({mib / elapsed:.0f} MiB/s), "
+              f"longest GUI stall {stall * 1000:.1f} ms")
+    rss_after = Educloud.current_rss_bytes()
+    if rss_before and rss_after:
+        print(f"rss growth: {(rss_after - rss_before) / 2**20:.1f} MiB for a {mib} MiB file")
+    blobs = sum(len(files) for _, _, files in os.walk(Educloud.BLOB_DIR))
+    print(f"blobs stored: {blobs}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 256)
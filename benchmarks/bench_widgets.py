@@ -0,0 +1,48 @@
+"""Widget construction time for the style-heavy views.
+
+Each sample builds the view, shows it and processes events, so style sheet
+parsing and polishing are included. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/bench_widgets.py
+"""
+import time
+
+from common import start_app, report
+
+from PyQt6.QtCore import QCoreApplication, QEvent
+
+import Educloud
+
+
+def time_build(app, build):
+    started = time.perf_counter()
+    widget = build()
+    widget.resize(1100, 800)
+    widget.show()
+    app.processEvents()
+    elapsed = time.perf_counter() - started
+    widget.close()
+    widget.deleteLater()
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete.value)
+    return elapsed
+
+
+def main(runs=15):
+    app = start_app("Fusion")
+
+    dashboard = Educloud.StudentDashboard(lambda: None)
+    cases = [
+        ("SubjectDetailPage", lambda: Educloud.SubjectDetailPage("Mathematics", lambda: None)),
+        ("class page", dashboard.create_class_page),
+        ("calendar page", dashboard.create_calendar_page),
+        ("SettingsPage", Educloud.SettingsPage),
+        ("LoginWindow", lambda: Educloud.LoginWindow("Student", lambda role, user_id: None, lambda: None)),
+        ("MainWindow", Educloud.MainWindow),
+    ]
+    for label, build in cases:
+        time_build(app, build)  # first build pays font and style setup
+        report(label, [time_build(app, build) for _ in range(runs)])
+    dashboard.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Shared setup for the benchmark scripts.
+
+Importing this puts the repository on sys.path and selects the offscreen Qt
+platform unless another one was asked for, so every script runs headless.
+"""
+import os
+import sys
+import time
+import atexit
+import shutil
+import tempfile
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+def scratch_dir():
+    # The app keeps its database and caches in the working directory; start from nothing.
+    # The directory (uploads, blobs and all) is removed when the interpreter exits.
+    path = tempfile.mkdtemp(prefix="educloud-bench-")
+    atexit.register(shutil.rmtree, path, ignore_errors=True)
+    os.chdir(path)
+    return path
+
+
+def start_app(style=None):
+    # A themed QApplication running in a fresh scratch directory
+    from PyQt6.QtWidgets import QApplication
+    import Educloud
+    scratch_dir()
+    app = QApplication.instance() or QApplication(sys.argv)
+    if style:
+        app.setStyle(style)
+    Educloud.apply_theme(app)
+    return app
+
+
+def timed(app, action):
+    # Seconds for action() plus the events it posted
+    started = time.perf_counter()
+    action()
+    if app is not None:
+        app.processEvents()
+    return time.perf_counter() - started
+
+
+def report(label, samples, digits=None):
+    median = statistics.median(samples) * 1000
+    if digits is None:
+        digits = 3 if median < 1 else 2 if median < 100 else 1
+    print(f"{label}: median {median:.{digits}f} ms, "
+          f"min {min(samples) * 1000:.{digits}f} ms, max {max(samples) * 1000:.{digits}f} ms "
+          f"over {len(samples)} runs")
@@ -0,0 +1,280 @@
+"""Benchmark suite for the hot paths, with JSON results and a stored baseline.
+
+Times cold start to MainWindow shown, StudentDashboard construction,
+SubjectDetailPage construction per subject, the per-keystroke cost of note
+saving, Progress chart period switches (update_graph) and upload
+registration. Every case runs in fresh interpreters (three by default) so one
+case's caches can't flatter the next, and the best of their medians is kept
+as the result. Medians are compared against benchmarks/baseline.json;
+a metric that is slower by more than the tolerance (and by more than a couple
+of milliseconds, so timer noise on tiny numbers doesn't count) fails the run
+with exit status 1. Run from the repository root:
+    QT_QPA_PLATFORM=offscreen python benchmarks/suite.py [--output results.json]
+    QT_QPA_PLATFORM=offscreen python benchmarks/suite.py --update-baseline
+The stored baseline is only meaningful on the machine that recorded it;
+regenerate it with --update-baseline when the benchmark hardware changes.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import statistics
+import subprocess
+
+from common import ROOT, start_app, timed
+
+BASELINE_FILE = os.path.join(ROOT, "benchmarks", "baseline.json")
+TOLERANCE = 0.25
+MIN_DELTA_MS = 2.0
+REPEAT = 3
+
+
+def case_cold_start(runs):
+    from bench_startup import run_probe
+    run_probe()  # warm the OS file cache
+    samples = [run_probe() for _ in range(runs)]
+    return {key: [s[key] for s in samples] for key in ("import", "first_window")}
+
+
+def case_dashboard_build(runs):
+    from bench_dashboard import time_to_dashboard
+    app = start_app()
+    time_to_dashboard(app)  # first run pays font and style setup
+    samples = [time_to_dashboard(app) for _ in range(runs)]
+    return {"first_paint": [s[0] for s in samples], "warm": [s[1] for s in samples]}
+
+
+def case_subject_page_build(runs):
+    from bench_widgets import time_build
+    import Educloud
+    app = start_app()
+    results = {}
+    for name, _, _ in Educloud.SUBJECTS:
+        build = lambda: Educloud.SubjectDetailPage(name, lambda: None)
+        time_build(app, build)
+        results[name] = [time_build(app, build) for _ in range(runs)]
+    return results
+
+
+def case_save_note_keystroke(runs, keys_per_run=20):
+    from PyQt6.QtTest import QTest
+    from PyQt6.QtWidgets import QTextEdit
+    import Educloud
+    app = start_app()
+    page = Educloud.SubjectDetailPage("Mathematics", lambda: None)
+    page.resize(1100, 800)
+    page.show()
+    app.processEvents()
+    page.update_editor_window()
+    editor = next(e for e in page.findChildren(QTextEdit) if e.isVisible())
+    editor.setFocus()
+    saver = Educloud.get_note_saver()
+    keystrokes, flushes = [], []
+    for _ in range(runs):
+        keystrokes += [timed(app, lambda: QTest.keyClick(editor, "a")) for _ in range(keys_per_run)]
+        # The debounced write the keystrokes above would have triggered
+        flushes.append(timed(None, saver.flush))
+    page.close()
+    return {"keystroke": keystrokes, "flush": flushes}
+
+
+def case_update_graph(runs):
+    from bench_progress_graph import switch_periods
+    import Educloud
+    app = start_app()
+    dashboard = Educloud.StudentDashboard(lambda: None)
+    dashboard.resize(1100, 800)
+    dashboard.show()
+    dashboard.display_page("Progress")
+    app.processEvents()
+    dropdown = dashboard.dropdown
+    periods = [dropdown.itemText(i) for i in range(dropdown.count())]
+    rendered = []
+    for n in range(runs):
+        dashboard.trend_view.cache.clear()
+        period = periods[(periods.index(dropdown.currentText()) + 1) % len(periods)]
+        rendered.append(timed(app, lambda: dropdown.setCurrentText(period)))
+    switch_periods(app, dashboard, len(periods))  # every period cached at this size
+    _, cached = switch_periods(app, dashboard, runs)
+    dashboard.close()
+    return {"rendered": rendered, "cached": cached}
+
+
+def case_upload_registration(runs, mib=1):
+    from bench_submissions import make_file
+    import Educloud
+    app = start_app()
+    store = Educloud.get_submission_store()
+    done = []
+    store.submission_changed.connect(lambda subject, item: done.append(item))
+    calls, registered = [], []
+    for n in range(runs):
+        item = f"Assignment {n + 1}"
+        path = os.path.abspath(f"upload-{n}.bin")
+        make_file(path, mib)
+        started = time.perf_counter()
+        store.submit("Mathematics", item, path)
+        calls.append(time.perf_counter() - started)
+        while item not in done:
+            app.processEvents()
+            time.sleep(0.0005)
+        registered.append(time.perf_counter() - started)
+    return {"submit_call": calls, "registered": registered}
+
+
+CASES = {
+    "cold_start": (case_cold_start, 5),
+    "dashboard_build": (case_dashboard_build, 10),
+    "subject_page_build": (case_subject_page_build, 5),
+    "save_note_keystroke": (case_save_note_keystroke, 10),
+    "update_graph": (case_update_graph, 10),
+    "upload_registration": (case_upload_registration, 10),
+}
+
+
+def run_case(name, runs):
+    # In a child interpreter: run one case and print its samples as the last line
+    function, default_runs = CASES[name]
+    samples = function(runs or default_runs)
+    print(json.dumps(samples))
+
+
+def spawn_case(name, runs):
+    command = [sys.executable, os.path.abspath(__file__), "--run-case", name]
+    if runs:
+        command += ["--runs", str(runs)]
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    proc = subprocess.run(command, capture_output=True, text=True, env=env, cwd=ROOT)
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise RuntimeError(f"benchmark case {name} failed with exit status {proc.returncode}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(groups):
+    # groups: one list of samples per child process. The process with the lowest
+    # median sets the result, so a noisy neighbour slowing one process down doesn't
+    # read as a regression; a real regression slows every process.
+    ms = [[s * 1000 for s in samples] for samples in groups]
+    everything = [s for samples in ms for s in samples]
+    return {
+        "median_ms": round(min(statistics.median(samples) for samples in ms), 4),
+        "min_ms": round(min(everything), 4),
+        "max_ms": round(max(everything), 4),
+        "runs": len(everything),
+        "processes": len(ms),
+    }
+
+
+def environment():
+    from PyQt6.QtCore import QT_VERSION_STR, PYQT_VERSION_STR
+    return {
+        "python": platform.python_version(),
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "qpa": os.environ.get("QT_QPA_PLATFORM", ""),
+    }
+
+
+def compare(results, baseline, tolerance, min_delta_ms, out=sys.stdout):
+    # Returns the names of regressed metrics after printing a comparison table
+    regressions = []
+    width = max(len(name) for name in results)
+    print(f"{'metric':<{width}}  {'median':>10}  {'baseline':>10}  {'change':>8}", file=out)
+    for name, result in results.items():
+        median = result["median_ms"]
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<{width}}  {median:>8.2f}ms  {'-':>10}  {'new':>8}", file=out)
+            continue
+        base = base["median_ms"]
+        change = (median - base) / base if base else 0.0
+        regressed = median > base * (1 + tolerance) and median - base > min_delta_ms
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<{width}}  {median:>8.2f}ms  {base:>8.2f}ms  {change:>+7.0%}{flag}", file=out)
+        if regressed:
+            regressions.append(name)
+    for name in baseline:
+        if name not in results:
+            print(f"{name:<{width}}  {'-':>10}  {baseline[name]['median_ms']:>8.2f}ms  {'missing':>8}", file=out)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the EduCloud hot paths and compare with a baseline.")
+    parser.add_argument("cases", nargs="*", metavar="case", help=f"cases to run (default: all of {', '.join(CASES)})")
+    parser.add_argument("--runs", type=int, help="samples per metric in each process (default: per case)")
+    parser.add_argument("--repeat", type=int, default=REPEAT,
+                        help="fresh processes per case; the best median counts (default: %(default)s)")
+    parser.add_argument("--output", help="write the JSON results to this file ('-' for stdout)")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown of a median as a fraction (default: %(default)s)")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS,
+                        help="slowdowns smaller than this never count (default: %(default)s)")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--run-case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_case:
+        run_case(args.run_case, args.runs)
+        return 0
+
+    unknown = [name for name in args.cases if name not in CASES]
+    if unknown:
+        parser.error(f"unknown case: {', '.join(unknown)}")
+
+    results = {}
+    for name in args.cases or CASES:
+        print(f"running {name}...", file=sys.stderr)
+        groups = {}
+        for _ in range(max(1, args.repeat)):
+            for metric, samples in spawn_case(name, args.runs).items():
+                groups.setdefault(metric, []).append(samples)
+        for metric, samples in groups.items():
+            results[f"{name}.{metric}"] = summarize(samples)
+    document = {"environment": environment(), "results": results}
+
+    if args.output == "-":
+        print(json.dumps(document, indent=2))
+    elif args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+            f.write("\n")
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f).get("results", {})
+        # Cases that were not run keep their old numbers
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({"environment": document["environment"], "results": baseline}, f, indent=2)
+            f.write("\n")
+        print(f"baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --update-baseline to record one", file=sys.stderr)
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f).get("results", {})
+    if args.cases:
+        baseline = {name: value for name, value in baseline.items() if name.split(".", 1)[0] in args.cases}
+    # With JSON on stdout the table goes to stderr
+    out = sys.stderr if args.output == "-" else sys.stdout
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms, out)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
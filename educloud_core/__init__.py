@@ -0,0 +1,16 @@
+"""Headless core of EduCloud: storage, grades, tasks and the AI client.
+
+Nothing here imports Qt, so the data paths can be driven, tested and profiled
+from plain Python without a display. Educloud.py wraps these objects in Qt
+classes that add signals and worker threads.
+"""
+from .storage import (Storage, BlobStore, DB_FILE, BLOB_DIR, export_submissions,
+                      import_submissions)
+from .grades import (GRADED, UNGRADED, GradeRecord, GradeBook, GradeRepository, DEFAULT_GRADES,
+                     load_numpy)
+from .tasks import TaskRecord, TaskRepository, DEFAULT_TASKS
+from .cache import AIResponseCache, AI_CACHE_FILE, get_ai_cache
+from .limiter import TokenBucket, AI_REQUESTS_PER_MINUTE, AI_BURST
+from .ai import (AIRateLimitError, AIBackend, OpenAIBackend, StubAIBackend, AIClient, AIRequest,
+                 AIFlight, get_ai_backend, set_ai_backend, get_ai_response, build_ai_prompt,
+                 call_with_retries, describe_ai_error)
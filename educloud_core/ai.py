@@ -0,0 +1,413 @@
+"""AI backends for EduCloud: OpenAI for real use, a local stub for offline runs and tests.
+
+AIClient puts the response cache, request coalescing, the rate limiter and the
+retry loop in front of a backend. It answers blocking calls itself; the GUI's
+request engine drives the same client from a worker pool and adds signals.
+"""
+import os
+import re
+import time
+import random
+import itertools
+import threading
+
+from .cache import AIResponseCache, get_ai_cache
+from .limiter import TokenBucket
+
+OPENAI_API_KEY = "your_api_key_here"
+
+_openai = None
+
+def load_openai():
+    # openai takes a good part of the app's import time; it is loaded on first use
+    global _openai
+    if _openai is None:
+        import openai
+        openai.api_key = OPENAI_API_KEY
+        _openai = openai
+    return _openai
+
+
+class AIRateLimitError(Exception):
+    # Raised by backends when the API answers 429; retry_after is in seconds if known
+    def __init__(self, message="Rate limit reached", retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class AIBackend:
+    model = None
+
+    def complete(self, prompt, timeout=None):
+        raise NotImplementedError
+
+    def stream(self, prompt, timeout=None):
+        # Backends without native streaming deliver the whole answer as one chunk
+        yield self.complete(prompt, timeout)
+
+
+class OpenAIBackend(AIBackend):
+    def __init__(self, model="gpt-4"):
+        self.model = model
+
+    def complete(self, prompt, timeout=None):
+        response = self._create(prompt, timeout)
+        return response['choices'][0]['message']['content']
+
+    def stream(self, prompt, timeout=None):
+        response = self._create(prompt, timeout, stream=True)
+        for chunk in response:
+            content = chunk['choices'][0]['delta'].get('content')
+            if content:
+                yield content
+
+    def _create(self, prompt, timeout, stream=False):
+        openai = load_openai()
+        try:
+            return openai.ChatCompletion.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                request_timeout=timeout,
+                stream=stream
+            )
+        except openai.error.RateLimitError as e:
+            retry_after = None
+            headers = getattr(e, "headers", None) or {}
+            if headers.get("retry-after"):
+                try:
+                    retry_after = float(headers["retry-after"])
+                except ValueError:
+                    pass
+            raise AIRateLimitError(str(e), retry_after) from e
+
+
+class StubAIBackend(AIBackend):
+    # Answers locally after `delay` seconds, no network involved.
+    # Streaming splits the answer into words (or whatever `stream_source(prompt)`
+    # yields) and waits `token_delay` seconds between chunks. The first
+    # `rate_limited_calls` calls fail with AIRateLimitError to exercise retries.
+    def __init__(self, delay=0.3, reply=None, model="stub", token_delay=0.02, stream_source=None,
+                 rate_limited_calls=0):
+        self.model = model
+        self.delay = delay
+        self.reply = reply
+        self.token_delay = token_delay
+        self.stream_source = stream_source
+        self.rate_limited_calls = rate_limited_calls
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _count_call(self):
+        with self._lock:
+            self.calls += 1
+            if self.calls <= self.rate_limited_calls:
+                raise AIRateLimitError("Stub backend rate limit", retry_after=None)
+
+    def complete(self, prompt, timeout=None):
+        self._count_call()
+        if timeout is not None and self.delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(f"Stub backend timed out after {timeout:g}s")
+        time.sleep(self.delay)
+        return self._answer(prompt)
+
+    def stream(self, prompt, timeout=None):
+        self._count_call()
+        if self.stream_source is not None:
+            chunks = self.stream_source(prompt)
+        else:
+            chunks = re.findall(r"\S+\s*", self._answer(prompt))
+        for chunk in chunks:
+            if self.token_delay:
+                time.sleep(self.token_delay)
+            yield chunk
+
+    def _answer(self, prompt):
+        if self.reply is not None:
+            return self.reply
+        return f"[stub answer] {prompt}"
+
+
+_AI_BACKEND = None
+
+def get_ai_backend():
+    global _AI_BACKEND
+    if _AI_BACKEND is None:
+        if os.environ.get("EDUCLOUD_AI_BACKEND", "").lower() == "stub":
+            _AI_BACKEND = StubAIBackend()
+        else:
+            _AI_BACKEND = OpenAIBackend()
+    return _AI_BACKEND
+
+def set_ai_backend(backend):
+    global _AI_BACKEND
+    _AI_BACKEND = backend
+
+def get_ai_response(prompt, timeout=None):
+    return get_ai_backend().complete(prompt, timeout)
+
+def build_ai_prompt(choice, text):
+    return f"{choice} the following text:\n\n{text}"
+
+
+def call_with_retries(attempt, limiter=None, cancel_event=None, on_retry=None,
+                      max_retries=4, backoff_base=1.0, backoff_cap=30.0):
+    # Runs attempt() once the limiter admits it, backing off exponentially (with jitter)
+    # on AIRateLimitError; on_retry(retry, delay) is called before each wait. Returns
+    # attempt()'s result, or None if cancel_event is set first. Once max_retries is
+    # used up the last AIRateLimitError is raised.
+    if cancel_event is None:
+        cancel_event = threading.Event()
+    retries = 0
+    while not cancel_event.is_set():
+        if limiter is not None and not limiter.acquire(cancel_event):
+            return None
+        try:
+            return attempt()
+        except AIRateLimitError as e:
+            if retries >= max_retries or cancel_event.is_set():
+                raise
+            delay = min(backoff_cap, backoff_base * (2 ** retries))
+            delay = max(delay, e.retry_after or 0) * (1 + 0.1 * random.random())
+            retries += 1
+            if on_retry is not None:
+                on_retry(retries, delay)
+            cancel_event.wait(delay)
+    return None
+
+
+def describe_ai_error(error):
+    # What to tell the user about a failed request
+    if isinstance(error, AIRateLimitError):
+        return f"Rate limit reached, please try again later. ({error})"
+    return str(error) or error.__class__.__name__
+
+
+class AIRequest:
+    # One caller's question. It is answered from the cache (answer is set) or waits on
+    # a flight, the backend call it shares with every request for the same question.
+    def __init__(self, request_id, prompt, cache_key=None):
+        self.request_id = request_id
+        self.prompt = prompt
+        self.cache_key = cache_key
+        self.flight = None
+        self.answer = None
+        self.from_cache = False
+        self.coalesced = False
+        self.done = False
+        self.submitted_at = time.perf_counter()
+        self.first_token_at = None
+        self.parts_seen = 0  # streamed chunks already handed to the caller
+
+    def first_token_latency(self):
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.submitted_at
+
+
+class AIFlight:
+    # One backend call and the requests waiting on it. parts holds the chunks streamed
+    # so far; once ended, result or error says how it went (neither if it was abandoned).
+    def __init__(self, flight_id, prompt, timeout, cache_key=None, stream=False):
+        self.flight_id = flight_id
+        self.prompt = prompt
+        self.timeout = timeout
+        self.cache_key = cache_key
+        self.stream = stream
+        self.requests = []
+        self.parts = []
+        self.ended = False
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+
+
+class AIClient:
+    # Asks questions through the response cache, the rate limiter and the retry loop.
+    # A question asked while the same one is in flight joins that backend call instead
+    # of making another. run() makes the call on whichever thread calls it: ask() runs
+    # it in place and blocks, the GUI's request engine hands it to a worker pool and
+    # turns the rest into signals. The bookkeeping may be used from any thread.
+    def __init__(self, backend=None, cache=None, limiter=None, timeout=60.0,
+                 max_retries=4, backoff_base=1.0, backoff_cap=30.0):
+        self.backend = backend
+        self.cache = cache
+        self.limiter = limiter or TokenBucket()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.coalesced_count = 0
+        self.retry_count = 0
+        self._ids = itertools.count(1)
+        self._lock = threading.RLock()
+        self._flights = {}  # flight_id -> AIFlight
+        self._flight_by_key = {}  # cache_key -> AIFlight
+        self._requests = {}  # request_id -> AIRequest, while it waits
+
+    def get_backend(self):
+        return self.backend or get_ai_backend()
+
+    def get_cache(self):
+        return self.cache if self.cache is not None else get_ai_cache()
+
+    def cache_key(self, choice, text):
+        return AIResponseCache.make_key(self.get_backend().model, choice, text)
+
+    def open(self, prompt, timeout=None, cache_key=None, stream=False):
+        # Starts a request. It is answered from the cache (from_cache), joins the flight
+        # already asking the same question (coalesced), or gets a new flight that the
+        # caller has to run(). For streams the timeout is an idle timeout.
+        request = AIRequest(next(self._ids), prompt, cache_key)
+        if cache_key is not None:
+            answer = self.get_cache().get(cache_key)
+            if answer is not None:
+                request.answer = answer
+                request.from_cache = True
+                request.done = True
+                return request
+        with self._lock:
+            flight = self._flight_by_key.get(cache_key) if cache_key is not None else None
+            if flight is not None:
+                request.coalesced = True
+                self.coalesced_count += 1
+            else:
+                timeout = self.timeout if timeout is None else timeout
+                flight = AIFlight(request.request_id, prompt, timeout, cache_key, stream)
+                self._flights[flight.flight_id] = flight
+                if cache_key is not None:
+                    self._flight_by_key[cache_key] = flight
+            request.flight = flight
+            flight.requests.append(request)
+            self._requests[request.request_id] = request
+        return request
+
+    def run(self, flight, on_token=None, on_retry=None):
+        # Makes the flight's backend call and returns the answer, or None once the flight
+        # is cancelled. on_token(chunk) follows every streamed chunk and on_retry(retry,
+        # delay) every rate-limit back-off. Errors are raised to the caller.
+        backend = self.get_backend()
+
+        def attempt():
+            if not flight.stream:
+                return backend.complete(flight.prompt, flight.timeout)
+            try:
+                for chunk in backend.stream(flight.prompt, flight.timeout):
+                    if flight.cancel_event.is_set():
+                        break
+                    with self._lock:
+                        flight.parts.append(chunk)
+                    if on_token is not None:
+                        on_token(chunk)
+            except AIRateLimitError:
+                # Retrying after chunks went out would repeat text in the answer
+                if flight.parts:
+                    raise RuntimeError("The AI stream was interrupted by a rate limit.")
+                raise
+            return "".join(flight.parts)
+
+        def retrying(retry, delay):
+            with self._lock:
+                self.retry_count += 1
+            if on_retry is not None:
+                on_retry(retry, delay)
+
+        return call_with_retries(attempt, self.limiter, flight.cancel_event, retrying,
+                                 self.max_retries, self.backoff_base, self.backoff_cap)
+
+    def finish(self, flight, answer):
+        # Records the answer run() returned. Returns the requests to hand it to, or None
+        # if the flight had already ended (cancelled or timed out).
+        if flight.ended:
+            return None
+        if flight.cache_key is not None and answer:
+            self.get_cache().put(flight.cache_key, answer)
+        return self._end(flight, result=answer)
+
+    def fail(self, flight, error):
+        # Records the exception run() raised; returns the requests to tell, or None
+        return self._end(flight, error=error)
+
+    def expire(self, flight):
+        # Gives up on a flight that outlived its timeout; returns the requests to tell, or None
+        return self._end(flight, error=TimeoutError(f"The AI did not answer within {flight.timeout:g} seconds."))
+
+    def cancel(self, request_id):
+        # Withdraws a waiting request and returns it, or None if it was not waiting. The
+        # last request to leave a flight ends it and sets its cancel_event.
+        with self._lock:
+            request = self._requests.pop(request_id, None)
+            if request is None:
+                return None
+            request.done = True
+            flight = request.flight
+            flight.requests.remove(request)
+            if not flight.requests:
+                self._end(flight)
+            return request
+
+    def missing_text(self, request):
+        # The streamed text the request has not been handed yet, from where it last
+        # left off; a request that joined mid-stream gets everything sent before it
+        with self._lock:
+            parts = request.flight.parts
+            if request.parts_seen >= len(parts):
+                return ""
+            text = "".join(parts[request.parts_seen:])
+            request.parts_seen = len(parts)
+        if request.first_token_at is None:
+            request.first_token_at = time.perf_counter()
+        return text
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._requests)
+
+    def stats(self):
+        stats = self.limiter.stats()
+        with self._lock:
+            stats.update({
+                "in_flight": len(self._requests),
+                "backend_calls_in_flight": len(self._flights),
+                "coalesced": self.coalesced_count,
+                "retries": self.retry_count,
+            })
+        return stats
+
+    def ask(self, choice, text, timeout=None):
+        # Blocks until the answer is in and returns it, or raises what the backend call
+        # raised. The same question already running on another thread is waited for.
+        request = self.open(build_ai_prompt(choice, text), timeout, self.cache_key(choice, text))
+        if request.from_cache:
+            return request.answer
+        flight = request.flight
+        if not request.coalesced:
+            try:
+                self.finish(flight, self.run(flight))
+            except Exception as e:
+                self.fail(flight, e)
+        flight.done_event.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.result
+
+    def _end(self, flight, result=None, error=None):
+        with self._lock:
+            if flight.ended:
+                return None
+            flight.ended = True
+            flight.result = result
+            flight.error = error
+            # The backend call stops too, if it is still going
+            if result is None:
+                flight.cancel_event.set()
+            del self._flights[flight.flight_id]
+            if flight.cache_key is not None and self._flight_by_key.get(flight.cache_key) is flight:
+                del self._flight_by_key[flight.cache_key]
+            for request in flight.requests:
+                request.done = True
+                self._requests.pop(request.request_id, None)
+            requests = list(flight.requests)
+        flight.done_event.set()
+        return requests
@@ -0,0 +1,250 @@
+"""Grades: typed records stored column-wise per period.
+
+Aggregates run over NumPy views of the packed columns instead of re-parsing
+"Graded: 90/100" display strings. GradeRepository adds persistence and per-period
+change tracking on top of a GradeBook.
+"""
+import math
+import hashlib
+from array import array
+
+
+def load_numpy():
+    # NumPy is imported on first use; the role picker and login windows never need it
+    import numpy
+    return numpy
+
+
+GRADED = "graded"
+UNGRADED = "ungraded"
+
+class GradeRecord:
+    __slots__ = ("title", "score", "max_score", "status", "period")
+
+    def __init__(self, title, score=None, max_score=100.0, status=None, period=""):
+        self.title = title
+        self.score = score
+        self.max_score = max_score
+        self.status = status or (GRADED if score is not None else UNGRADED)
+        self.period = period
+
+    @property
+    def is_graded(self):
+        return self.status == GRADED and self.score is not None
+
+    def status_text(self):
+        if self.is_graded:
+            return f"Graded: {self.score:g}/{self.max_score:g}"
+        return "Ungraded"
+
+    def color(self):
+        return "green" if self.is_graded else "gray"
+
+
+class _GradeColumns:
+    __slots__ = ("titles", "scores", "max_scores", "statuses")
+
+    def __init__(self):
+        self.titles = []
+        # array('d') keeps scores as packed doubles; NaN marks an ungraded item
+        self.scores = array("d")
+        self.max_scores = array("d")
+        self.statuses = []
+
+
+class GradeBook:
+    def __init__(self, records=()):
+        self._periods = {}
+        for record in records:
+            self.add(record)
+
+    @classmethod
+    def from_seed(cls, seed):
+        # seed: {period: [(title, score or None), ...]}
+        return cls(GradeRecord(title, score, period=period)
+                   for period, items in seed.items() for title, score in items)
+
+    def add(self, record):
+        columns = self._periods.setdefault(record.period, _GradeColumns())
+        columns.titles.append(record.title)
+        columns.scores.append(record.score if record.is_graded else math.nan)
+        columns.max_scores.append(record.max_score)
+        columns.statuses.append(record.status)
+
+    def update(self, period, index, score, status=None):
+        columns = self._periods[period]
+        status = status or (GRADED if score is not None else UNGRADED)
+        columns.scores[index] = score if score is not None and status == GRADED else math.nan
+        columns.statuses[index] = status
+
+    def record(self, period, index):
+        columns = self._periods[period]
+        score = columns.scores[index]
+        return GradeRecord(columns.titles[index], None if math.isnan(score) else score,
+                           columns.max_scores[index], columns.statuses[index], period)
+
+    def count(self, period):
+        columns = self._periods.get(period)
+        return len(columns.titles) if columns else 0
+
+    def periods(self):
+        return list(self._periods)
+
+    def __len__(self):
+        return sum(len(c.titles) for c in self._periods.values())
+
+    def all_records(self):
+        return [record for period in self._periods for record in self.records(period)]
+
+    def titles(self, period):
+        return list(self._periods[period].titles)
+
+    def records(self, period, start=0, stop=None):
+        columns = self._periods[period]
+        rows = slice(start, stop)
+        return [
+            GradeRecord(title, None if math.isnan(score) else score, max_score, status, period)
+            for title, score, max_score, status in zip(columns.titles[rows], columns.scores[rows],
+                                                        columns.max_scores[rows], columns.statuses[rows])
+        ]
+
+    def percent_scores(self, period):
+        # Zero-copy NumPy views over the packed columns; ungraded items stay NaN
+        np = load_numpy()
+        columns = self._periods[period]
+        scores = np.frombuffer(columns.scores, dtype=np.float64)
+        max_scores = np.frombuffer(columns.max_scores, dtype=np.float64)
+        return scores / max_scores * 100.0
+
+    def fingerprint(self, period):
+        # Content hash of one period's columns; equal data gives equal fingerprints across runs
+        columns = self._periods[period]
+        digest = hashlib.sha256()
+        digest.update("\x1f".join(columns.titles).encode("utf-8"))
+        digest.update(columns.scores.tobytes())
+        digest.update(columns.max_scores.tobytes())
+        digest.update("\x1f".join(columns.statuses).encode("utf-8"))
+        return digest.hexdigest()[:16]
+
+    def summary(self, period):
+        np = load_numpy()
+        percents = self.percent_scores(period)
+        graded = ~np.isnan(percents)
+        graded_count = int(graded.sum())
+        if not graded_count:
+            return {"graded": 0, "ungraded": len(percents), "mean": None, "min": None, "max": None}
+        values = percents[graded]
+        return {
+            "graded": graded_count,
+            "ungraded": len(percents) - graded_count,
+            "mean": float(values.mean()),
+            "min": float(values.min()),
+            "max": float(values.max()),
+        }
+
+
+DEFAULT_GRADES = {
+    "This Week": [
+        ("Math Homework", 90),
+        ("Science Quiz", None),
+        ("English Essay", 88),
+        ("History Quiz", 82),
+        ("Biology Lab", None),
+        ("PE Fitness Test", 92),
+        ("Computer Assignment", 85)
+    ],
+    "Last Week": [
+        ("Math Project", 87),
+        ("Science Lab", None),
+        ("English Reading", 80),
+        ("History Report", 78),
+        ("Art Sketch", None),
+        ("Geography Quiz", 84),
+        ("Music Composition", 90)
+    ],
+    "Last Month": [
+        ("Math Exam", 75),
+        ("Science Fair", 93),
+        ("English Portfolio", None),
+        ("History Debate", 85),
+        ("Computer Lab", 80),
+        ("Art Exhibit", None),
+        ("Geography Map", 86)
+    ]
+}
+
+
+class GradeRepository:
+    # The one grade source: reads go to the GradeBook, writes also go to storage (if
+    # any), and every change bumps the period's version
+    def __init__(self, storage=None, seed=DEFAULT_GRADES):
+        self.storage = storage
+        self.book = GradeBook()
+        self._versions = {}
+        self._fingerprints = {}  # period -> (version, fingerprint)
+        rows = storage.grades() if storage is not None else []
+        if rows:
+            for period, _, title, score, max_score, status in rows:
+                self.book.add(GradeRecord(title, score, max_score, status, period))
+        else:
+            for record in GradeBook.from_seed(seed).all_records():
+                self._append(record)
+
+    def periods(self):
+        return self.book.periods()
+
+    def titles(self, period):
+        return self.book.titles(period)
+
+    def records(self, period, start=0, stop=None):
+        return self.book.records(period, start, stop)
+
+    def count(self, period):
+        return self.book.count(period)
+
+    def record(self, period, index):
+        return self.book.record(period, index)
+
+    def percent_scores(self, period):
+        return self.book.percent_scores(period)
+
+    def summary(self, period):
+        return self.book.summary(period)
+
+    def version(self, period):
+        # Bumped on every change to the period; lets views and caches skip unchanged data
+        return self._versions.get(period, 0)
+
+    def fingerprint(self, period):
+        # Like version(), but derived from the data so it stays valid after a restart;
+        # recomputed only when the version moves
+        version = self.version(period)
+        cached = self._fingerprints.get(period)
+        if cached is None or cached[0] != version:
+            cached = (version, self.book.fingerprint(period))
+            self._fingerprints[period] = cached
+        return cached[1]
+
+    def set_grade(self, period, index, score, status=None):
+        self.book.update(period, index, score, status)
+        record = self.book.record(period, index)
+        if self.storage is not None:
+            self.storage.update_grade(period, index, record.score, record.status)
+        self._bump(period)
+
+    def add_grade(self, record):
+        # Returns the new grade's index within its period
+        index = self._append(record)
+        self._bump(record.period)
+        return index
+
+    def _append(self, record):
+        index = self.book.count(record.period)
+        self.book.add(record)
+        if self.storage is not None:
+            self.storage.insert_grades([(record.period, index, record.title, record.score,
+                                         record.max_score, record.status)])
+        return index
+
+    def _bump(self, period):
+        self._versions[period] = self._versions.get(period, 0) + 1
@@ -0,0 +1,59 @@
+"""Token bucket rate limiter shared by all AI workers, with wait metrics."""
+import time
+import threading
+
+AI_REQUESTS_PER_MINUTE = 60
+AI_BURST = 5
+
+class TokenBucket:
+    def __init__(self, rate=AI_REQUESTS_PER_MINUTE / 60.0, capacity=AI_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.admitted = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self, cancel_event=None):
+        # Blocks until a token is available; returns False if cancelled while queued
+        started = time.monotonic()
+        with self._cond:
+            self.waiting += 1
+            self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                while True:
+                    if cancel_event is not None and cancel_event.is_set():
+                        return False
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        break
+                    needed = (1 - self.tokens) / self.rate
+                    # Short slices so cancellation is noticed promptly
+                    self._cond.wait(min(needed, 0.1))
+            finally:
+                self.waiting -= 1
+            waited = time.monotonic() - started
+            self.admitted += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            return True
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def stats(self):
+        with self._cond:
+            return {
+                "queue_depth": self.waiting,
+                "max_queue_depth": self.max_waiting,
+                "admitted": self.admitted,
+                "avg_wait": self.total_wait / self.admitted if self.admitted else 0.0,
+                "max_wait": self.max_wait,
+            }
@@ -0,0 +1,583 @@
+"""SQLite storage for EduCloud: notes, assignment submissions, tasks and grades.
+
+Submitted files themselves live in a content-addressed blob directory (BlobStore).
+Submissions move between installations as tar archives (export_submissions /
+import_submissions).
+"""
+import io
+import os
+import re
+import json
+import math
+import time
+import shutil
+import sqlite3
+import hashlib
+import tarfile
+import tempfile
+import threading
+
+DB_FILE = "educloud.db"
+BLOB_DIR = "submission_blobs"
+SCHEMA_VERSION = 3
+
+SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    )
+    """,
+    # subject = '' holds notes migrated from notes.json, which had no subject in the key
+    """
+    CREATE TABLE IF NOT EXISTS notes (
+        subject TEXT NOT NULL,
+        section TEXT NOT NULL,
+        item TEXT NOT NULL,
+        body TEXT NOT NULL,
+        updated_at REAL NOT NULL,
+        PRIMARY KEY (subject, section, item)
+    ) WITHOUT ROWID
+    """,
+    # file_path is where the student picked the file; blob is the SHA-256 of the stored
+    # copy (NULL for submissions recorded before the blob store). student = '' until the
+    # student who made them signs in on this installation.
+    """
+    CREATE TABLE IF NOT EXISTS submissions (
+        subject TEXT NOT NULL,
+        item TEXT NOT NULL,
+        student TEXT NOT NULL DEFAULT '',
+        file_path TEXT NOT NULL,
+        submitted_at REAL NOT NULL,
+        blob TEXT,
+        file_name TEXT,
+        size INTEGER,
+        PRIMARY KEY (subject, item, student)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS submissions_blob ON submissions (blob)",
+    """
+    CREATE TABLE IF NOT EXISTS tasks (
+        id INTEGER PRIMARY KEY,
+        due_date TEXT NOT NULL,
+        title TEXT NOT NULL,
+        done INTEGER NOT NULL DEFAULT 0,
+        created_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS tasks_due_date ON tasks (due_date)",
+    """
+    CREATE TABLE IF NOT EXISTS grades (
+        id INTEGER PRIMARY KEY,
+        period TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        score REAL,
+        max_score REAL NOT NULL DEFAULT 100,
+        status TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS grades_period ON grades (period, position)",
+]
+
+# Statements that bring a database at version n - 1 up to version n
+MIGRATIONS = {
+    2: [
+        "ALTER TABLE submissions ADD COLUMN blob TEXT",
+        "ALTER TABLE submissions ADD COLUMN file_name TEXT",
+        "ALTER TABLE submissions ADD COLUMN size INTEGER",
+        "CREATE INDEX IF NOT EXISTS submissions_blob ON submissions (blob)",
+    ],
+    # The student joins the primary key, which SQLite can only change by rebuilding
+    3: [
+        """
+        CREATE TABLE submissions_v3 (
+            subject TEXT NOT NULL,
+            item TEXT NOT NULL,
+            student TEXT NOT NULL DEFAULT '',
+            file_path TEXT NOT NULL,
+            submitted_at REAL NOT NULL,
+            blob TEXT,
+            file_name TEXT,
+            size INTEGER,
+            PRIMARY KEY (subject, item, student)
+        ) WITHOUT ROWID
+        """,
+        """
+        INSERT INTO submissions_v3 (subject, item, file_path, submitted_at, blob, file_name, size)
+        SELECT subject, item, file_path, submitted_at, blob, file_name, size FROM submissions
+        """,
+        "DROP TABLE submissions",
+        "ALTER TABLE submissions_v3 RENAME TO submissions",
+        "CREATE INDEX IF NOT EXISTS submissions_blob ON submissions (blob)",
+    ],
+}
+
+# Statements are constant strings so sqlite3's statement cache reuses the prepared form
+SQL_NOTES_FOR_SUBJECT = "SELECT section, item, body FROM notes WHERE subject IN ('', ?) ORDER BY subject"
+SQL_GET_NOTE = "SELECT body FROM notes WHERE subject IN ('', ?) AND section = ? AND item = ? ORDER BY subject DESC LIMIT 1"
+SQL_UPSERT_NOTE = """
+    INSERT INTO notes (subject, section, item, body, updated_at) VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (subject, section, item) DO UPDATE SET body = excluded.body, updated_at = excluded.updated_at
+"""
+SQL_SUBMISSIONS_FOR_SUBJECT = "SELECT item, file_path FROM submissions WHERE subject = ? AND student = ?"
+SQL_GET_SUBMISSION = "SELECT file_path FROM submissions WHERE subject = ? AND item = ? AND student = ?"
+SQL_GET_SUBMISSION_BLOB = "SELECT blob, file_name, size FROM submissions WHERE subject = ? AND item = ? AND student = ?"
+SQL_UPSERT_SUBMISSION = """
+    INSERT INTO submissions (subject, item, student, file_path, submitted_at, blob, file_name, size)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (subject, item, student) DO UPDATE SET file_path = excluded.file_path,
+        submitted_at = excluded.submitted_at, blob = excluded.blob, file_name = excluded.file_name,
+        size = excluded.size
+"""
+SQL_BLOB_REFERENCES = "SELECT COUNT(*) FROM submissions WHERE blob = ?"
+SQL_DELETE_SUBMISSION = "DELETE FROM submissions WHERE subject = ? AND item = ? AND student = ?"
+SQL_CLAIM_SUBMISSIONS = "UPDATE OR IGNORE submissions SET student = ? WHERE student = ''"
+SQL_EXPORT_SUBMISSIONS = """
+    SELECT subject, item, student, file_path, submitted_at, blob, file_name, size FROM submissions
+    WHERE (?1 IS NULL OR subject = ?1) AND (?2 IS NULL OR item = ?2) ORDER BY subject, item, student
+"""
+SQL_ALL_TASKS = "SELECT id, due_date, title, done FROM tasks ORDER BY due_date, id"
+SQL_INSERT_TASK = "INSERT INTO tasks (due_date, title, done, created_at) VALUES (?, ?, ?, ?)"
+SQL_ALL_GRADES = "SELECT period, position, title, score, max_score, status FROM grades ORDER BY id"
+SQL_INSERT_GRADE = """
+    INSERT INTO grades (period, position, title, score, max_score, status) VALUES (?, ?, ?, ?, ?, ?)
+"""
+SQL_UPDATE_GRADE = "UPDATE grades SET score = ?, status = ? WHERE period = ? AND position = ?"
+
+
+class Storage:
+    def __init__(self, path=DB_FILE):
+        self.path = path
+        # One connection shared by the GUI thread and the note writer thread, guarded by a lock
+        self._db = sqlite3.connect(path, check_same_thread=False, cached_statements=128)
+        self._lock = threading.RLock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("PRAGMA foreign_keys=ON")
+            self._create_schema()
+
+    def _create_schema(self):
+        version = self._db.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+        with self._db:
+            if version == 0:
+                for statement in SCHEMA:
+                    self._db.execute(statement)
+            else:
+                for step in range(version + 1, SCHEMA_VERSION + 1):
+                    for statement in MIGRATIONS[step]:
+                        self._db.execute(statement)
+            self._db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    # ---- meta
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    def set_meta(self, key, value):
+        with self._lock, self._db:
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    # ---- notes
+
+    def notes_for_subject(self, subject):
+        # Subject-specific notes come last in the query so they override legacy ones
+        with self._lock:
+            rows = self._db.execute(SQL_NOTES_FOR_SUBJECT, (subject,)).fetchall()
+        return {(section, item): body for section, item, body in rows}
+
+    def get_note(self, subject, section, item):
+        with self._lock:
+            row = self._db.execute(SQL_GET_NOTE, (subject, section, item)).fetchone()
+        return row[0] if row else ""
+
+    def save_notes(self, changes):
+        # changes: {(subject, section, item): body}, written in one transaction
+        now = time.time()
+        rows = [(subject, section, item, body, now) for (subject, section, item), body in changes.items()]
+        with self._lock, self._db:
+            self._db.executemany(SQL_UPSERT_NOTE, rows)
+
+    def save_note(self, subject, section, item, body):
+        self.save_notes({(subject, section, item): body})
+
+    # ---- submissions
+
+    def submissions_for_subject(self, subject, student=""):
+        with self._lock:
+            rows = self._db.execute(SQL_SUBMISSIONS_FOR_SUBJECT, (subject, student)).fetchall()
+        return dict(rows)
+
+    def get_submission(self, subject, item, student=""):
+        with self._lock:
+            row = self._db.execute(SQL_GET_SUBMISSION, (subject, item, student)).fetchone()
+        return row[0] if row else None
+
+    def get_submission_blob(self, subject, item, student=""):
+        # (blob, file_name, size), or None when nothing is submitted
+        with self._lock:
+            return self._db.execute(SQL_GET_SUBMISSION_BLOB, (subject, item, student)).fetchone()
+
+    def set_submission(self, subject, item, file_path, blob=None, file_name=None, size=None, student=""):
+        # Returns the blob this submission replaced, if any
+        with self._lock, self._db:
+            row = self._db.execute(SQL_GET_SUBMISSION_BLOB, (subject, item, student)).fetchone()
+            self._db.execute(SQL_UPSERT_SUBMISSION,
+                             (subject, item, student, file_path, time.time(), blob, file_name, size))
+        return row[0] if row else None
+
+    def delete_submission(self, subject, item, student=""):
+        # Returns the blob the submission pointed at, if any
+        with self._lock, self._db:
+            row = self._db.execute(SQL_GET_SUBMISSION_BLOB, (subject, item, student)).fetchone()
+            self._db.execute(SQL_DELETE_SUBMISSION, (subject, item, student))
+        return row[0] if row else None
+
+    def blob_references(self, blob):
+        with self._lock:
+            return self._db.execute(SQL_BLOB_REFERENCES, (blob,)).fetchone()[0]
+
+    def claim_submissions(self, student):
+        # Submissions made before students were recorded belong to whoever signs in first
+        with self._lock, self._db:
+            return self._db.execute(SQL_CLAIM_SUBMISSIONS, (student,)).rowcount
+
+    def export_rows(self, subject=None, item=None):
+        # (subject, item, student, file_path, submitted_at, blob, file_name, size) rows;
+        # None matches every subject or item
+        with self._lock:
+            return self._db.execute(SQL_EXPORT_SUBMISSIONS, (subject, item)).fetchall()
+
+    def upsert_submissions(self, rows):
+        # rows as from export_rows, written in one transaction; returns the blobs they replaced
+        replaced = set()
+        with self._lock, self._db:
+            for row in rows:
+                old = self._db.execute(SQL_GET_SUBMISSION_BLOB, row[:3]).fetchone()
+                if old and old[0] and old[0] != row[5]:
+                    replaced.add(old[0])
+                self._db.execute(SQL_UPSERT_SUBMISSION, row)
+        return replaced
+
+    # ---- tasks
+
+    def tasks(self):
+        # Rows of (id, due_date, title, done) ordered by due date; due_date is ISO "YYYY-MM-DD"
+        with self._lock:
+            return self._db.execute(SQL_ALL_TASKS).fetchall()
+
+    def add_task(self, due_date, title, done=False):
+        with self._lock, self._db:
+            return self._db.execute(SQL_INSERT_TASK, (due_date, title, int(done), time.time())).lastrowid
+
+    def insert_tasks(self, rows):
+        # rows: (due_date, title, done); returns the new ids in order
+        now = time.time()
+        with self._lock, self._db:
+            return [self._db.execute(SQL_INSERT_TASK, (due_date, title, int(done), now)).lastrowid
+                    for due_date, title, done in rows]
+
+    # ---- grades
+
+    def grades(self):
+        # Rows of (period, position, title, score, max_score, status) in insertion order
+        with self._lock:
+            return self._db.execute(SQL_ALL_GRADES).fetchall()
+
+    def insert_grades(self, rows):
+        with self._lock, self._db:
+            self._db.executemany(SQL_INSERT_GRADE, rows)
+
+    def update_grade(self, period, position, score, status):
+        with self._lock, self._db:
+            self._db.execute(SQL_UPDATE_GRADE, (score, status, period, position))
+
+    # ---- migration
+
+    def migrate_json(self, notes_path, assignments_path):
+        # One-time import of notes.json (+ its journal) and assignment_submissions.json
+        if self.get_meta("json_migrated"):
+            return False
+        notes = _load_json_dict(notes_path)
+        journal_path = notes_path + ".journal"
+        if os.path.exists(journal_path):
+            with open(journal_path, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        notes[entry["key"]] = entry["text"]
+                    except (ValueError, KeyError, TypeError):
+                        # Torn last line from a crash mid-append
+                        break
+        submissions = _load_json_dict(assignments_path)
+
+        now = time.time()
+        note_rows = []
+        for key, body in notes.items():
+            section, _, item = key.partition("::")
+            note_rows.append(("", section, item, body, now))
+        submission_rows = []
+        for key, file_path in submissions.items():
+            subject, _, item = key.partition("::")
+            submission_rows.append((subject, item, "", file_path, now, None, None, None))
+
+        with self._lock, self._db:
+            self._db.executemany(SQL_UPSERT_NOTE, note_rows)
+            self._db.executemany(SQL_UPSERT_SUBMISSION, submission_rows)
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                             (str(now),))
+        return True
+
+
+class BlobStore:
+    # Files named by the SHA-256 of their bytes, fanned out over 256 directories. The
+    # same file submitted twice is stored once. Sources are streamed through a reused
+    # buffer, so a large file is never held in memory.
+    CHUNK_SIZE = 1 << 20
+    DIGEST = re.compile(r"[0-9a-f]{64}")
+
+    def __init__(self, root=BLOB_DIR):
+        self.root = root
+
+    @classmethod
+    def is_digest(cls, value):
+        return isinstance(value, str) and cls.DIGEST.fullmatch(value) is not None
+
+    def path(self, digest):
+        # Anything but a digest could name a file outside the store
+        if not self.is_digest(digest):
+            raise ValueError(f"not a blob digest: {digest!r}")
+        return os.path.join(self.root, digest[:2], digest[2:])
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def ingest(self, source_path, progress=None):
+        # Copies source_path in and returns (digest, size); progress(done, total) after each chunk
+        with open(source_path, "rb") as source:
+            return self.ingest_stream(source, os.fstat(source.fileno()).st_size, progress)
+
+    def ingest_stream(self, source, total, progress=None, expected=None):
+        # Same for an open binary stream of total bytes. With expected set, a copy whose
+        # digest differs is discarded and ValueError raised.
+        os.makedirs(self.root, exist_ok=True)
+        fd, part_path = tempfile.mkstemp(suffix=".part", dir=self.root)
+        digest = hashlib.sha256()
+        buffer = bytearray(self.CHUNK_SIZE)
+        view = memoryview(buffer)
+        done = 0
+        try:
+            with os.fdopen(fd, "wb") as target:
+                while True:
+                    count = source.readinto(buffer)
+                    if not count:
+                        break
+                    digest.update(view[:count])
+                    target.write(view[:count])
+                    done += count
+                    if progress is not None:
+                        progress(done, total)
+            name = digest.hexdigest()
+            if expected is not None and name != expected:
+                raise ValueError(f"content does not match its digest {expected}")
+            final_path = self.path(name)
+            if os.path.exists(final_path):
+                os.remove(part_path)
+            else:
+                os.makedirs(os.path.dirname(final_path), exist_ok=True)
+                os.replace(part_path, final_path)
+        except BaseException:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            raise
+        return name, done
+
+    def remove(self, digest):
+        try:
+            os.remove(self.path(digest))
+        except FileNotFoundError:
+            pass
+
+    def export(self, digest, file_name, directory):
+        # A copy under its original name for apps that go by extension. Not a hard link:
+        # an app saving over it would change the stored blob.
+        target_dir = os.path.join(directory, digest[:16])
+        target = os.path.join(target_dir, os.path.basename(file_name))
+        if not os.path.exists(target):
+            os.makedirs(target_dir, exist_ok=True)
+            shutil.copyfile(self.path(digest), target)
+        return target
+
+
+# ---- archives
+
+ARCHIVE_FORMAT = "educloud-submissions"
+ARCHIVE_VERSION = 1
+MANIFEST_NAME = "manifest.jsonl"
+MANIFEST_FIELDS = ("subject", "item", "student", "submitted_at", "file_name", "size", "member")
+MANIFEST_TEXT_FIELDS = ("subject", "item", "student", "file_name", "member")
+
+
+def export_submissions(storage, blobs, path, subject=None, item=None, progress=None):
+    # Writes the submissions for subject / item (None for all) to a tar at path and
+    # returns (exported, skipped). manifest.jsonl comes first: a header line, then one
+    # line per submission. Each file follows once, as blobs/<digest> (or files/<n> for
+    # submissions older than the blob store), streamed from disk rather than read whole.
+    sources = {}  # path on disk -> member name
+    entries = []
+    skipped = 0
+    for row_subject, row_item, student, file_path, submitted_at, blob, file_name, size in storage.export_rows(subject, item):
+        source = blobs.path(blob) if blob else file_path
+        if not os.path.isfile(source):
+            skipped += 1
+            continue
+        member = sources.setdefault(source, f"blobs/{blob}" if blob else f"files/{len(sources)}")
+        entries.append({
+            "subject": row_subject, "item": row_item, "student": student, "submitted_at": submitted_at,
+            "file_name": file_name or os.path.basename(file_path),
+            "size": size if size is not None else os.path.getsize(source),
+            "blob": blob, "member": member,
+        })
+    header = {"format": ARCHIVE_FORMAT, "version": ARCHIVE_VERSION, "exported_at": time.time(),
+              "subject": subject, "item": item, "count": len(entries)}
+    manifest = "".join(json.dumps(line) + "\n" for line in [header] + entries).encode("utf-8")
+
+    total = sum(os.path.getsize(source) for source in sources)
+    done = 0
+    part_path = path + ".part"
+    try:
+        with tarfile.open(part_path, "w|") as tar:
+            tar.addfile(_tar_entry(MANIFEST_NAME, len(manifest)), io.BytesIO(manifest))
+            for source, member in sources.items():
+                with open(source, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    tar.addfile(_tar_entry(member, size), f)
+                done += size
+                if progress is not None:
+                    progress(done, total)
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return len(entries), skipped
+
+
+def import_submissions(storage, blobs, path, progress=None):
+    # Reads an archive from export_submissions in one pass and returns (imported,
+    # skipped). Files are checked against their digest as they are copied into the blob
+    # store, and ones it already holds are not copied again. Submissions already here
+    # for the same student and assignment are replaced.
+    total = os.path.getsize(path)
+    stored = {}  # member name -> digest
+    added = []
+    try:
+        with open(path, "rb") as f, tarfile.open(fileobj=f, mode="r|") as tar:
+            first = tar.next()
+            if first is None or first.name != MANIFEST_NAME or not first.isfile():
+                raise ValueError("not a submissions archive")
+            entries = _read_manifest(tar.extractfile(first))
+            expected = {entry["member"]: entry.get("blob") for entry in entries}
+            report = (lambda done, size: progress(f.tell(), total)) if progress is not None else None
+            for member in tar:
+                if member.name not in expected or member.name in stored or not member.isfile():
+                    continue
+                digest = expected[member.name]
+                if digest and blobs.exists(digest):
+                    stored[member.name] = digest
+                    continue
+                stored[member.name], _ = blobs.ingest_stream(tar.extractfile(member), member.size,
+                                                             report, expected=digest)
+                added.append(stored[member.name])
+    except BaseException as e:
+        _remove_unreferenced(storage, blobs, added)
+        if isinstance(e, tarfile.TarError):
+            raise ValueError(f"not a readable archive: {e}") from e
+        raise
+
+    rows = []
+    for entry in entries:
+        digest = stored.get(entry["member"])
+        if digest is None and entry.get("blob") and blobs.exists(entry["blob"]):
+            digest = entry["blob"]
+        if digest is None:
+            continue
+        rows.append((entry["subject"], entry["item"], entry["student"], entry["file_name"],
+                     entry["submitted_at"], digest, entry["file_name"], entry["size"]))
+    try:
+        replaced = storage.upsert_submissions(rows)
+    except BaseException:
+        _remove_unreferenced(storage, blobs, added)
+        raise
+    _remove_unreferenced(storage, blobs, replaced)
+    return len(rows), len(entries) - len(rows)
+
+
+def _tar_entry(name, size):
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    return info
+
+
+def _read_manifest(stream):
+    # The manifest is metadata only, small enough to read whole even for thousands of rows
+    # (bad UTF-8 and bad JSON raise ValueError subclasses too)
+    lines = stream.read().decode("utf-8").splitlines()
+    header = json.loads(lines[0]) if lines else {}
+    if not isinstance(header, dict) or header.get("format") != ARCHIVE_FORMAT:
+        raise ValueError("not a submissions archive")
+    version = header.get("version", 0)
+    if not _is_count(version):
+        raise ValueError("the archive's manifest is damaged")
+    if version > ARCHIVE_VERSION:
+        raise ValueError("the archive was made by a newer version of EduCloud")
+    entries = [json.loads(line) for line in lines[1:] if line]
+    for entry in entries:
+        if not _is_manifest_entry(entry):
+            raise ValueError("the archive's manifest is damaged")
+    return entries
+
+
+def _is_manifest_entry(entry):
+    # Every value ends up in the database or, for blob, in a path; check them all here
+    if not isinstance(entry, dict) or any(field not in entry for field in MANIFEST_FIELDS):
+        return False
+    if not all(isinstance(entry[field], str) for field in MANIFEST_TEXT_FIELDS) or not entry["member"]:
+        return False
+    submitted_at = entry["submitted_at"]
+    if isinstance(submitted_at, bool) or not isinstance(submitted_at, (int, float)) or not math.isfinite(submitted_at):
+        return False
+    blob = entry.get("blob")
+    return _is_count(entry["size"]) and (blob is None or BlobStore.is_digest(blob))
+
+
+def _is_count(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 0
+
+
+def _remove_unreferenced(storage, blobs, digests):
+    for digest in digests:
+        if not storage.blob_references(digest):
+            blobs.remove(digest)
+
+
+def _load_json_dict(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
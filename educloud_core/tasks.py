@@ -0,0 +1,86 @@
+"""Tasks: to-dos stored in the tasks table and held in memory sorted by due date.
+
+"What is due on a day" or "in the next N days" is two bisects over the keys.
+"""
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+
+
+class TaskRecord:
+    __slots__ = ("id", "due", "title", "done")
+
+    def __init__(self, id, due, title, done=False):
+        self.id = id
+        self.due = due
+        self.title = title
+        self.done = done
+
+    def due_text(self):
+        return f"{self.due:%B} {self.due.day}"
+
+
+# (days from the first run, title)
+DEFAULT_TASKS = [
+    (0, "Math Quiz - 10:00 AM"),
+    (0, "Science Lab - 2:00 PM"),
+    (3, "Essay Due"),
+    (5, "History Exam"),
+]
+
+
+class TaskRepository:
+    def __init__(self, storage=None, seed=DEFAULT_TASKS):
+        self.storage = storage
+        self._keys = []  # (ISO due date, id), sorted; ISO strings sort like the dates
+        self._tasks = []  # TaskRecord, in the same order
+        rows = storage.tasks() if storage is not None else []
+        if not rows and seed:
+            today = date.today()
+            for days, title in seed:
+                self.add(today + timedelta(days=days), title)
+            return
+        for id, due, title, done in rows:
+            self._keys.append((due, id))
+            self._tasks.append(TaskRecord(id, date.fromisoformat(due), title, bool(done)))
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def span(self, start, stop):
+        # Positions of the tasks due in [start, stop)
+        return (bisect_left(self._keys, (start.isoformat(),)),
+                bisect_left(self._keys, (stop.isoformat(),)))
+
+    def count(self, start, stop):
+        lo, hi = self.span(start, stop)
+        return hi - lo
+
+    def tasks(self, start, stop, first=0, last=None):
+        # Tasks due in [start, stop), optionally only rows first..last of that range
+        lo, hi = self.span(start, stop)
+        return self._tasks[lo + first:hi if last is None else min(hi, lo + last)]
+
+    def record(self, position):
+        return self._tasks[position]
+
+    def due_dates(self, start, stop):
+        # Days in [start, stop) with at least one task; one bisect per such day
+        lo, hi = self.span(start, stop)
+        days = set()
+        while lo < hi:
+            day = self._tasks[lo].due
+            days.add(day)
+            lo = bisect_left(self._keys, ((day + timedelta(days=1)).isoformat(),), lo, hi)
+        return days
+
+    def add(self, due, title):
+        # Returns the new task's position in due-date order
+        if self.storage is not None:
+            id = self.storage.add_task(due.isoformat(), title)
+        else:
+            id = len(self._tasks) + 1
+        key = (due.isoformat(), id)
+        position = bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._tasks.insert(position, TaskRecord(id, due, title))
+        return position
@@ -0,0 +1,294 @@
+"""Tests for AIRequestEngine, the Qt side of Ask AI; they run offscreen against local backends."""
+import time
+import threading
+
+import pytest
+
+from educloud_core import AIBackend, StubAIBackend, AIResponseCache, TokenBucket
+
+
+class HangingBackend(AIBackend):
+    # Answers only once `release` is set, whatever timeout it is given
+    model = "hanging"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.calls = 0
+
+    def complete(self, prompt, timeout=None):
+        self.calls += 1
+        self.release.wait(5)
+        return f"late answer to {prompt}"
+
+
+class Recorder:
+    # Everything one reply emitted, in order
+    def __init__(self, reply):
+        self.reply = reply
+        self.events = []
+        reply.token.connect(lambda text: self.events.append(("token", text)))
+        reply.finished.connect(lambda text: self.events.append(("finished", text)))
+        reply.failed.connect(lambda message: self.events.append(("failed", message)))
+        reply.cancelled.connect(lambda: self.events.append(("cancelled", None)))
+
+    def text(self):
+        return "".join(text for kind, text in self.events if kind == "token")
+
+    def outcome(self):
+        return next((event for event in self.events if event[0] != "token"), None)
+
+
+def wait_until(qapp, condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out waiting"
+        qapp.processEvents()
+        time.sleep(0.002)
+
+
+@pytest.fixture
+def make_engine(qapp):
+    from Educloud import AIRequestEngine
+    engines, hanging = [], []
+
+    def make(backend, **kwargs):
+        if isinstance(backend, HangingBackend):
+            hanging.append(backend)
+        kwargs.setdefault("cache", AIResponseCache(path=None))
+        kwargs.setdefault("limiter", TokenBucket(rate=1000.0, capacity=100))
+        engines.append(AIRequestEngine(backend, **kwargs))
+        return engines[-1]
+
+    yield make
+    for backend in hanging:
+        backend.release.set()
+    for engine in engines:
+        engine.cancel_all()
+        engine.wait_for_done()
+    qapp.processEvents()
+
+
+# ---- cancelling and timeouts
+
+def test_cancelling_a_queued_request_means_it_never_runs(qapp, make_engine):
+    backend = HangingBackend()
+    engine = make_engine(backend, max_workers=1)
+    running = Recorder(engine.submit("first"))
+    queued = Recorder(engine.submit("second"))
+    wait_until(qapp, lambda: backend.calls == 1)
+
+    queued.reply.cancel()
+    assert queued.events == [("cancelled", None)]
+    assert engine.in_flight() == 1
+    backend.release.set()
+    wait_until(qapp, lambda: running.outcome() is not None)
+    engine.wait_for_done()
+    qapp.processEvents()
+    assert running.outcome() == ("finished", "late answer to first")
+    assert backend.calls == 1
+    assert queued.events == [("cancelled", None)]
+
+
+def test_cancelling_a_running_request_drops_its_answer(qapp, make_engine):
+    backend = HangingBackend()
+    engine = make_engine(backend)
+    recorder = Recorder(engine.submit("question"))
+    wait_until(qapp, lambda: backend.calls == 1)
+
+    recorder.reply.cancel()
+    assert recorder.reply.done
+    assert engine.in_flight() == 0
+    backend.release.set()
+    engine.wait_for_done()
+    qapp.processEvents()
+    assert recorder.events == [("cancelled", None)]
+    # A second cancel is a no-op
+    assert not engine.cancel(recorder.reply.request_id)
+
+
+def test_cancelling_after_the_worker_finished_but_before_its_signal_arrives(qapp, make_engine):
+    engine = make_engine(StubAIBackend(delay=0, reply="an answer"))
+    recorder = Recorder(engine.submit("question"))
+    # The worker is done and its finished signal is queued, not yet delivered
+    engine.wait_for_done()
+    recorder.reply.cancel()
+    qapp.processEvents()
+    assert recorder.events == [("cancelled", None)]
+    assert engine.in_flight() == 0
+
+
+def test_a_request_that_does_not_answer_in_time_fails(qapp, make_engine):
+    backend = HangingBackend()
+    engine = make_engine(backend, timeout=0.05)
+    recorder = Recorder(engine.submit("question"))
+    wait_until(qapp, lambda: recorder.outcome() is not None)
+    assert recorder.outcome() == ("failed", "The AI did not answer within 0.05 seconds.")
+    assert engine.in_flight() == 0
+    # The answer that turns up afterwards goes nowhere
+    backend.release.set()
+    engine.wait_for_done()
+    qapp.processEvents()
+    assert recorder.events == [("failed", "The AI did not answer within 0.05 seconds.")]
+
+
+def test_a_queued_request_can_time_out_without_running(qapp, make_engine):
+    backend = HangingBackend()
+    engine = make_engine(backend, max_workers=1)
+    running = Recorder(engine.submit("first", timeout=0))
+    queued = Recorder(engine.submit("second", timeout=0.05))
+    wait_until(qapp, lambda: queued.outcome() is not None)
+    assert queued.outcome()[0] == "failed"
+    backend.release.set()
+    wait_until(qapp, lambda: running.outcome() is not None)
+    engine.wait_for_done()
+    assert running.outcome() == ("finished", "late answer to first")
+    assert backend.calls == 1
+
+
+# ---- streaming
+
+def test_a_stream_from_a_fake_generator_arrives_as_it_is_produced(qapp, make_engine):
+    more = threading.Event()
+
+    def fake_model(prompt):
+        yield "Plants "
+        more.wait(5)
+        yield "make "
+        yield "sugar."
+
+    engine = make_engine(StubAIBackend(token_delay=0, stream_source=fake_model))
+    recorder = Recorder(engine.submit_stream("Explain photosynthesis"))
+    wait_until(qapp, lambda: recorder.events)
+    # The first word is on screen while the model is still working
+    assert recorder.events == [("token", "Plants ")]
+    assert 0 <= recorder.reply.first_token_latency() < 5
+    more.set()
+    wait_until(qapp, lambda: recorder.outcome() is not None)
+    assert recorder.text() == "Plants make sugar."
+    assert recorder.outcome() == ("finished", "Plants make sugar.")
+
+
+def test_a_stream_that_goes_quiet_times_out(qapp, make_engine):
+    stop = threading.Event()
+
+    def fake_model(prompt):
+        yield "Plants "
+        stop.wait(5)
+        yield "make sugar."
+
+    engine = make_engine(StubAIBackend(token_delay=0, stream_source=fake_model))
+    recorder = Recorder(engine.submit_stream("Explain photosynthesis", timeout=0.1))
+    wait_until(qapp, lambda: recorder.outcome() is not None)
+    stop.set()
+    assert recorder.events == [("token", "Plants "),
+                               ("failed", "The AI did not answer within 0.1 seconds.")]
+
+
+# ---- coalescing and rate limiting
+
+class GatedModel:
+    # A fake streaming model that sends its first word, then waits for `go`
+    def __init__(self, words=("Water ", "moves ", "across.")):
+        self.words = words
+        self.go = threading.Event()
+
+    def __call__(self, prompt):
+        yield self.words[0]
+        self.go.wait(5)
+        yield from self.words[1:]
+
+
+def test_identical_questions_share_one_backend_call(qapp, make_engine):
+    model = GatedModel()
+    backend = StubAIBackend(token_delay=0, stream_source=model)
+    engine = make_engine(backend)
+    first = Recorder(engine.ask("Explain", "osmosis"))
+    second = Recorder(engine.ask("Explain", "  osmosis "))
+    assert second.reply.coalesced and not first.reply.coalesced
+    assert engine.in_flight() == 2
+    model.go.set()
+    wait_until(qapp, lambda: first.outcome() and second.outcome())
+    for recorder in (first, second):
+        assert recorder.text() == "Water moves across."
+        assert recorder.outcome() == ("finished", "Water moves across.")
+    assert backend.calls == 1
+    assert engine.stats()["coalesced"] == 1
+
+    # Once answered, the same question comes from the cache
+    third = Recorder(engine.ask("Explain", "osmosis"))
+    wait_until(qapp, lambda: third.outcome())
+    assert third.reply.from_cache
+    assert third.events == [("token", "Water moves across."), ("finished", "Water moves across.")]
+    assert backend.calls == 1
+
+
+def test_a_reply_that_joins_mid_stream_gets_the_whole_text(qapp, make_engine):
+    model = GatedModel()
+    backend = StubAIBackend(token_delay=0, stream_source=model)
+    engine = make_engine(backend)
+    first = Recorder(engine.ask("Explain", "osmosis"))
+    wait_until(qapp, lambda: first.events)
+    late = Recorder(engine.ask("Explain", "osmosis"))
+    # What was streamed before it joined arrives first, without waiting for the next word
+    wait_until(qapp, lambda: late.events)
+    assert late.events == [("token", "Water ")]
+    model.go.set()
+    wait_until(qapp, lambda: first.outcome() and late.outcome())
+    assert first.text() == late.text() == "Water moves across."
+    assert late.outcome() == ("finished", "Water moves across.")
+    assert late.reply.first_token_latency() is not None
+    assert backend.calls == 1
+
+
+def test_cancelling_one_coalesced_reply_leaves_the_other_running(qapp, make_engine):
+    model = GatedModel()
+    backend = StubAIBackend(token_delay=0, stream_source=model)
+    engine = make_engine(backend)
+    first = Recorder(engine.ask("Explain", "osmosis"))
+    second = Recorder(engine.ask("Explain", "osmosis"))
+    first.reply.cancel()
+    assert first.events == [("cancelled", None)]
+    assert engine.in_flight() == 1
+    model.go.set()
+    wait_until(qapp, lambda: second.outcome())
+    assert second.text() == "Water moves across."
+    assert second.outcome() == ("finished", "Water moves across.")
+    assert first.events == [("cancelled", None)]
+    assert backend.calls == 1
+
+
+def test_stats_report_the_limiter_queue_and_waits(qapp, make_engine):
+    # One request at once, then one every 100 ms
+    engine = make_engine(StubAIBackend(delay=0), limiter=TokenBucket(rate=10.0, capacity=1))
+    recorders = [Recorder(engine.submit(f"question {n}")) for n in range(3)]
+    assert engine.stats()["in_flight"] == engine.stats()["backend_calls_in_flight"] == 3
+    wait_until(qapp, lambda: engine.stats()["queue_depth"] == 2)
+    wait_until(qapp, lambda: all(recorder.outcome() for recorder in recorders))
+    stats = engine.stats()
+    assert stats["queue_depth"] == 0 and stats["max_queue_depth"] == 2
+    assert stats["admitted"] == 3
+    assert 0.15 < stats["max_wait"] < 2
+    assert 0.05 < stats["avg_wait"] < stats["max_wait"]
+    assert stats["in_flight"] == stats["backend_calls_in_flight"] == 0
+    assert stats["coalesced"] == stats["retries"] == 0
+
+
+def test_rate_limited_requests_back_off_and_retry(qapp, make_engine):
+    backend = StubAIBackend(delay=0, reply="an answer", rate_limited_calls=2)
+    engine = make_engine(backend, backoff_base=0.01)
+    recorder = Recorder(engine.submit("question"))
+    wait_until(qapp, lambda: recorder.outcome())
+    assert recorder.outcome() == ("finished", "an answer")
+    assert backend.calls == 3
+    assert engine.stats()["retries"] == 2
+
+
+def test_a_request_still_rate_limited_after_its_retries_fails(qapp, make_engine):
+    backend = StubAIBackend(delay=0, rate_limited_calls=10)
+    engine = make_engine(backend, max_retries=1, backoff_base=0.01)
+    recorder = Recorder(engine.submit("question"))
+    wait_until(qapp, lambda: recorder.outcome())
+    kind, message = recorder.outcome()
+    assert kind == "failed" and message.startswith("Rate limit reached, please try again later.")
+    assert backend.calls == 2
+    assert engine.in_flight() == 0
@@ -0,0 +1,339 @@
+"""Tests for the headless core package; none of them needs Qt or a display."""
+import io
+import os
+import sys
+import json
+import math
+import tarfile
+import hashlib
+import threading
+import subprocess
+from datetime import date, timedelta
+
+import pytest
+
+from educloud_core import (Storage, BlobStore, GradeBook, GradeRecord, TaskRepository, TokenBucket,
+                           StubAIBackend, AIRateLimitError, AIResponseCache, AIClient, call_with_retries,
+                           export_submissions, import_submissions)
+from educloud_core import cache as cache_module
+
+
+def test_core_imports_without_qt():
+    code = "import sys, educloud_core; print(sorted(m for m in sys.modules if m.startswith('PyQt')))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+    assert out.strip() == "[]"
+
+
+# ---- grades
+
+def test_grade_book_summary():
+    book = GradeBook([
+        GradeRecord("Quiz", 80, period="Term 1"),
+        GradeRecord("Lab", 45, max_score=50, period="Term 1"),
+        GradeRecord("Essay", period="Term 1"),
+        GradeRecord("Exam", period="Term 2"),
+    ])
+    assert book.summary("Term 1") == {"graded": 2, "ungraded": 1, "mean": 85.0, "min": 80.0, "max": 90.0}
+    assert book.summary("Term 2") == {"graded": 0, "ungraded": 1, "mean": None, "min": None, "max": None}
+
+    book.update("Term 1", 2, 70)
+    assert book.summary("Term 1")["graded"] == 3
+    assert book.record("Term 1", 2).score == 70
+    assert math.isnan(book.percent_scores("Term 2")[0])
+
+
+# ---- tasks
+
+def test_task_repository_span_and_due_dates():
+    today = date(2026, 3, 10)
+    tasks = TaskRepository(seed=())
+    for days, title in [(2, "Essay"), (0, "Quiz"), (2, "Lab"), (9, "Exam"), (-1, "Reading")]:
+        tasks.add(today + timedelta(days=days), title)
+
+    lo, hi = tasks.span(today, today + timedelta(days=3))
+    assert [task.title for task in tasks.tasks(today, today + timedelta(days=3))] == ["Quiz", "Essay", "Lab"]
+    assert hi - lo == tasks.count(today, today + timedelta(days=3)) == 3
+    # stop is exclusive
+    assert tasks.span(today, today) == (lo, lo)
+    assert tasks.due_dates(today - timedelta(days=7), today + timedelta(days=9)) == {
+        today - timedelta(days=1), today, today + timedelta(days=2)}
+    assert tasks.due_dates(today + timedelta(days=3), today + timedelta(days=9)) == set()
+
+
+def test_task_repository_reloads_from_storage(tmp_path):
+    storage = Storage(str(tmp_path / "educloud.db"))
+    first = TaskRepository(storage, seed=())
+    first.add(date(2026, 5, 2), "Later")
+    first.add(date(2026, 5, 1), "Sooner")
+    again = TaskRepository(storage, seed=())
+    assert [task.title for task in again.tasks(date(2026, 5, 1), date(2026, 6, 1))] == ["Sooner", "Later"]
+
+
+# ---- submission archives
+
+def submit(storage, blobs, tmp_path, subject, item, student, data):
+    source = tmp_path / f"{subject}-{item}-{student}.txt"
+    source.write_bytes(data)
+    digest, size = blobs.ingest(str(source))
+    storage.set_submission(subject, item, str(source), digest, source.name, size, student)
+    return digest
+
+
+def write_archive(path, entries, files=()):
+    header = {"format": "educloud-submissions", "version": 1}
+    manifest = "".join(json.dumps(line) + "\n" for line in [header] + entries).encode("utf-8")
+    with tarfile.open(path, "w") as tar:
+        for name, data in [("manifest.jsonl", manifest)] + list(files):
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+
+
+@pytest.fixture
+def store(tmp_path):
+    return Storage(str(tmp_path / "educloud.db")), BlobStore(str(tmp_path / "blobs"))
+
+
+def test_export_import_round_trip(tmp_path, store):
+    storage, blobs = store
+    shared = submit(storage, blobs, tmp_path, "Math", "Assignment 1", "22-00001", b"same answer")
+    submit(storage, blobs, tmp_path, "Math", "Assignment 1", "22-00002", b"same answer")
+    submit(storage, blobs, tmp_path, "Art", "Assignment 2", "22-00001", b"a drawing")
+    archive = str(tmp_path / "export.tar")
+    assert export_submissions(storage, blobs, archive) == (3, 0)
+    with tarfile.open(archive) as tar:
+        # Identical files are stored once
+        names = tar.getnames()
+    assert names[0] == "manifest.jsonl"
+    assert sorted(names[1:]) == sorted([f"blobs/{shared}", f"blobs/{hashlib.sha256(b'a drawing').hexdigest()}"])
+
+    other = Storage(str(tmp_path / "other.db"))
+    other_blobs = BlobStore(str(tmp_path / "other-blobs"))
+    assert import_submissions(other, other_blobs, archive) == (3, 0)
+    assert sorted(row[:3] + row[4:] for row in other.export_rows()) == \
+        sorted(row[:3] + row[4:] for row in storage.export_rows())
+    with open(other_blobs.path(shared), "rb") as f:
+        assert f.read() == b"same answer"
+    # Importing again replaces the rows and copies nothing
+    assert import_submissions(other, other_blobs, archive) == (3, 0)
+    assert len(other.export_rows()) == 3
+
+
+def test_import_discards_content_that_does_not_match_its_digest(tmp_path, store):
+    storage, blobs = store
+    claimed = hashlib.sha256(b"original").hexdigest()
+    entry = {"subject": "Math", "item": "Assignment 1", "student": "22-00001", "submitted_at": 1.0,
+             "file_name": "answer.txt", "size": 8, "blob": claimed, "member": f"blobs/{claimed}"}
+    archive = str(tmp_path / "tampered.tar")
+    write_archive(archive, [entry], [(f"blobs/{claimed}", b"tampered")])
+    with pytest.raises(ValueError):
+        import_submissions(storage, blobs, archive)
+    assert storage.export_rows() == []
+    assert not blobs.exists(claimed)
+    assert not os.path.exists(blobs.path(hashlib.sha256(b"tampered").hexdigest()))
+
+
+@pytest.mark.parametrize("change", [
+    {"blob": "..//VICTIM"},
+    {"blob": "../" + "0" * 62},
+    {"blob": hashlib.sha256(b"x").hexdigest().upper()},
+    {"member": ["a"]},
+    {"subject": None},
+    {"size": "8"},
+    {"size": -1},
+    {"submitted_at": float("nan")},
+    {"submitted_at": True},
+])
+def test_import_rejects_malformed_manifest_entries(tmp_path, store, change):
+    storage, blobs = store
+    victim = tmp_path / "victim.txt"
+    victim.write_text("keep me")
+    entry = {"subject": "Math", "item": "Assignment 1", "student": "22-00001", "submitted_at": 1.0,
+             "file_name": "answer.txt", "size": 8, "blob": None, "member": "blobs/x"}
+    entry.update({key: value.replace("VICTIM", str(victim)) if isinstance(value, str) else value
+                  for key, value in change.items()})
+    archive = str(tmp_path / "crafted.tar")
+    write_archive(archive, [entry], [("blobs/x", b"answer!!")])
+    with pytest.raises(ValueError):
+        import_submissions(storage, blobs, archive)
+    assert storage.export_rows() == []
+    assert victim.read_text() == "keep me"
+
+
+def test_blob_store_paths_only_take_digests(tmp_path):
+    blobs = BlobStore(str(tmp_path / "blobs"))
+    digest = hashlib.sha256(b"x").hexdigest()
+    assert blobs.path(digest) == os.path.join(str(tmp_path / "blobs"), digest[:2], digest[2:])
+    for bad in ["..//etc/passwd", digest[:-1], digest + "0", None]:
+        with pytest.raises(ValueError):
+            blobs.path(bad)
+
+
+# ---- AI response cache
+
+class FakeClock:
+    # Stands in for the time module inside educloud_core.cache
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(cache_module, "time", clock)
+    return clock
+
+
+def test_ai_cache_entries_expire_from_memory_and_disk(tmp_path, clock):
+    path = str(tmp_path / "ai_cache.db")
+    cache = AIResponseCache(path, ttl=60)
+    cache.put("a", "answer a")
+    clock.now += 60
+    assert cache.get("a") == "answer a"
+    clock.now += 1
+    assert cache.get("a") is None
+    assert cache.stats()["memory_entries"] == cache.stats()["disk_entries"] == 0
+
+    cache.put("b", "answer b")
+    clock.now += 30
+    # Read back from disk by a new process; the entry keeps its age in memory
+    restarted = AIResponseCache(path, ttl=60)
+    assert restarted.get("b") == "answer b"
+    clock.now += 31
+    assert restarted.get("b") is None
+    assert AIResponseCache(path, ttl=60).stats()["disk_entries"] == 0
+
+
+def test_ai_cache_evicts_least_recently_used_from_memory():
+    cache = AIResponseCache(None, max_memory_entries=2)
+    cache.put("a", "answer a")
+    cache.put("b", "answer b")
+    assert cache.get("a") == "answer a"
+    cache.put("c", "answer c")
+    assert cache.get("b") is None
+    assert cache.get("a") == "answer a"
+    assert cache.get("c") == "answer c"
+    assert cache.stats()["memory_entries"] == 2
+
+
+def test_ai_cache_keeps_disk_within_max_entries(tmp_path, clock):
+    path = str(tmp_path / "ai_cache.db")
+    cache = AIResponseCache(path, max_memory_entries=1, max_disk_entries=3)
+    for n in range(5):
+        clock.now += 1
+        cache.put(f"k{n}", f"answer {n}")
+    # Storing a key again does not count twice
+    cache.put("k4", "answer 4 again")
+    assert cache.stats()["disk_entries"] == 3
+
+    restarted = AIResponseCache(path, max_disk_entries=3)
+    assert restarted.stats()["disk_entries"] == 3
+    assert [restarted.get(f"k{n}") for n in range(5)] == [None, None, "answer 2", "answer 3", "answer 4 again"]
+    restarted.clear()
+    assert AIResponseCache(path).stats()["disk_entries"] == 0
+
+
+def test_ai_cache_stats_count_hits_and_misses(tmp_path):
+    path = str(tmp_path / "ai_cache.db")
+    AIResponseCache(path).put("a", "answer a")
+    cache = AIResponseCache(path)
+    assert cache.get("a") == "answer a"  # from disk
+    assert cache.get("a") == "answer a"  # now from memory
+    assert cache.get("missing") is None
+    assert cache.stats() == {"memory_hits": 1, "disk_hits": 1, "misses": 1, "hit_rate": 2 / 3,
+                             "memory_entries": 1, "disk_entries": 1}
+
+
+def test_ai_cache_keys_ignore_whitespace_but_not_the_model_or_choice():
+    key = AIResponseCache.make_key("gpt-4", "Explain", "  light\nreactions ")
+    assert key == AIResponseCache.make_key("gpt-4", "Explain", "light reactions")
+    assert key != AIResponseCache.make_key("stub", "Explain", "light reactions")
+    assert key != AIResponseCache.make_key("gpt-4", "Summarize", "light reactions")
+
+
+# ---- AI retries
+
+def test_call_with_retries_backs_off_on_rate_limits():
+    backend = StubAIBackend(delay=0, reply="an answer", rate_limited_calls=2)
+    limiter = TokenBucket(rate=1000.0, capacity=10)
+    retries = []
+    answer = call_with_retries(lambda: backend.complete("question"), limiter,
+                               on_retry=lambda retry, delay: retries.append((retry, delay)), backoff_base=0.001)
+    assert answer == "an answer"
+    assert backend.calls == 3
+    assert [retry for retry, _ in retries] == [1, 2]
+    # Exponential: the second wait is about twice the first (each has up to 10% jitter)
+    assert retries[1][1] > retries[0][1]
+    assert limiter.stats()["admitted"] == 3
+
+
+def test_call_with_retries_gives_up_after_max_retries():
+    backend = StubAIBackend(delay=0, rate_limited_calls=10)
+    with pytest.raises(AIRateLimitError):
+        call_with_retries(lambda: backend.complete("question"), max_retries=2, backoff_base=0.001)
+    assert backend.calls == 3
+
+
+# ---- AI client
+
+class GatedBackend(StubAIBackend):
+    # Answers once `go` is set
+    def __init__(self):
+        super().__init__(delay=0, reply="an answer")
+        self.go = threading.Event()
+
+    def complete(self, prompt, timeout=None):
+        self._count_call()
+        self.go.wait(5)
+        return self._answer(prompt)
+
+
+def test_ai_client_answers_repeated_questions_from_the_cache():
+    backend = StubAIBackend(delay=0, reply="an answer")
+    client = AIClient(backend, AIResponseCache(None))
+    assert client.ask("Explain", "osmosis") == "an answer"
+    assert client.ask("Explain", " osmosis\n") == "an answer"
+    assert backend.calls == 1
+    assert client.stats()["in_flight"] == client.stats()["backend_calls_in_flight"] == 0
+
+
+def test_ai_client_threads_asking_the_same_question_share_one_call():
+    backend = GatedBackend()
+    client = AIClient(backend, AIResponseCache(None))
+    answers = []
+    threads = [threading.Thread(target=lambda: answers.append(client.ask("Explain", "osmosis")))
+               for _ in range(3)]
+    threads[0].start()
+    while backend.calls == 0:
+        threads[0].join(0.001)
+    for thread in threads[1:]:
+        thread.start()
+    while client.stats()["coalesced"] < 2:
+        threads[0].join(0.001)
+    assert client.stats()["in_flight"] == 3 and client.stats()["backend_calls_in_flight"] == 1
+    backend.go.set()
+    for thread in threads:
+        thread.join(5)
+    assert answers == ["an answer"] * 3
+    assert backend.calls == 1
+
+
+def test_ai_client_retries_rate_limits_and_reports_failures():
+    backend = StubAIBackend(delay=0, reply="an answer", rate_limited_calls=2)
+    client = AIClient(backend, AIResponseCache(None), backoff_base=0.001)
+    assert client.ask("Explain", "osmosis") == "an answer"
+    assert client.stats()["retries"] == 2
+
+    backend = StubAIBackend(delay=0, rate_limited_calls=10)
+    client = AIClient(backend, AIResponseCache(None), max_retries=1, backoff_base=0.001)
+    with pytest.raises(AIRateLimitError):
+        client.ask("Explain", "osmosis")
+    assert backend.calls == 2
+    assert client.in_flight() == 0
+    # Failures are not cached
+    with pytest.raises(AIRateLimitError):
+        client.ask("Explain", "osmosis")
@@ -0,0 +1,55 @@
+"""Tests for SubmissionStore, the Qt side of uploads; they run offscreen."""
+import threading
+
+import pytest
+
+from educloud_core import Storage, BlobStore, export_submissions, import_submissions
+
+
+@pytest.fixture
+def uploads(qapp, tmp_path):
+    from Educloud import SubmissionStore
+    storage = Storage(str(tmp_path / "educloud.db"))
+    blobs = BlobStore(str(tmp_path / "blobs"))
+    return storage, blobs, SubmissionStore(storage, blobs)
+
+
+def finish(qapp, store):
+    store.wait()
+    # The copy's result arrives as a queued signal
+    qapp.processEvents()
+
+
+def test_upload_is_filed_under_the_student_who_started_it(qapp, tmp_path, uploads):
+    storage, blobs, store = uploads
+    source = tmp_path / "essay.txt"
+    source.write_bytes(b"my essay")
+    store.set_student("22-00001")
+    assert store.submit("Math", "Assignment 1", str(source))
+    # Signs out and someone else signs in before the copy is recorded
+    store.set_student("22-00002")
+    finish(qapp, store)
+    assert storage.get_submission_blob("Math", "Assignment 1", "22-00001")[1:] == ("essay.txt", 8)
+    assert storage.get_submission_blob("Math", "Assignment 1", "22-00002") is None
+    assert store.uploading("Math", "Assignment 1") is None
+
+
+def test_upload_sizes_past_2_gib_survive_the_round_trip(qapp, tmp_path, uploads):
+    storage, blobs, store = uploads
+    source = tmp_path / "video.mp4"
+    source.write_bytes(b"not really three gigabytes")
+    digest, _ = blobs.ingest(str(source))
+    size = 3 * 2**30
+    # Emitted from another thread, as the upload worker does
+    worker = threading.Thread(target=store._signals.finished.emit,
+                              args=("Math", "Assignment 1", "22-00001", str(source), digest, size))
+    worker.start()
+    worker.join()
+    qapp.processEvents()
+    assert storage.get_submission_blob("Math", "Assignment 1", "22-00001") == (digest, "video.mp4", size)
+
+    archive = str(tmp_path / "export.tar")
+    assert export_submissions(storage, blobs, archive) == (1, 0)
+    other = Storage(str(tmp_path / "other.db"))
+    assert import_submissions(other, BlobStore(str(tmp_path / "other-blobs")), archive) == (1, 0)
+    assert other.get_submission_blob("Math", "Assignment 1", "22-00001") == (digest, "video.mp4", size)